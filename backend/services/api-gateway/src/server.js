@@ -1,4 +1,5 @@
 import Fastify from "fastify";
+import { createHash } from "node:crypto";
 import jwt from "@fastify/jwt";
 import multipart from "@fastify/multipart";
 import fastifyStatic from "@fastify/static";
@@ -263,7 +264,14 @@ export function buildServer({
       list = filterDevicesForFloorplan(list, floorplan);
     }
     const items = identityResolver.enrichDevices(list);
-    return { items, count: items.length };
+    const body = { items, count: items.length };
+    // Weak validator over the serialized list so pollers can revalidate with a 304.
+    const etag = `W/"${createHash("sha1").update(JSON.stringify(body)).digest("base64url")}"`;
+    reply.header("etag", etag);
+    if (req.headers["if-none-match"] === etag) {
+      return reply.code(304).send();
+    }
+    return body;
   });
 
   app.get("/devices/:id", { preHandler: authGuard }, async (req, reply) => {
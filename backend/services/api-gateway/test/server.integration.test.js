@@ -39,6 +39,29 @@ test("GET /devices and /devices/:id return data from store", async (t) => {
   await app.close();
 });
 
+test("GET /devices answers If-None-Match with 304 while the list is unchanged", async () => {
+  const store = new MockStore(samplePath);
+  await store.init();
+  const app = buildServer({ store, logger: console, config: { mode: "mock" } });
+  await app.listen({ port: 0 });
+  const baseUrl = `http://127.0.0.1:${app.server.address().port}`;
+
+  const first = await fetch(`${baseUrl}/devices`);
+  assert.equal(first.status, 200);
+  const etag = first.headers.get("etag");
+  assert.match(etag, /^W\/"/);
+
+  const again = await fetch(`${baseUrl}/devices`, { headers: { "If-None-Match": etag } });
+  assert.equal(again.status, 304);
+  assert.equal(await again.text(), "");
+
+  const stale = await fetch(`${baseUrl}/devices`, { headers: { "If-None-Match": 'W/"stale"' } });
+  assert.equal(stale.status, 200);
+  assert.equal(stale.headers.get("etag"), etag);
+
+  await app.close();
+});
+
 test("GET /devices includes voice satellite registrations from devices.config.json", async () => {
   const dir = await fs.mkdtemp(path.join(os.tmpdir(), "server-integration-"));
   try {
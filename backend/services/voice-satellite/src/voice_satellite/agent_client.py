@@ -1,12 +1,45 @@
 from __future__ import annotations
 
+import asyncio
+import json
 from dataclasses import dataclass
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict, Optional
 
 import requests
 
 from .log import Logger
 
+TURN_PATH = "/v1/agent/turn"
+STREAM_ACCEPT = "application/x-ndjson, text/event-stream;q=0.9, application/json;q=0.5"
+
+
+def parse_stream_line(line: str, *, sse: bool) -> Optional[Dict[str, Any]]:
+    """Decode one line of a streamed turn; None for blank/keep-alive lines.
+
+    NDJSON lines are JSON objects. For SSE only ``data:`` fields are read and
+    they carry the same objects; ``[DONE]`` is ignored.
+    """
+    line = line.strip()
+    if sse:
+        if not line.startswith("data:"):
+            return None
+        line = line[len("data:") :].strip()
+        if line == "[DONE]":
+            return None
+    if not line:
+        return None
+    obj = json.loads(line)
+    if not isinstance(obj, dict):
+        raise RuntimeError(f"agent_stream_invalid: {line[:120]}")
+    return obj
+
+
+def turn_payload(*, session_id: str, text: str, confirm: bool, wake_source: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    payload: Dict[str, Any] = {"input": text, "sessionId": session_id, "confirm": bool(confirm)}
+    if isinstance(wake_source, dict) and wake_source:
+        payload["context"] = {"wakeSource": wake_source}
+    return payload
+
 
 @dataclass(frozen=True)
 class AgentClient:
@@ -15,13 +48,105 @@ class AgentClient:
     logger: Logger | None = None
 
     def turn(self, *, session_id: str, text: str, confirm: bool, wake_source: Dict[str, Any] | None = None) -> Dict[str, Any]:
-        url = self.base_url.rstrip("/") + "/v1/agent/turn"
-        payload = {"input": text, "sessionId": session_id, "confirm": bool(confirm)}
-        if isinstance(wake_source, dict) and wake_source:
-            payload["context"] = {"wakeSource": wake_source}
+        url = self.base_url.rstrip("/") + TURN_PATH
+        payload = turn_payload(session_id=session_id, text=text, confirm=confirm, wake_source=wake_source)
         self.logger and self.logger.debug({"msg": "agent.request", "url": url, "payload": payload})
         r = requests.post(url, json=payload, timeout=self.timeout_s)
         if not r.ok:
             body = (r.text or "")[:300]
             raise RuntimeError(f"agent_http_{r.status_code}: {body}")
         return r.json()
+
+
+class AsyncAgentClient:
+    """asyncio agent client for the ws server.
+
+    One ``httpx.AsyncClient`` keeps connections to smart-house-agent alive
+    across turns. At most ``max_concurrency`` turns are in flight; the
+    ``timeout_s`` deadline covers waiting for a slot as well as the request.
+    """
+
+    def __init__(
+        self,
+        *,
+        base_url: str,
+        timeout_s: int = 30,
+        max_concurrency: int = 8,
+        logger: Logger | None = None,
+        transport: Optional[Any] = None,
+    ):
+        import httpx
+
+        self.url = base_url.rstrip("/") + TURN_PATH
+        self.timeout_s = max(1, int(timeout_s))
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.logger = logger
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(self.timeout_s),
+            limits=httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency),
+            transport=transport,
+        )
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+
+    async def turn(self, *, session_id: str, text: str, confirm: bool, wake_source: Dict[str, Any] | None = None) -> Dict[str, Any]:
+        payload = turn_payload(session_id=session_id, text=text, confirm=confirm, wake_source=wake_source)
+        self.logger and self.logger.debug({"msg": "agent.request", "url": self.url, "payload": payload})
+        try:
+            return await asyncio.wait_for(self._post(payload), timeout=self.timeout_s)
+        except asyncio.TimeoutError:
+            raise RuntimeError(f"agent_timeout: no reply within {self.timeout_s}s") from None
+
+    async def turn_stream(
+        self, *, session_id: str, text: str, confirm: bool, wake_source: Dict[str, Any] | None = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield ``{"type": "delta", "text": ...}`` events, then the final turn reply.
+
+        Asks for NDJSON or SSE. An agent that answers with plain JSON yields
+        only the final reply. ``timeout_s`` bounds the whole stream.
+        """
+        payload = turn_payload(session_id=session_id, text=text, confirm=confirm, wake_source=wake_source)
+        self.logger and self.logger.debug({"msg": "agent.request", "url": self.url, "payload": payload, "stream": True})
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout_s
+        events = self._post_stream(payload)
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(events.__anext__(), timeout=max(0.0, deadline - loop.time()))
+                except StopAsyncIteration:
+                    return
+                except asyncio.TimeoutError:
+                    raise RuntimeError(f"agent_timeout: no reply within {self.timeout_s}s") from None
+                yield event
+        finally:
+            await events.aclose()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def _post(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        async with self._slots:
+            r = await self._client.post(self.url, json=payload)
+        if r.is_error:
+            raise RuntimeError(f"agent_http_{r.status_code}: {(r.text or '')[:300]}")
+        return r.json()
+
+    async def _post_stream(self, payload: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        async with self._slots:
+            async with self._client.stream("POST", self.url, json=payload, headers={"Accept": STREAM_ACCEPT}) as r:
+                if r.is_error:
+                    body = (await r.aread()).decode("utf-8", "replace")
+                    raise RuntimeError(f"agent_http_{r.status_code}: {body[:300]}")
+                content_type = r.headers.get("content-type", "").split(";")[0].strip().lower()
+                if content_type not in ("application/x-ndjson", "application/jsonl", "text/event-stream"):
+                    yield json.loads(await r.aread())
+                    return
+                final = False
+                async for line in r.aiter_lines():
+                    event = parse_stream_line(line, sse=content_type == "text/event-stream")
+                    if event is None:
+                        continue
+                    final = event.get("type") != "delta"
+                    yield event
+                if not final:
+                    raise RuntimeError("agent_stream_incomplete: stream ended without a final reply")
@@ -24,14 +24,13 @@ from .agent_client import AgentClient
 from .common import (
     PROCESS_BLOCK_SIZE,
     PROCESS_SAMPLE_RATE,
-    build_resampler,
+    StreamingResampler,
     clean_user_text,
     match_short_phrase,
     normalize_for_match,
-    resample_block,
 )
 from .config import AppConfig, load_config
-from .log import Logger
+from .log import AsyncLogger, Logger
 from .remote_server import run_ws_server
 
 
@@ -91,6 +90,44 @@ class AudioIn:
             pass
 
 
+class ResampledAudioIn:
+    """Serves ``block_size`` blocks at ``out_rate`` from a capture source at another rate.
+
+    Capture blocks go through one ``StreamingResampler``, so the converted
+    audio is continuous across blocks; the output is re-cut to exactly
+    ``block_size`` samples. ``clear`` also drops the resampler state.
+    """
+
+    def __init__(self, source: Any, *, in_rate: int, out_rate: int, block_size: int):
+        self.source = source
+        self.in_rate = in_rate
+        self.out_rate = out_rate
+        self.block_size = block_size
+        self._resampler = StreamingResampler(in_rate, out_rate)
+        self._pending = np.zeros(0, dtype=np.int16)
+
+    def start(self) -> None:
+        self.source.start()
+
+    def stop(self) -> None:
+        self.source.stop()
+
+    def read(self, timeout_s: float = 1.0) -> Optional[np.ndarray]:
+        deadline = time.monotonic() + timeout_s
+        while self._pending.size < self.block_size:
+            block = self.source.read(timeout_s=max(0.0, deadline - time.monotonic()))
+            if block is None:
+                return None
+            self._pending = np.concatenate([self._pending, self._resampler.process(block)])
+        block, self._pending = self._pending[: self.block_size], self._pending[self.block_size :]
+        return block
+
+    def clear(self) -> None:
+        self.source.clear()
+        self._resampler = StreamingResampler(self.in_rate, self.out_rate)
+        self._pending = np.zeros(0, dtype=np.int16)
+
+
 class PulseAudioIn:
     def __init__(self, *, sample_rate: int, block_size: int, source: str, logger: Logger):
         self.sample_rate = sample_rate
@@ -277,16 +314,25 @@ def main(argv: Optional[List[str]] = None) -> int:
         parser.error("--config is required unless --list-devices is used")
 
     cfg = load_config(args.config)
-    logger = Logger(cfg.runtime.log_level)
+    if cfg.runtime.log_async:
+        # Flushed by an atexit hook on shutdown.
+        logger: Logger = AsyncLogger(
+            cfg.runtime.log_level,
+            flush_interval_ms=cfg.runtime.log_flush_interval_ms,
+            max_queue=cfg.runtime.log_queue_max,
+        )
+    else:
+        logger = Logger(cfg.runtime.log_level)
 
     if cfg.mode == "ws_server":
         return asyncio.run(run_ws_server(cfg, logger))
 
     from .devices import DeviceCatalog
     from .speech import compose_speech
-    from .stt_whisper import WhisperStt
+    from .stt_engines import create_stt
     from .tts_piper import PiperTts
-    from .vad_silero import SileroVad
+    from .tts_pool import PiperWorkerPool
+    from .vad_silero import create_vad
     from .wake_vosk import VoskWakeWord
 
     input_backend = str(cfg.audio.input_backend or "sounddevice").lower()
@@ -314,12 +360,15 @@ def main(argv: Optional[List[str]] = None) -> int:
                 "process_block": process_block,
             }
         )
-    resampler = build_resampler(capture_block, process_block)
 
     # Core components
     wake = VoskWakeWord(model_path=cfg.wake.vosk.model_path, phrases=cfg.wake.phrases, sample_rate=process_rate, logger=logger)
-    vad = SileroVad(threshold=cfg.vad.threshold, sample_rate=process_rate)
-    stt = WhisperStt(model_ref=cfg.stt.whisper_model, device=cfg.stt.device, language=cfg.stt.language, logger=logger)
+    vad = create_vad(cfg.vad, sample_rate=process_rate)
+    stt = create_stt(cfg.stt, logger)
+    tts_pool = None
+    if cfg.tts.workers > 0:
+        tts_pool = PiperWorkerPool(cfg.tts, workers=cfg.tts.workers, request_timeout_s=cfg.tts.worker_timeout_s, logger=logger)
+        tts_pool.start()
     tts = PiperTts(
         piper_bin=cfg.tts.piper_bin,
         model_path=cfg.tts.model_path,
@@ -328,8 +377,12 @@ def main(argv: Optional[List[str]] = None) -> int:
         output_device=cfg.audio.output_device,
         output_backend=output_backend,
         logger=logger,
+        pool=tts_pool,
     )
     devices = DeviceCatalog(base_url=cfg.api_gateway.base_url, api_key=cfg.api_gateway.api_key, logger=logger)
+    devices.refresh_in_background(force=True)
+    if cfg.api_gateway.watch:
+        devices.watch()
     agent = AgentClient(base_url=cfg.agent.base_url, timeout_s=cfg.agent.timeout_s, logger=logger)
 
     if input_backend == "pulse":
@@ -337,6 +390,8 @@ def main(argv: Optional[List[str]] = None) -> int:
     else:
         audio = AudioIn(sample_rate=capture_rate, block_size=capture_block, input_device=cfg.audio.input_device, logger=logger)
     audio.start()
+    if capture_rate != process_rate or capture_block != process_block:
+        audio = ResampledAudioIn(audio, in_rate=capture_rate, out_rate=process_rate, block_size=process_block)
 
     state = "IDLE"  # IDLE | LISTEN | SPEAK
     session_id: Optional[str] = None
@@ -375,8 +430,6 @@ def main(argv: Optional[List[str]] = None) -> int:
                     awaiting_first_utterance = False
                 continue
 
-            block = resample_block(block, resampler)
-
             if now < ignore_until:
                 continue
 
@@ -392,11 +445,8 @@ def main(argv: Optional[List[str]] = None) -> int:
                     speech_started = False
                     silence = 0
 
-                    try:
-                        devices.refresh()
-                    except Exception:
-                        # best-effort
-                        pass
+                    # Never block the beep on api-gateway: revalidate in the background.
+                    devices.refresh_in_background()
 
                     play_beep(cfg, logger)
                     logger.info({"msg": "wake.detected", "session_id": session_id})
@@ -524,3 +574,6 @@ def main(argv: Optional[List[str]] = None) -> int:
         return 0
     finally:
         audio.stop()
+        devices.close()
+        if tts_pool is not None:
+            tts_pool.close()
@@ -0,0 +1,318 @@
+"""Golden-audio regression benchmark for VAD end-pointing, trimming and STT.
+
+Replays a directory of labelled WAV commands through ``RemoteSatelliteSession``
+offline with the VAD and STT engine of each given config (agent and TTS are
+stubbed) and reports, per config, character error rate, real-time factor,
+trimmed vs full samples and end-of-speech detection delay.
+
+    python -m voice_satellite.benchmark --dir golden/ --config a.yaml --config b.yaml --out run.json
+
+Labels come from ``labels.jsonl`` in the directory (``{"file", "text",
+"speech_end_ms"?}`` per line) or a ``<name>.txt`` next to each WAV. Without
+``speech_end_ms`` the end of speech is estimated from the signal energy.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .common import PROCESS_BLOCK_SIZE, PROCESS_SAMPLE_RATE, clean_user_text, normalize_for_match
+from .config import AppConfig, load_config
+from .loadtest import StubAgent, StubDevices, StubTts, load_fixture
+from .log import Logger
+from .remote_server import RemoteSatelliteSession
+
+# Mic noise streamed after each command, as a satellite keeps sending until stop_capture.
+TRAILING_SILENCE_MS = 3000
+SUMMARY_FIELDS = ("cer", "rtf_mean", "rtf_p95", "stt_ms_p50", "stt_ms_p95", "eos_delay_ms_p50", "eos_delay_ms_p95", "eos_missed", "trimmed_ratio")
+
+
+@dataclass(frozen=True)
+class GoldenUtterance:
+    name: str
+    pcm: bytes
+    text: str
+    speech_end_ms: Optional[float] = None
+
+
+class TimedStt:
+    """Wraps an engine and sums decode time (partial decodes included)."""
+
+    def __init__(self, engine: Any):
+        self.engine = engine
+        self.seconds = 0.0
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def transcribe(self, audio: np.ndarray, *, sample_rate: int) -> Tuple[str, Dict[str, Any]]:
+        started = time.perf_counter()
+        try:
+            return self.engine.transcribe(audio, sample_rate=sample_rate)
+        finally:
+            with self._lock:
+                self.seconds += time.perf_counter() - started
+                self.calls += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.seconds = 0.0
+            self.calls = 0
+
+
+def load_golden_dir(path: str) -> List[GoldenUtterance]:
+    labels: Dict[str, Dict[str, Any]] = {}
+    labels_path = os.path.join(path, "labels.jsonl")
+    if os.path.exists(labels_path):
+        with open(labels_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    item = json.loads(line)
+                    labels[str(item["file"])] = item
+    out: List[GoldenUtterance] = []
+    for name in sorted(os.listdir(path)):
+        if not name.lower().endswith(".wav"):
+            continue
+        label = labels.get(name)
+        if label is None:
+            sidecar = os.path.join(path, os.path.splitext(name)[0] + ".txt")
+            if not os.path.exists(sidecar):
+                raise SystemExit(f"{name}: no entry in labels.jsonl and no {os.path.basename(sidecar)}")
+            with open(sidecar, "r", encoding="utf-8") as f:
+                label = {"text": f.read().strip()}
+        end_ms = label.get("speech_end_ms")
+        out.append(
+            GoldenUtterance(
+                name=name,
+                pcm=load_fixture(os.path.join(path, name)),
+                text=str(label.get("text") or ""),
+                speech_end_ms=float(end_ms) if end_ms is not None else None,
+            )
+        )
+    if not out:
+        raise SystemExit(f"no .wav files in {path}")
+    return out
+
+
+def estimate_speech_end_ms(pcm: bytes, *, frame: int = 320) -> float:
+    """End of the last 20 ms frame loud enough to count as speech.
+
+    Uses the thresholds of ``_trim_capture_pcm`` (0.015 RMS, or 20% of the
+    loudest frame) without its padding.
+    """
+    samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+    usable = (samples.size // frame) * frame
+    if not usable:
+        return samples.size * 1000.0 / PROCESS_SAMPLE_RATE
+    rms = np.sqrt(np.mean(np.square(samples[:usable].reshape(-1, frame)), axis=1))
+    active = np.flatnonzero(rms >= max(0.015, float(np.max(rms)) * 0.2))
+    last = int(active[-1]) + 1 if active.size else usable // frame
+    return last * frame * 1000.0 / PROCESS_SAMPLE_RATE
+
+
+def char_edit_distance(ref: str, hyp: str) -> int:
+    prev = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        cur = [i]
+        for j, h in enumerate(hyp, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (r != h)))
+        prev = cur
+    return prev[-1]
+
+
+def _normalize(text: str) -> str:
+    return normalize_for_match(clean_user_text(text))
+
+
+async def _replay(
+    session: RemoteSatelliteSession,
+    stt: TimedStt,
+    utt: GoldenUtterance,
+    *,
+    realtime: bool,
+    noise: np.ndarray,
+) -> Dict[str, Any]:
+    stt.reset()
+    await session.start_session()
+    await session.begin_capture()
+    block_bytes = PROCESS_BLOCK_SIZE * 2
+    stream = utt.pcm + noise.tobytes()
+    sent = 0
+    stop_at_ms: Optional[float] = None
+    stop_reason = ""
+    started = time.monotonic()
+    while sent < len(stream):
+        chunk = stream[sent : sent + block_bytes]
+        sent += len(chunk)
+        events = await session.ingest_audio_chunk(chunk)
+        stop = next((e for e in events if e.get("type") == "stop_capture"), None)
+        if stop is not None:
+            stop_at_ms = sent / 2 * 1000.0 / PROCESS_SAMPLE_RATE
+            stop_reason = str(stop.get("reason") or "")
+            break
+        if realtime:
+            await asyncio.sleep(max(0.0, started + sent / 2 / PROCESS_SAMPLE_RATE - time.monotonic()))
+
+    full = session.capture.float32()
+    trimmed = session._trim_capture_pcm(full)
+    audio_end_at = time.monotonic()
+    transcript = ""
+    transcript_ms: Optional[float] = None
+    async for event in session.finalize_audio_stream():
+        if event.get("type") == "transcript" and transcript_ms is None:
+            transcript_ms = (time.monotonic() - audio_end_at) * 1000
+            transcript = str(event.get("text") or "")
+
+    ref = _normalize(utt.text)
+    hyp = _normalize(transcript)
+    speech_end_ms = utt.speech_end_ms if utt.speech_end_ms is not None else estimate_speech_end_ms(utt.pcm)
+    duration_s = len(utt.pcm) / 2 / PROCESS_SAMPLE_RATE
+    return {
+        "file": utt.name,
+        "ref": utt.text,
+        "hyp": transcript,
+        "edits": char_edit_distance(ref, hyp),
+        "ref_chars": len(ref),
+        "duration_ms": round(duration_s * 1000, 1),
+        "full_samples": int(full.size),
+        "trimmed_samples": int(trimmed.size),
+        "speech_end_ms": round(speech_end_ms, 1),
+        "stop_reason": stop_reason or None,
+        "eos_delay_ms": round(stop_at_ms - speech_end_ms, 1) if stop_at_ms is not None else None,
+        "stt_ms": round(transcript_ms, 1) if transcript_ms is not None else None,
+        "stt_compute_ms": round(stt.seconds * 1000, 1),
+        "stt_calls": stt.calls,
+        "rtf": round(stt.seconds / duration_s, 4) if duration_s else None,
+    }
+
+
+async def run_benchmark(
+    cfg: AppConfig,
+    logger: Logger,
+    utterances: List[GoldenUtterance],
+    *,
+    label: str = "",
+    stt: Any = None,
+    vad_factory: Optional[Callable[[], Any]] = None,
+    realtime: bool = False,
+) -> Dict[str, Any]:
+    """Replay ``utterances`` through one session built from ``cfg``.
+
+    The STT engine is created from ``cfg.stt`` (unless given) and called
+    in-process, without the batch scheduler or worker pool, so its time is
+    the decode alone. Audio is fed as fast as the pipeline takes it unless
+    ``realtime`` is set (which keeps partial-decode timing as on a device).
+    """
+    if stt is None:
+        from .stt_engines import create_stt
+
+        stt = create_stt(cfg.stt, logger)
+        # Model loading and first-call setup are not part of the measurement.
+        stt.transcribe(np.zeros(PROCESS_SAMPLE_RATE, dtype=np.float32), sample_rate=PROCESS_SAMPLE_RATE)
+    timed = TimedStt(stt)
+    session = RemoteSatelliteSession(
+        device_id="benchmark",
+        placement={"room": "benchmark"},
+        cfg=cfg,
+        logger=logger,
+        devices=StubDevices(),
+        agent=StubAgent(),
+        stt=timed,
+        tts=StubTts(ms_per_char=1),
+        vad_factory=vad_factory,
+    )
+    noise = np.random.default_rng(0).normal(0, 30, PROCESS_SAMPLE_RATE * TRAILING_SILENCE_MS // 1000).astype(np.int16)
+    try:
+        rows = [await _replay(session, timed, utt, realtime=realtime, noise=noise) for utt in utterances]
+    finally:
+        session.close()
+    return {
+        "label": label or cfg.stt.engine,
+        "engine": cfg.stt.engine,
+        "model": cfg.stt.whisper_model,
+        "vad": {"engine": cfg.vad.engine, "threshold": cfg.vad.threshold, "end_silence_ms": cfg.vad.end_silence_ms, "adaptive_endpoint": cfg.vad.adaptive_endpoint},
+        "partial_interval_ms": cfg.stt.partial_interval_ms,
+        "summary": summarize(rows),
+        "utterances": rows,
+    }
+
+
+def summarize(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def pct(values: List[float], q: float) -> Optional[float]:
+        return round(float(np.percentile(values, q)), 1) if values else None
+
+    rtf = [r["rtf"] for r in rows if r["rtf"] is not None]
+    stt_ms = [r["stt_ms"] for r in rows if r["stt_ms"] is not None]
+    eos = [r["eos_delay_ms"] for r in rows if r["eos_delay_ms"] is not None]
+    ref_chars = sum(r["ref_chars"] for r in rows)
+    full = sum(r["full_samples"] for r in rows)
+    return {
+        "utterances": len(rows),
+        "cer": round(sum(r["edits"] for r in rows) / ref_chars, 4) if ref_chars else None,
+        "rtf_mean": round(float(np.mean(rtf)), 4) if rtf else None,
+        "rtf_p95": round(float(np.percentile(rtf, 95)), 4) if rtf else None,
+        "stt_ms_p50": pct(stt_ms, 50),
+        "stt_ms_p95": pct(stt_ms, 95),
+        "eos_delay_ms_p50": pct(eos, 50),
+        "eos_delay_ms_p95": pct(eos, 95),
+        # Commands where the VAD never asked the device to stop (audio_end came first).
+        "eos_missed": len(rows) - len(eos),
+        "trimmed_ratio": round(sum(r["trimmed_samples"] for r in rows) / full, 4) if full else None,
+    }
+
+
+def compare(runs: List[Dict[str, Any]], baseline: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+    """Summary deltas (run - baseline) for runs whose label is in ``baseline``."""
+    before = {run["label"]: run["summary"] for run in baseline.get("runs") or []}
+    out: Dict[str, Dict[str, float]] = {}
+    for run in runs:
+        old = before.get(run["label"])
+        if old is None:
+            continue
+        out[run["label"]] = {
+            key: round(run["summary"][key] - old[key], 4)
+            for key in SUMMARY_FIELDS
+            if isinstance(run["summary"].get(key), (int, float)) and isinstance(old.get(key), (int, float))
+        }
+    return out
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="voice-satellite-benchmark", description="Replay labelled WAV commands through VAD + STT")
+    parser.add_argument("--dir", required=True, help="Directory of 16 kHz mono 16-bit WAVs with labels.jsonl or .txt sidecars")
+    parser.add_argument("--config", action="append", required=True, help="Config to benchmark (repeatable, one run each)")
+    parser.add_argument("--label", action="append", default=[], help="Run label per --config (default: config file name)")
+    parser.add_argument("--realtime", action="store_true", help="Feed audio at real-time pace")
+    parser.add_argument("--baseline", default="", help="Earlier --out report; adds summary deltas per label")
+    parser.add_argument("--log-level", default="warn")
+    parser.add_argument("--out", default="", help="Also write the JSON report here")
+    args = parser.parse_args(argv)
+
+    logger = Logger(args.log_level)
+    utterances = load_golden_dir(args.dir)
+    runs = []
+    for i, path in enumerate(args.config):
+        label = args.label[i] if i < len(args.label) else os.path.splitext(os.path.basename(path))[0]
+        runs.append(asyncio.run(run_benchmark(load_config(path), logger, utterances, label=label, realtime=args.realtime)))
+    report: Dict[str, Any] = {"dir": os.path.abspath(args.dir), "runs": runs}
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            report["delta"] = compare(runs, json.load(f))
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import numpy as np
+
+from .common import PROCESS_BLOCK_SIZE
+
+# Share of the buffer released at once when leading (pre-speech) audio is dropped.
+_COMPACT_FRACTION = 4
+
+
+class CaptureBuffer:
+    """Fixed-size int16 capture buffer for one satellite session.
+
+    Incoming pcm_s16le bytes are copied once, straight into a preallocated
+    array; an incomplete trailing block simply waits there for the next chunk.
+    ``block`` and ``view`` return views into that array, so VAD and STT read
+    the capture without further copies.
+
+    Until ``pin`` is called (speech started) the buffer behaves like a ring:
+    when it is full the oldest blocks are dropped to make room. After ``pin``
+    block indices are stable and audio past the capacity is discarded and
+    counted in ``dropped_samples``.
+    """
+
+    def __init__(self, capacity_samples: int, *, block_samples: int = PROCESS_BLOCK_SIZE):
+        self.block_samples = max(1, int(block_samples))
+        blocks = max(1, -(-int(capacity_samples) // self.block_samples))
+        self._pcm = np.zeros(blocks * self.block_samples, dtype=np.int16)
+        self._bytes = self._pcm.view(np.uint8)
+        self._block_bytes = self.block_samples * 2
+        self._written = 0
+        self._pinned = False
+        self.dropped_samples = 0
+
+    @property
+    def capacity_blocks(self) -> int:
+        return self._pcm.size // self.block_samples
+
+    def __len__(self) -> int:
+        """Number of complete blocks."""
+        return self._written // self._block_bytes
+
+    def clear(self) -> None:
+        self._written = 0
+        self._pinned = False
+        self.dropped_samples = 0
+
+    def pin(self) -> None:
+        self._pinned = True
+
+    def write(self, pcm_bytes: bytes) -> range:
+        """Append pcm_s16le bytes; return the indices of blocks completed by them."""
+        data = np.frombuffer(pcm_bytes, dtype=np.uint8)
+        before = len(self)
+        free = self._bytes.size - self._written
+        if data.size > free and not self._pinned:
+            self._drop_front(data.size - free)
+            before = len(self)
+            free = self._bytes.size - self._written
+        if data.size > free:
+            self.dropped_samples += (data.size - free) // 2
+            data = data[:free]
+        self._bytes[self._written : self._written + data.size] = data
+        self._written += data.size
+        return range(before, len(self))
+
+    def block(self, index: int) -> np.ndarray:
+        start = index * self.block_samples
+        return self._pcm[start : start + self.block_samples]
+
+    def view(self, start_block: int = 0, end_block: int | None = None) -> np.ndarray:
+        """Contiguous int16 view over complete blocks ``[start_block, end_block)``."""
+        end = len(self) if end_block is None else min(int(end_block), len(self))
+        return self._pcm[start_block * self.block_samples : end * self.block_samples]
+
+    def float32(self, start_block: int = 0, end_block: int | None = None) -> np.ndarray:
+        """Blocks ``[start_block, end_block)`` as float32 in [-1, 1) (one allocation)."""
+        return np.multiply(self.view(start_block, end_block), 1.0 / 32768.0, dtype=np.float32)
+
+    def _drop_front(self, need_bytes: int) -> None:
+        # Drop whole blocks, and a good share at a time so a long silence before
+        # speech costs an occasional memmove instead of one per chunk.
+        step = max(need_bytes, self._bytes.size // _COMPACT_FRACTION)
+        drop = min(len(self), -(-step // self._block_bytes)) * self._block_bytes
+        if drop <= 0:
+            return
+        keep = self._written - drop
+        self._bytes[:keep] = self._bytes[drop : self._written]
+        self._written = keep
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import re
-from typing import Optional
+from functools import lru_cache
+from math import gcd
 
 import numpy as np
 
@@ -49,33 +50,110 @@ _zh_translations = str.maketrans(
 )
 
 
-def build_resampler(in_len: int, out_len: int) -> Optional[tuple[np.ndarray, np.ndarray]]:
-    if in_len == out_len:
-        return None
-    if in_len <= 1 or out_len <= 1:
-        return None
-    x_old = np.linspace(0.0, float(in_len - 1), num=in_len, dtype=np.float32)
-    x_new = np.linspace(0.0, float(in_len - 1), num=out_len, dtype=np.float32)
-    return (x_old, x_new)
-
-
-def resample_block(block: np.ndarray, resampler: Optional[tuple[np.ndarray, np.ndarray]]) -> np.ndarray:
-    if resampler is None:
-        return block
-    x_old, x_new = resampler
-    y = np.interp(x_new, x_old, block.astype(np.float32))
-    y = np.clip(y, -32768, 32767).astype(np.int16)
-    return y
-
-
-def split_pcm16le_blocks(buffer: bytearray, *, block_samples: int = PROCESS_BLOCK_SIZE) -> list[np.ndarray]:
-    block_bytes = max(1, int(block_samples)) * 2
-    blocks: list[np.ndarray] = []
-    while len(buffer) >= block_bytes:
-        frame = bytes(buffer[:block_bytes])
-        del buffer[:block_bytes]
-        blocks.append(np.frombuffer(frame, dtype=np.int16).copy())
-    return blocks
+# Windowed-sinc design shared by every rate pair: zero crossings of the sinc on
+# each side, passband edge as a share of the lower Nyquist, Kaiser beta (~80 dB).
+RESAMPLE_ZERO_CROSSINGS = 16
+RESAMPLE_ROLLOFF = 0.92
+RESAMPLE_KAISER_BETA = 8.0
+# Outputs computed per vectorized step; bounds the gathered (outputs x taps) matrix.
+_RESAMPLE_STEP = 8192
+
+
+@lru_cache(maxsize=32)
+def polyphase_filter(in_rate: int, out_rate: int) -> tuple[int, int, int, np.ndarray]:
+    """Filter bank for ``in_rate`` -> ``out_rate``: ``(up, down, delay, bank)``.
+
+    ``up/down`` is the reduced rational ratio. ``bank[p]`` holds the taps of
+    polyphase branch ``p``, reversed so one output is a dot product with a
+    contiguous input window. ``delay`` (in upsampled samples) is the filter's
+    group delay, which the resampler compensates. Cached per rate pair.
+    """
+    g = gcd(int(in_rate), int(out_rate))
+    up, down = int(out_rate) // g, int(in_rate) // g
+    cutoff = 0.5 / max(up, down) * RESAMPLE_ROLLOFF
+    half = RESAMPLE_ZERO_CROSSINGS * max(up, down)
+    n = np.arange(-half, half + 1, dtype=np.float64)
+    h = 2.0 * cutoff * np.sinc(2.0 * cutoff * n) * np.kaiser(n.size, RESAMPLE_KAISER_BETA) * up
+    taps = -(-h.size // up)
+    h = np.concatenate([h, np.zeros(taps * up - h.size)])
+    bank = np.ascontiguousarray(h.reshape(taps, up).T[:, ::-1], dtype=np.float32)
+    bank.setflags(write=False)
+    return up, down, half, bank
+
+
+class StreamingResampler:
+    """Rational-ratio polyphase resampler that carries its state across chunks.
+
+    Feeding a signal in any split through ``process`` and then ``flush``
+    gives the same samples as one ``resample`` call: the input history and
+    output position are kept between calls, so chunk edges do not click. The
+    filter's group delay is compensated, so output sample ``k`` lines up with
+    input time ``k * in_rate / out_rate``; ``flush`` emits the last outputs.
+    """
+
+    def __init__(self, in_rate: int, out_rate: int):
+        self.in_rate = int(in_rate)
+        self.out_rate = int(out_rate)
+        self.up, self.down, self._delay, self._bank = polyphase_filter(self.in_rate, self.out_rate)
+        self._taps = self._bank.shape[1]
+        self._reset()
+
+    def _reset(self) -> None:
+        # History starts with taps-1 zeros so the first outputs see silence before the signal.
+        self._buf = np.zeros(self._taps - 1, dtype=np.float32)
+        self._buf_start = -(self._taps - 1)  # input index of _buf[0]
+        self._next = 0  # index of the next output sample
+        self._received = 0
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        if self.in_rate == self.out_rate:
+            return block.astype(np.int16, copy=False)
+        block = np.asarray(block).reshape(-1)
+        self._received += block.size
+        self._buf = np.concatenate([self._buf, block.astype(np.float32, copy=False)])
+        return self._run()
+
+    def flush(self) -> np.ndarray:
+        if self.in_rate == self.out_rate:
+            return np.zeros(0, dtype=np.int16)
+        total = -(-self._received * self.up // self.down)
+        # Enough trailing zeros for every output up to the end of the input.
+        self._buf = np.concatenate([self._buf, np.zeros(self._delay // self.up + self._taps, dtype=np.float32)])
+        out = self._run_until(total)
+        self._reset()
+        return out
+
+    def _run(self) -> np.ndarray:
+        last = self._buf_start + self._buf.size - 1
+        # Output k needs input up to (k * down + delay) // up.
+        return self._run_until(-(-((last + 1) * self.up - self._delay) // self.down))
+
+    def _run_until(self, end: int) -> np.ndarray:
+        start = self._next
+        if end <= start:
+            return np.zeros(0, dtype=np.int16)
+        windows = np.lib.stride_tricks.sliding_window_view(self._buf, self._taps)
+        out = np.empty(end - start, dtype=np.float32)
+        for lo in range(start, end, _RESAMPLE_STEP):
+            k = np.arange(lo, min(end, lo + _RESAMPLE_STEP), dtype=np.int64)
+            t = k * self.down + self._delay
+            first = t // self.up - (self._taps - 1) - self._buf_start
+            out[lo - start : lo - start + k.size] = np.einsum("ij,ij->i", windows[first], self._bank[t % self.up])
+        self._next = end
+        keep = ((end * self.down + self._delay) // self.up - (self._taps - 1)) - self._buf_start
+        if keep > 0:
+            self._buf = self._buf[keep:]
+            self._buf_start += keep
+        return np.clip(np.round(out), -32768, 32767).astype(np.int16)
+
+
+def resample(pcm: np.ndarray, in_rate: int, out_rate: int) -> np.ndarray:
+    """Whole-buffer int16 rate conversion (e.g. one TTS reply), vectorized."""
+    if int(in_rate) == int(out_rate):
+        return np.asarray(pcm).astype(np.int16, copy=False)
+    resampler = StreamingResampler(in_rate, out_rate)
+    head = resampler.process(pcm)
+    return np.concatenate([head, resampler.flush()])
 
 
 def audio_stats(samples: np.ndarray) -> dict[str, float | int]:
@@ -41,18 +41,38 @@ class WakeConfig:
 
 @dataclass(frozen=True)
 class VadConfig:
+    engine: str = "onnx"  # onnx (onnxruntime only) | torch (silero_vad package + torch)
+    model_path: str = ""  # optional Silero ONNX file; default: the one bundled with silero-vad
     threshold: float = 0.55
     end_silence_ms: int = 700
+    adaptive_endpoint: bool = True  # ws_server: shrink/grow end_silence_ms per utterance (see endpointing.py)
+    end_silence_complete_ms: int = 350  # partial transcript reads as a finished command
+    end_silence_short_reply_ms: int = 300  # last reply was a propose waiting for confirm/cancel
+    end_silence_max_ms: int = 1200  # partial ends on a connective/filler, or a hesitant speaker
     pre_roll_ms: int = 400
     max_utterance_ms: int = 20000
     min_utterance_ms: int = 300
+    tick_ms: int = 4  # ws_server: shared VAD waits this long to batch blocks from all sessions
 
 
 @dataclass(frozen=True)
 class SttConfig:
-    whisper_model: str = ""
+    whisper_model: str = ""  # whisper: .pt file; faster_whisper: CTranslate2 model dir
     language: str = "zh"
-    device: str = "cuda"  # cuda only
+    device: str = "cuda"  # whisper engine: cuda only; faster_whisper: cpu | cuda
+    engine: str = "whisper"  # whisper | faster_whisper | fake
+    compute_type: str = "int8"  # faster_whisper quantization
+    cpu_threads: int = 0  # faster_whisper: threads per decode, 0 = auto
+    num_workers: int = 1  # faster_whisper: concurrent decodes per model
+    beam_size: int = 1
+    fake_text: str = ""  # fake engine reply
+    workers: int = 0  # ws_server: >0 runs STT in N worker processes instead of in-process
+    worker_timeout_s: int = 60  # kill and respawn a worker stuck on one utterance
+    batch_window_ms: int = 30  # ws_server: collect concurrent utterances for one batched decode
+    max_batch_size: int = 4
+    partial_interval_ms: int = 0  # >0: decode the growing capture in the background every N ms
+    partial_commit_silence_ms: int = 200  # pause length that lets a partial result be reused
+    partial_events: bool = False  # ws_server: send partial_transcript events to the satellite
 
 
 @dataclass(frozen=True)
@@ -61,27 +81,42 @@ class TtsConfig:
     model_path: str = ""
     config_path: str = ""
     speaker: Optional[int] = None
+    stream: bool = True  # ws_server: forward piper --output-raw audio while it is still synthesizing
+    split_sentences: bool = True  # ws_server: synthesize sentence by sentence, prefetching the next one
+    workers: int = 0  # >0 keeps N piper --json-input processes warm instead of one piper run per reply
+    worker_timeout_s: int = 30  # kill and respawn a piper worker stuck on one reply
+    cache_max_mb: int = 32  # ws_server: in-memory LRU of synthesized sentences; 0 disables the cache
+    cache_dir: str = ""  # optional on-disk store of cached 16 kHz PCM, survives restarts
+    prewarm_phrases: list[str] = None  # type: ignore[assignment]  # synthesized into the cache at startup
 
 
 @dataclass(frozen=True)
 class ApiGatewayConfig:
     base_url: str = "http://localhost:4000"
     api_key: str = ""
+    watch: bool = True  # follow api-gateway /ws device_update/state_snapshot to keep the device catalog current
 
 
 @dataclass(frozen=True)
 class AgentConfig:
     base_url: str = "http://localhost:6100"
     timeout_s: int = 30
+    max_concurrency: int = 8  # ws_server: agent turns in flight at once (pooled keep-alive connections)
+    stream: bool = False  # ws_server: ask for a streamed (NDJSON/SSE) reply and speak sentences as they arrive
     confirm_phrases: list[str] = None  # type: ignore[assignment]
     cancel_phrases: list[str] = None  # type: ignore[assignment]
     exit_phrases: list[str] = None  # type: ignore[assignment]
+    fast_path: bool = False  # ws_server: run simple on/off/brightness commands and state questions via api-gateway, skipping the agent (keep off when the agent runs always_confirm)
+    fast_path_room_aliases: dict[str, list[str]] = None  # type: ignore[assignment]  # room id -> extra spoken names
 
 
 @dataclass(frozen=True)
 class RuntimeConfig:
     session_idle_timeout_ms: int = 30000
     log_level: str = "info"
+    log_async: bool = True  # encode/write log lines on a background thread
+    log_flush_interval_ms: int = 200
+    log_queue_max: int = 10000  # debug dropped above half of this, info above all of it
 
 
 @dataclass(frozen=True)
@@ -93,6 +128,9 @@ class SatelliteServerConfig:
     ping_interval_s: int = 20
     ping_timeout_s: int = 20
     max_message_bytes: int = 524288
+    metrics_port: int = 8766  # Prometheus /metrics with per-stage latency histograms; 0 disables
+    tts_prebuffer_ms: int = 300  # credit window: jitter margin on top of one RTT, capped by the device buffer
+    tts_ack_timeout_ms: int = 1500  # no tts_ack for this long: credit follows the playback clock
 
 
 @dataclass(frozen=True)
@@ -148,11 +186,18 @@ def load_config(path: str) -> AppConfig:
 
     vad_raw = raw.get("vad") or {}
     vad = VadConfig(
+        engine=str(vad_raw.get("engine") or "onnx").strip().lower(),
+        model_path=str(vad_raw.get("model_path") or ""),
         threshold=float(vad_raw.get("threshold") or 0.55),
         end_silence_ms=int(vad_raw.get("end_silence_ms") or 700),
+        adaptive_endpoint=bool(vad_raw.get("adaptive_endpoint", True)),
+        end_silence_complete_ms=int(vad_raw.get("end_silence_complete_ms") or 350),
+        end_silence_short_reply_ms=int(vad_raw.get("end_silence_short_reply_ms") or 300),
+        end_silence_max_ms=int(vad_raw.get("end_silence_max_ms") or 1200),
         pre_roll_ms=int(vad_raw.get("pre_roll_ms") or 400),
         max_utterance_ms=int(vad_raw.get("max_utterance_ms") or 20000),
         min_utterance_ms=int(vad_raw.get("min_utterance_ms") or 300),
+        tick_ms=max(0, int(vad_raw.get("tick_ms", 4))),
     )
 
     stt_raw = raw.get("stt") or {}
@@ -160,6 +205,19 @@ def load_config(path: str) -> AppConfig:
         whisper_model=str(stt_raw.get("whisper_model") or ""),
         language=str(stt_raw.get("language") or "zh"),
         device=str(stt_raw.get("device") or "cuda"),
+        engine=str(stt_raw.get("engine") or "whisper").strip().lower(),
+        compute_type=str(stt_raw.get("compute_type") or "int8"),
+        cpu_threads=max(0, int(stt_raw.get("cpu_threads") or 0)),
+        num_workers=max(1, int(stt_raw.get("num_workers") or 1)),
+        beam_size=max(1, int(stt_raw.get("beam_size") or 1)),
+        fake_text=str(stt_raw.get("fake_text") or ""),
+        workers=max(0, int(stt_raw.get("workers") or 0)),
+        worker_timeout_s=max(1, int(stt_raw.get("worker_timeout_s") or 60)),
+        batch_window_ms=max(0, int(stt_raw.get("batch_window_ms", 30))),
+        max_batch_size=max(1, int(stt_raw.get("max_batch_size") or 4)),
+        partial_interval_ms=max(0, int(stt_raw.get("partial_interval_ms") or 0)),
+        partial_commit_silence_ms=int(stt_raw.get("partial_commit_silence_ms") or 200),
+        partial_events=bool(stt_raw.get("partial_events", False)),
     )
 
     tts_raw = raw.get("tts") or {}
@@ -169,25 +227,46 @@ def load_config(path: str) -> AppConfig:
         model_path=str(tts_raw.get("model_path") or ""),
         config_path=str(tts_raw.get("config_path") or ""),
         speaker=int(speaker) if speaker is not None else None,
+        stream=bool(tts_raw.get("stream", True)),
+        split_sentences=bool(tts_raw.get("split_sentences", True)),
+        workers=max(0, int(tts_raw.get("workers") or 0)),
+        worker_timeout_s=max(1, int(tts_raw.get("worker_timeout_s") or 30)),
+        cache_max_mb=max(0, int(tts_raw.get("cache_max_mb", 32))),
+        cache_dir=str(tts_raw.get("cache_dir") or ""),
+        prewarm_phrases=[str(p) for p in (tts_raw.get("prewarm_phrases") or []) if str(p).strip()],
     )
 
     api_raw = raw.get("api_gateway") or {}
-    api_gateway = ApiGatewayConfig(base_url=str(api_raw.get("base_url") or "http://localhost:4000"), api_key=str(api_raw.get("api_key") or ""))
+    api_gateway = ApiGatewayConfig(
+        base_url=str(api_raw.get("base_url") or "http://localhost:4000"),
+        api_key=str(api_raw.get("api_key") or ""),
+        watch=bool(api_raw.get("watch", True)),
+    )
     device_config_path = str(raw.get("device_config_path") or "").strip()
 
     agent_raw = raw.get("agent") or {}
     agent = AgentConfig(
         base_url=str(agent_raw.get("base_url") or "http://localhost:6100"),
         timeout_s=int(agent_raw.get("timeout_s") or 30),
+        max_concurrency=max(1, int(agent_raw.get("max_concurrency") or 8)),
+        stream=bool(agent_raw.get("stream", False)),
         confirm_phrases=list(agent_raw.get("confirm_phrases") or ["确认", "执行", "是", "好的", "可以"]),
         cancel_phrases=list(agent_raw.get("cancel_phrases") or ["取消", "不要", "算了", "停止"]),
         exit_phrases=list(agent_raw.get("exit_phrases") or ["再见", "拜拜", "退下", "结束对话", "退出对话"]),
+        fast_path=bool(agent_raw.get("fast_path", False)),
+        fast_path_room_aliases={
+            str(room): [str(n) for n in (names if isinstance(names, list) else [names]) if n]
+            for room, names in dict(agent_raw.get("fast_path_room_aliases") or {}).items()
+        },
     )
 
     runtime_raw = raw.get("runtime") or {}
     runtime = RuntimeConfig(
         session_idle_timeout_ms=int(runtime_raw.get("session_idle_timeout_ms") or 30000),
         log_level=str(runtime_raw.get("log_level") or "info"),
+        log_async=bool(runtime_raw.get("log_async", True)),
+        log_flush_interval_ms=int(runtime_raw.get("log_flush_interval_ms") or 200),
+        log_queue_max=int(runtime_raw.get("log_queue_max") or 10000),
     )
 
     satellite_raw = raw.get("satellite_server") or {}
@@ -199,11 +278,14 @@ def load_config(path: str) -> AppConfig:
         ping_interval_s=int(satellite_raw.get("ping_interval_s") or 20),
         ping_timeout_s=int(satellite_raw.get("ping_timeout_s") or 20),
         max_message_bytes=int(satellite_raw.get("max_message_bytes") or 524288),
+        metrics_port=max(0, int(satellite_raw.get("metrics_port", 8766) or 0)),
+        tts_prebuffer_ms=max(0, int(satellite_raw.get("tts_prebuffer_ms", 300) or 0)),
+        tts_ack_timeout_ms=int(satellite_raw.get("tts_ack_timeout_ms") or 1500),
     )
 
     if mode == "local" and not wake.vosk.model_path:
         raise SystemExit("Missing required config: wake.vosk.model_path")
-    if not stt.whisper_model:
+    if stt.engine != "fake" and not stt.whisper_model:
         raise SystemExit("Missing required config: stt.whisper_model")
     if not tts.model_path or not tts.config_path:
         raise SystemExit("Missing required config: tts.model_path / tts.config_path")
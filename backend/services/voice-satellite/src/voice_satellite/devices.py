@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import json
 import threading
 import time
 from dataclasses import dataclass, field
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, Optional
+from urllib.parse import urlsplit, urlunsplit
 
 import requests
 
@@ -11,37 +13,62 @@ from .log import Logger
 
 
 DEFAULT_CACHE_TTL_S = 30.0
+WATCH_RECONNECT_MIN_S = 1.0
+WATCH_RECONNECT_MAX_S = 30.0
+
+
+def gateway_ws_url(base_url: str) -> str:
+    """api-gateway's change feed (``/ws``) for an http(s) base URL."""
+    parts = urlsplit(base_url.rstrip("/"))
+    scheme = "wss" if parts.scheme == "https" else "ws"
+    return urlunsplit((scheme, parts.netloc, parts.path + "/ws", "", ""))
 
 
 @dataclass
 class DeviceCatalog:
+    """Device names for speech, kept in sync with api-gateway.
+
+    ``refresh`` revalidates ``/devices`` with ``If-None-Match``.
+    ``watch`` follows api-gateway's ``/ws`` change feed and applies
+    ``device_update``/``state_snapshot`` messages as they arrive. Writers
+    build a new dict and swap ``by_id`` in one assignment (under
+    ``_write_lock``), so readers on other threads can iterate the dict they
+    got without it changing size and never see an empty or half-built one.
+    """
+
     base_url: str
     api_key: str = ""
     logger: Logger | None = None
     cache_ttl_s: float = DEFAULT_CACHE_TTL_S
     by_id: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    _etag: str = field(default="", init=False, repr=False)
     _last_refresh_at: float = field(default=0.0, init=False, repr=False)
     _refresh_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _write_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _watch_thread: Optional[threading.Thread] = field(default=None, init=False, repr=False)
+    _watch_stop: threading.Event = field(default_factory=threading.Event, init=False, repr=False)
+    _watch_conn: Any = field(default=None, init=False, repr=False)
+    _feed_updates: int = field(default=0, init=False, repr=False)
+    _not_modified: int = field(default=0, init=False, repr=False)
 
     def refresh(self) -> None:
         url = self.base_url.rstrip("/") + "/devices"
-        headers = {"X-API-Key": self.api_key} if self.api_key else {}
+        headers = self._headers()
+        if self._etag and self.by_id:
+            headers["If-None-Match"] = self._etag
         r = requests.get(url, headers=headers, timeout=10)
+        if r.status_code == 304:
+            self._not_modified += 1
+            self._last_refresh_at = time.monotonic()
+            self.logger and self.logger.debug({"msg": "devices.refresh.not_modified", "count": len(self.by_id)})
+            return
         if not r.ok:
             raise RuntimeError(f"api_gateway_http_{r.status_code}: {(r.text or '')[:200]}")
         body = r.json() or {}
-        items = body.get("items") or []
-        out: Dict[str, Dict[str, Any]] = {}
-        for d in items:
-            if not isinstance(d, dict):
-                continue
-            did = str(d.get("id") or "").strip()
-            if not did:
-                continue
-            out[did] = d
-        self.by_id = out
+        changed = self._replace(body.get("items") or [])
+        self._etag = r.headers.get("ETag") or ""
         self._last_refresh_at = time.monotonic()
-        self.logger and self.logger.debug({"msg": "devices.refresh", "count": len(out)})
+        self.logger and self.logger.debug({"msg": "devices.refresh", "count": len(self.by_id), "changed": changed})
 
     def refresh_in_background(self, *, force: bool = False) -> bool:
         now = time.monotonic()
@@ -54,6 +81,71 @@ class DeviceCatalog:
         thread.start()
         return True
 
+    def apply_update(self, update: Dict[str, Any]) -> bool:
+        """Patch one device from a change-feed message; False if it was ignored."""
+        did = str(update.get("id") or "").strip() if isinstance(update, dict) else ""
+        if not did:
+            return False
+        patch = {k: v for k, v in update.items() if k not in ("event", "ts")}
+        with self._write_lock:
+            current = self.by_id.get(did)
+            if current is None and "name" not in patch:
+                # A bare state snapshot for a device we have never listed.
+                return False
+            self.by_id = {**self.by_id, did: {**(current or {}), **patch}}
+            self._feed_updates += 1
+        return True
+
+    def watch(self) -> None:
+        """Follow api-gateway's ``/ws`` change feed on a daemon thread."""
+        if self._watch_thread is not None:
+            return
+        self._watch_stop.clear()
+        self._watch_thread = threading.Thread(target=self._watch_worker, name="devices-watch", daemon=True)
+        self._watch_thread.start()
+
+    def close(self) -> None:
+        thread = self._watch_thread
+        if thread is None:
+            return
+        self._watch_stop.set()
+        conn = self._watch_conn
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        thread.join(timeout=2)
+        self._watch_thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "devices": len(self.by_id),
+            "feed_connected": self._watch_conn is not None,
+            "feed_updates": self._feed_updates,
+            "not_modified": self._not_modified,
+        }
+
+    def _headers(self) -> Dict[str, str]:
+        return {"X-API-Key": self.api_key} if self.api_key else {}
+
+    def _replace(self, items: Iterable[Any]) -> int:
+        fresh: Dict[str, Dict[str, Any]] = {}
+        for d in items:
+            if not isinstance(d, dict):
+                continue
+            did = str(d.get("id") or "").strip()
+            if not did:
+                continue
+            fresh[did] = d
+        with self._write_lock:
+            current = self.by_id
+            changed = sum(1 for did in current if did not in fresh)
+            changed += sum(1 for did, d in fresh.items() if current.get(did) != d)
+            if changed:
+                self.by_id = fresh
+        return changed
+
     def _refresh_worker(self) -> None:
         try:
             self.refresh()
@@ -61,3 +153,46 @@ class DeviceCatalog:
             self.logger and self.logger.warn({"msg": "devices.refresh.failed", "error": str(exc)})
         finally:
             self._refresh_lock.release()
+
+    def _watch_worker(self) -> None:
+        from websockets.sync.client import connect
+
+        url = gateway_ws_url(self.base_url)
+        backoff = WATCH_RECONNECT_MIN_S
+        while not self._watch_stop.is_set():
+            try:
+                with connect(url, additional_headers=self._headers(), open_timeout=10) as conn:
+                    self._watch_conn = conn
+                    backoff = WATCH_RECONNECT_MIN_S
+                    self.logger and self.logger.info({"msg": "devices.watch.connected", "url": url})
+                    # Updates published while we were disconnected are only in the
+                    # list. Fetch it before reading the feed so that messages
+                    # queued meanwhile are applied on top, not overwritten.
+                    self._resync()
+                    for raw in conn:
+                        self._on_feed_message(raw)
+            except Exception as exc:
+                if self._watch_stop.is_set():
+                    break
+                self.logger and self.logger.warn({"msg": "devices.watch.disconnected", "error": str(exc), "retry_s": backoff})
+            finally:
+                self._watch_conn = None
+            if self._watch_stop.wait(backoff):
+                break
+            backoff = min(WATCH_RECONNECT_MAX_S, backoff * 2)
+
+    def _resync(self) -> None:
+        with self._refresh_lock:
+            try:
+                self.refresh()
+            except Exception as exc:
+                self.logger and self.logger.warn({"msg": "devices.refresh.failed", "error": str(exc)})
+
+    def _on_feed_message(self, raw: Any) -> None:
+        try:
+            msg = json.loads(raw)
+        except (TypeError, ValueError):
+            return
+        if not isinstance(msg, dict) or msg.get("type") not in ("device_update", "state_snapshot"):
+            return
+        self.apply_update(msg.get("data") or {})
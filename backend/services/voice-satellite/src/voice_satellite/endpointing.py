@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List
+
+from .common import PROCESS_BLOCK_SIZE, PROCESS_SAMPLE_RATE, match_short_phrase, normalize_for_match
+
+BLOCK_MS = PROCESS_BLOCK_SIZE * 1000.0 / PROCESS_SAMPLE_RATE
+# A command does not end on these: the speaker is still going.
+TRAILING_INCOMPLETE = (
+    "然后", "还有", "以及", "并且", "而且", "或者", "和", "跟", "与", "把", "将", "给", "帮我", "请", "再", "也",
+    "的", "那个", "这个", "就是", "嗯", "呃", "额", "如果", "要是", "调到", "调成", "设置成", "设为", "改成",
+)
+# Two characters at least: a bare "开"/"关" also starts "开会"/"关于".
+COMMAND_VERBS = (
+    "打开", "关闭", "关掉", "关上", "开启", "调高", "调低", "调大", "调小", "调到", "调成", "设置", "设为",
+    "切换", "暂停", "播放", "停止", "拉开", "拉上",
+)
+FINAL_PARTICLES = ("吗", "呢", "吧", "了", "呀", "啦")
+# Short answers to a question; "好的"/"对的" end on "的" but are finished.
+SHORT_ANSWERS = ("好", "对", "行", "是", "可以", "不用", "不行", "没错")
+ANSWER_ENDINGS = "的啊呀吧了啦"
+# Window kept above the longest pause after which the speaker went on; shorter
+# pauses are ordinary gaps between words.
+HESITATION_MARGIN_MS = 150
+HESITATION_MIN_PAUSE_MS = 200
+SPEAKER_PAUSE_SMOOTHING = 0.3
+
+
+def looks_complete(text: str, short_phrases: Iterable[str] = ()) -> bool | None:
+    """True for a finished command, False for a sentence that is clearly cut off, else None."""
+    t = normalize_for_match(text)
+    if not t:
+        return None
+    phrases = set(short_phrases)
+    if t in phrases or t.rstrip(ANSWER_ENDINGS) in phrases.union(SHORT_ANSWERS):
+        return True
+    if t.endswith(TRAILING_INCOMPLETE):
+        return False
+    if match_short_phrase(t, phrases, max_extra_chars=2):
+        return True
+    if t.endswith(FINAL_PARTICLES):
+        return True
+    if t[-1].isdigit() or t[-1] in "零一二两三四五六七八九十百":
+        # "调到二十" may still get its unit.
+        return None
+    for verb in COMMAND_VERBS:
+        at = t.rfind(verb)
+        if at >= 0 and len(t) - (at + len(verb)) >= 1:
+            return True
+    return None
+
+
+class Endpointer:
+    """How much trailing silence ends the current utterance.
+
+    ``base_ms`` (``vad.end_silence_ms``) is the default. The window shrinks to
+    ``complete_ms`` when a partial transcript covering all speech so far reads
+    as a finished command, and to ``short_reply_ms`` while the last reply was a
+    ``propose`` waiting for confirm/cancel. It grows to ``max_ms`` when the
+    partial ends on a connective or filler. It never drops below the longest
+    pause after which this speaker went on (in this utterance, or smoothed
+    over earlier ones) plus a margin.
+    """
+
+    def __init__(
+        self,
+        *,
+        base_ms: int,
+        complete_ms: int,
+        short_reply_ms: int,
+        max_ms: int,
+        short_phrases: Iterable[str] = (),
+    ):
+        self.base_ms = max(BLOCK_MS, float(base_ms))
+        self.complete_ms = max(BLOCK_MS, float(complete_ms))
+        self.short_reply_ms = max(BLOCK_MS, float(short_reply_ms))
+        self.max_ms = max(self.base_ms, float(max_ms))
+        self.short_phrases = {normalize_for_match(p) for p in short_phrases if p}
+        self.expect_short_reply = False
+        self.speaker_pause_ms = 0.0
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the utterance in progress (speaker history is kept)."""
+        self.utterance_pause_ms = 0.0
+        self.partial_text = ""
+        self._partial_end_block = 0
+        self.window_ms = self.base_ms
+        self.factors: List[str] = []
+
+    def on_resume(self, silence_blocks: int) -> None:
+        """Speech came back after ``silence_blocks`` of silence."""
+        pause_ms = silence_blocks * BLOCK_MS
+        if pause_ms >= HESITATION_MIN_PAUSE_MS:
+            self.utterance_pause_ms = max(self.utterance_pause_ms, pause_ms)
+
+    def on_partial(self, text: str, *, end_block: int) -> None:
+        """A partial transcript of the capture up to (not including) ``end_block``."""
+        self.partial_text = text
+        self._partial_end_block = end_block
+
+    def limit_blocks(self, *, last_speech_block: int) -> int:
+        """Silent blocks that end the utterance now; updates ``window_ms`` and ``factors``."""
+        ms = self.base_ms
+        factors: List[str] = []
+        complete = None
+        if self.partial_text and self._partial_end_block > last_speech_block:
+            complete = looks_complete(self.partial_text, self.short_phrases)
+        if complete is False:
+            ms = self.max_ms
+            factors.append("trailing_word")
+        else:
+            if complete:
+                ms = min(ms, self.complete_ms)
+                factors.append("complete")
+            if self.expect_short_reply:
+                ms = min(ms, self.short_reply_ms)
+                factors.append("short_reply")
+        pause_ms = max(self.utterance_pause_ms, self.speaker_pause_ms)
+        if pause_ms and pause_ms + HESITATION_MARGIN_MS > ms:
+            ms = min(self.max_ms, pause_ms + HESITATION_MARGIN_MS)
+            factors.append("hesitation")
+        self.window_ms = ms
+        self.factors = factors
+        # Truncated like the fixed ``end_silence_ms`` window, so the base case is unchanged.
+        return max(1, int(ms / BLOCK_MS))
+
+    def finish(self) -> None:
+        """The utterance ended; fold its longest pause into the speaker history."""
+        self.speaker_pause_ms = (1 - SPEAKER_PAUSE_SMOOTHING) * self.speaker_pause_ms + SPEAKER_PAUSE_SMOOTHING * self.utterance_pause_ms
+
+    def decision(self) -> Dict[str, Any]:
+        return {
+            "end_silence_ms": int(self.window_ms),
+            "endpoint_factors": list(self.factors),
+            "utterance_pause_ms": int(self.utterance_pause_ms),
+            "speaker_pause_ms": int(self.speaker_pause_ms),
+            "expect_short_reply": self.expect_short_reply,
+            "partial_text": self.partial_text,
+        }
@@ -0,0 +1,421 @@
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+from urllib.parse import quote
+
+from .common import normalize_for_match
+from .log import Logger
+
+# Spoken names of common room ids; ``agent.fast_path_room_aliases`` adds more.
+ROOM_NAMES: Dict[str, Tuple[str, ...]] = {
+    "living_room": ("客厅",),
+    "bedroom": ("卧室",),
+    "master_bedroom": ("主卧", "主卧室"),
+    "second_bedroom": ("次卧", "次卧室"),
+    "guest_room": ("客房",),
+    "kids_room": ("儿童房",),
+    "study": ("书房",),
+    "kitchen": ("厨房",),
+    "dining_room": ("餐厅",),
+    "bathroom": ("卫生间", "浴室", "洗手间"),
+    "balcony": ("阳台",),
+    "hallway": ("走廊", "过道"),
+    "entrance": ("玄关",),
+    "garage": ("车库",),
+}
+VERBS: Dict[str, Tuple[str, ...]] = {
+    "turn_on": ("打开", "开启", "开"),
+    "turn_off": ("关闭", "关掉", "关上", "关"),
+    "set_brightness": ("亮度调到", "亮度调成", "亮度设为", "亮度设置为", "调到", "调成", "设为", "设置为"),
+}
+QUERIES: Dict[str, Tuple[str, ...]] = {
+    "state": ("开着吗", "开了吗", "关着吗", "关了吗", "是开着还是关着", "有没有开", "有没有关", "什么状态", "状态"),
+    "brightness": ("亮度是多少", "亮度多少", "现在多亮", "多亮"),
+}
+# Generic device nouns, matched against device names.
+KINDS: Dict[str, Tuple[str, ...]] = {
+    "light": ("灯", "灯光", "电灯"),
+    "plug": ("插座",),
+    "cover": ("窗帘",),
+    "climate": ("空调",),
+}
+# Words that may surround a command without changing it. Scope words such as
+# "所有"/"全部"/"都" are not here: "把所有灯都关了" is left to the agent.
+FILLERS = ("请", "帮我", "给我", "麻烦", "把", "将", "一下", "的", "吧", "了", "啊", "呀", "吗", "现在", "目前")
+# Voice risk levels the agent turns into a ``propose`` (see its voice risk gate).
+CONFIRM_RISKS = ("medium", "high")
+# "度" is left out on purpose: "调到26度" is a temperature, not a brightness.
+_NUMBER = re.compile(r"(百分之)?([0-9]{1,3}|[零一二两三四五六七八九十百]{1,4})(%)?")
+_ZH_DIGITS = {"零": 0, "一": 1, "二": 2, "两": 2, "三": 3, "四": 4, "五": 5, "六": 6, "七": 7, "八": 8, "九": 9}
+REQUEST_TIMEOUT_S = 3.0
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton mapping each pattern to a list of payloads."""
+
+    def __init__(self, patterns: Iterable[Tuple[str, Any]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, Any]]] = [[]]
+        for pattern, payload in patterns:
+            if pattern:
+                self._add(pattern, payload)
+        self._link()
+
+    def find(self, text: str) -> List[Tuple[int, int, Any]]:
+        """Every ``(start, end, payload)`` occurrence in ``text``."""
+        out: List[Tuple[int, int, Any]] = []
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            for length, payload in self._out[state]:
+                out.append((i + 1 - length, i + 1, payload))
+        return out
+
+    def _add(self, pattern: str, payload: Any) -> None:
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((len(pattern), payload))
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+
+@dataclass(frozen=True)
+class FastIntent:
+    """A command understood without the agent: ``action`` on ``device_ids``, or a ``query``."""
+
+    device_ids: Tuple[str, ...]
+    action: str = ""
+    params: Dict[str, Any] = field(default_factory=dict)
+    query: str = ""
+
+
+def parse_number(text: str) -> Optional[int]:
+    if text.isdigit():
+        return int(text)
+    if text == "百":
+        return 100
+    total, digit = 0, 0
+    for ch in text:
+        if ch in _ZH_DIGITS:
+            digit = _ZH_DIGITS[ch]
+        elif ch == "十":
+            total += (digit or 1) * 10
+            digit = 0
+        elif ch == "百":
+            total += (digit or 1) * 100
+            digit = 0
+        else:
+            return None
+    return total + digit
+
+
+def device_kinds(device: Mapping[str, Any]) -> set[str]:
+    name = str(device.get("name") or "")
+    traits = device.get("traits") if isinstance(device.get("traits"), dict) else {}
+    tags = (device.get("semantics") or {}).get("tags") if isinstance(device.get("semantics"), dict) else None
+    tags = {str(t).lower() for t in tags} if isinstance(tags, list) else set()
+    kinds = {kind for kind, words in KINDS.items() if any(w in name for w in words) or kind in tags}
+    if "dimmer" in traits:
+        kinds.add("light")
+    if "cover" in traits:
+        kinds.add("cover")
+    if "climate" in traits:
+        kinds.add("climate")
+    return kinds
+
+
+def device_actions(device: Mapping[str, Any]) -> set[str]:
+    caps = device.get("capabilities") if isinstance(device.get("capabilities"), list) else []
+    return {str(c.get("action")) for c in caps if isinstance(c, dict) and c.get("action")}
+
+
+def voice_risk(device: Mapping[str, Any], action: str) -> str:
+    """``bindings.voice_control.actions[action].risk``, lower-cased ("" when unset)."""
+    binding: Any = device.get("bindings")
+    for key in ("voice_control", "actions", action):
+        binding = binding.get(key) if isinstance(binding, dict) else None
+    return str(binding.get("risk") or "").lower() if isinstance(binding, dict) else ""
+
+
+class FastPathIndex:
+    """Matcher for one snapshot of the device catalog.
+
+    Device names, ``semantics.aliases``, names without their room prefix
+    ("主灯" for "客厅主灯"), room names, generic nouns, verbs, state questions
+    and filler words all go into one Aho-Corasick automaton. ``match`` only
+    answers when the leftmost-longest tokens (plus one number) cover the whole
+    utterance and name exactly one verb or question and an unambiguous set
+    of devices that support it; anything else is left to the agent. Actions
+    with a medium or high voice risk always go to the agent, which asks
+    for confirmation. The agent's ``AGENT_EXECUTION_MODE=always_confirm`` is
+    not visible here: leave ``agent.fast_path`` off in that mode.
+    """
+
+    def __init__(self, by_id: Mapping[str, Mapping[str, Any]], *, room_aliases: Optional[Mapping[str, Sequence[str]]] = None):
+        self.by_id = {did: dict(d) for did, d in by_id.items() if isinstance(d, Mapping)}
+        rooms: Dict[str, set[str]] = {room: set(names) for room, names in ROOM_NAMES.items()}
+        for room, names in (room_aliases or {}).items():
+            rooms.setdefault(str(room), set()).update(str(n) for n in names if n)
+        self.kinds = {did: device_kinds(d) for did, d in self.by_id.items()}
+        self.rooms = {did: str((d.get("placement") or {}).get("room") or "") for did, d in self.by_id.items()}
+        patterns: List[Tuple[str, Any]] = []
+        for room, names in rooms.items():
+            patterns.extend((normalize_for_match(n), ("room", room)) for n in names)
+        for did, device in self.by_id.items():
+            names = [str(device.get("name") or "")]
+            aliases = (device.get("semantics") or {}).get("aliases") if isinstance(device.get("semantics"), dict) else None
+            names.extend(str(a) for a in aliases or [] if a)
+            for name in {normalize_for_match(n) for n in names if n}:
+                patterns.append((name, ("device", did)))
+                for room_name in rooms.get(self.rooms[did], ()):
+                    prefix = normalize_for_match(room_name)
+                    if name.startswith(prefix) and len(name) > len(prefix):
+                        patterns.append((name[len(prefix) :].lstrip("的"), ("local", did)))
+        for kind, words in KINDS.items():
+            patterns.extend((w, ("kind", kind)) for w in words)
+        for action, words in VERBS.items():
+            patterns.extend((w, ("verb", action)) for w in words)
+        for query, words in QUERIES.items():
+            patterns.extend((w, ("query", query)) for w in words)
+        patterns.extend((w, ("filler", None)) for w in FILLERS)
+        self._automaton = AhoCorasick(patterns)
+
+    def match(self, text: str, *, room: str = "") -> Tuple[Optional[FastIntent], str]:
+        """``(intent, "")`` or ``(None, reason)``; ``room`` scopes "把灯关了"."""
+        t = normalize_for_match(text)
+        if not t:
+            return None, "empty"
+        tokens = self._tokens(t)
+        if sum(end - start for start, end, _ in tokens) != len(t):
+            return None, "uncovered"
+        kinds: Dict[str, set] = {}
+        number: Optional[int] = None
+        for _start, _end, payloads in tokens:
+            for kind, value in payloads:
+                if kind == "number":
+                    if number is not None:
+                        return None, "numbers"
+                    number = value
+                else:
+                    kinds.setdefault(kind, set()).add(value)
+        verbs, queries = kinds.get("verb", set()), kinds.get("query", set())
+        if len(verbs) + len(queries) != 1:
+            return None, "intent"
+        rooms = kinds.get("room", set())
+        if len(rooms) > 1:
+            return None, "rooms"
+        scope = next(iter(rooms)) if rooms else room
+
+        targets = set(kinds.get("device", set()))
+        for did in kinds.get("local", set()):
+            if self.rooms.get(did) == scope:
+                targets.add(did)
+        if kinds.get("local") and not targets:
+            return None, "device_room"
+        for kind in kinds.get("kind", set()):
+            in_scope = {did for did, k in self.kinds.items() if kind in k and self.rooms.get(did) == scope}
+            if not in_scope and not targets:
+                return None, "no_device"
+            targets |= in_scope
+        if not targets:
+            return None, "no_device"
+        device_ids = tuple(sorted(targets))
+
+        if queries:
+            if number is not None:
+                return None, "numbers"
+            query = next(iter(queries))
+            for did in device_ids:
+                if not _answer_part(did, self.by_id[did], query):
+                    return None, "no_state"
+            return FastIntent(device_ids=device_ids, query=query), ""
+        action = next(iter(verbs))
+        params: Dict[str, Any] = {}
+        if action == "set_brightness":
+            if number is None or not 0 <= number <= 100:
+                return None, "brightness_value"
+            params = {"brightness": number}
+        elif number is not None:
+            return None, "numbers"
+        for did in device_ids:
+            if action not in device_actions(self.by_id[did]):
+                return None, "not_supported"
+            # The agent asks before running these; only it can hold the confirmation.
+            if voice_risk(self.by_id[did], action) in CONFIRM_RISKS:
+                return None, "risk"
+        return FastIntent(device_ids=device_ids, action=action, params=params), ""
+
+    def answer(self, intent: FastIntent, by_id: Optional[Mapping[str, Mapping[str, Any]]] = None) -> str:
+        """Spoken answer to a query intent from ``by_id`` (the live catalog) or this snapshot."""
+        by_id = by_id if by_id is not None else self.by_id
+        return "，".join(_answer_part(did, by_id.get(did) or self.by_id[did], intent.query) for did in intent.device_ids) + "。"
+
+    def _tokens(self, text: str) -> List[Tuple[int, int, List[Tuple[str, Any]]]]:
+        """Leftmost-longest non-overlapping tokens; a span keeps all its payloads
+        (one name can belong to several devices)."""
+        candidates: List[Tuple[int, int, Tuple[str, Any]]] = []
+        for m in _NUMBER.finditer(text):
+            value = parse_number(m.group(2))
+            if value is not None:
+                candidates.append((m.start(), m.end(), ("number", value)))
+        candidates.extend(self._automaton.find(text))
+        candidates.sort(key=lambda c: (c[0], -(c[1] - c[0])))
+        out: List[Tuple[int, int, List[Tuple[str, Any]]]] = []
+        for start, end, payload in candidates:
+            if out and (out[-1][0], out[-1][1]) == (start, end):
+                out[-1][2].append(payload)
+            elif not out or start >= out[-1][1]:
+                out.append((start, end, [payload]))
+        return out
+
+
+def _answer_part(did: str, device: Mapping[str, Any], query: str) -> str:
+    name = str(device.get("name") or did)
+    traits = device.get("traits") if isinstance(device.get("traits"), dict) else {}
+    if query == "state":
+        for trait in ("dimmer", "switch"):
+            state = traits[trait].get("state") if isinstance(traits.get(trait), dict) else None
+            if state in ("on", "off"):
+                return f"{name}{'开着' if state == 'on' else '关着'}"
+        return ""
+    if query == "brightness":
+        dimmer = traits.get("dimmer") if isinstance(traits.get("dimmer"), dict) else {}
+        if dimmer.get("state") == "off":
+            return f"{name}关着"
+        value = dimmer.get("brightness")
+        return f"{name}亮度{int(value)}%" if isinstance(value, (int, float)) else ""
+    return ""
+
+
+class FastPath:
+    """Runs simple device commands and state questions without the agent.
+
+    Built over the live ``DeviceCatalog``; the index is rebuilt when device
+    names, rooms, aliases or capabilities change. Actions go straight to
+    api-gateway ``POST /devices/{id}/actions``. ``turn`` returns an agent-style
+    reply (``executed`` / ``answer``) or None when the agent should handle it.
+    """
+
+    def __init__(
+        self,
+        *,
+        devices: Any,
+        base_url: str,
+        api_key: str = "",
+        room_aliases: Optional[Mapping[str, Sequence[str]]] = None,
+        logger: Logger | None = None,
+        transport: Optional[Any] = None,
+    ):
+        import httpx
+
+        self.devices = devices
+        self.base_url = base_url.rstrip("/")
+        self.room_aliases = dict(room_aliases or {})
+        self.logger = logger
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(REQUEST_TIMEOUT_S),
+            headers={"X-API-Key": api_key} if api_key else {},
+            transport=transport,
+        )
+        self._index: Optional[FastPathIndex] = None
+        self._signature: Any = None
+        self.hits = 0
+        self.misses = 0
+
+    def index(self) -> FastPathIndex:
+        by_id = dict(getattr(self.devices, "by_id", {}) or {})
+        signature = tuple(
+            sorted(
+                (
+                    did,
+                    str(d.get("name") or ""),
+                    str((d.get("placement") or {}).get("room") or ""),
+                    repr((d.get("semantics") or {}).get("aliases")),
+                    repr(sorted(device_actions(d))),
+                    repr(d.get("bindings")),
+                )
+                for did, d in by_id.items()
+                if isinstance(d, dict)
+            )
+        )
+        if self._index is None or signature != self._signature:
+            self._index = FastPathIndex(by_id, room_aliases=self.room_aliases)
+            self._signature = signature
+        return self._index
+
+    async def turn(self, text: str, *, room: str = "") -> Optional[Dict[str, Any]]:
+        started_at = time.monotonic()
+        index = self.index()
+        intent, reason = index.match(text, room=room)
+        if intent is None:
+            self.misses += 1
+            self.logger and self.logger.debug({"msg": "fast_path.miss", "text": text, "reason": reason})
+            return None
+        if intent.query:
+            # Answered from the catalog's current traits (kept fresh by the change feed).
+            out: Dict[str, Any] = {"type": "answer", "message": index.answer(intent, self.devices.by_id)}
+        else:
+            actions = [{"deviceId": did, "action": intent.action, "params": dict(intent.params)} for did in intent.device_ids]
+            results = await asyncio.gather(*(self._post(a) for a in actions))
+            if not any(r.get("ok") for r in results):
+                self.misses += 1
+                self.logger and self.logger.warn({"msg": "fast_path.failed", "text": text, "results": results})
+                return None
+            out = {"type": "executed", "message": "", "actions": actions, "result": {"results": results}}
+        self.hits += 1
+        self.logger and self.logger.info(
+            {
+                "msg": "fast_path.hit",
+                "text": text,
+                "devices": list(intent.device_ids),
+                "action": intent.action or None,
+                "query": intent.query or None,
+                "fast_path_ms": int((time.monotonic() - started_at) * 1000),
+            }
+        )
+        return out
+
+    def stats(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def _post(self, action: Dict[str, Any]) -> Dict[str, Any]:
+        url = f"{self.base_url}/devices/{quote(action['deviceId'], safe='')}/actions"
+        out = {"deviceId": action["deviceId"], "action": action["action"]}
+        try:
+            r = await self._client.post(url, json={"action": action["action"], "params": action["params"]})
+        except Exception as exc:
+            return {**out, "ok": False, "error": str(exc)}
+        try:
+            body = r.json()
+        except ValueError:
+            body = {"message": (r.text or "")[:200]}
+        return {**out, "ok": not r.is_error, "result": body}
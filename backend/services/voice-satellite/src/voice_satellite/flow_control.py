@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from .common import PROCESS_SAMPLE_RATE
+
+PLAYBACK_BYTES_PER_SEC = PROCESS_SAMPLE_RATE * 2
+# Firmware that does not advertise a playback buffer gets this much audio ahead
+# of real time (two 128 ms chunks, about what the old fixed pacing allowed).
+LEGACY_WINDOW_BYTES = 8192
+RTT_SMOOTHING = 0.2
+
+
+class DownlinkCredit:
+    """Credit window for ``tts_chunk`` audio on one satellite connection.
+
+    A satellite that advertises ``hello.playbackBufferBytes`` returns credit
+    with ``tts_ack.playedBytes`` (bytes played since the last ``tts_start``).
+    Each reply gets a new ``reply_id`` (sent as ``tts_start.replyId``); an ack
+    that echoes an older ``replyId`` belongs to a finished reply and is ignored.
+    The server bursts up to the window at the start of a reply and then sends
+    as credit arrives; the window covers ``prebuffer_ms`` of jitter plus one
+    round trip for the acks, capped by the device buffer. If no ack arrives
+    for ``ack_timeout_ms`` credit follows the playback clock until acks resume.
+
+    Without an advertised buffer credit always follows the playback clock,
+    ``LEGACY_WINDOW_BYTES`` ahead. Either way the sender only waits when the
+    window is full.
+    """
+
+    def __init__(self, *, buffer_bytes: int = 0, prebuffer_ms: int = 300, ack_timeout_ms: int = 1500):
+        self.buffer_bytes = max(0, int(buffer_bytes))
+        self.credit_mode = self.buffer_bytes > 0
+        self.prebuffer_ms = max(0, int(prebuffer_ms))
+        self.ack_timeout_s = max(1, int(ack_timeout_ms)) / 1000.0
+        self.rtt_s = 0.0
+        self.reply_id = 0
+        self.stale_acks = 0
+        self.waits = 0
+        self.stalls = 0
+        self.stalled = False
+        self._sent = 0
+        self._played = 0
+        self._first_sent_at = 0.0
+        self._last_credit_at = 0.0
+        self._changed = asyncio.Event()
+
+    def observe_rtt(self, rtt_s: float) -> None:
+        if rtt_s and rtt_s > 0:
+            self.rtt_s = rtt_s if not self.rtt_s else (1 - RTT_SMOOTHING) * self.rtt_s + RTT_SMOOTHING * rtt_s
+
+    def window_bytes(self) -> int:
+        if not self.credit_mode:
+            return LEGACY_WINDOW_BYTES
+        target = int((self.prebuffer_ms / 1000.0 + self.rtt_s) * PLAYBACK_BYTES_PER_SEC)
+        return max(1, min(self.buffer_bytes, target))
+
+    def start_reply(self) -> int:
+        self.reply_id += 1
+        self._sent = 0
+        self._played = 0
+        self._first_sent_at = 0.0
+        self._last_credit_at = 0.0
+        self.waits = 0
+        self.stalls = 0
+        self.stalled = False
+        return self.reply_id
+
+    def on_ack(self, played_bytes: int, reply_id: Optional[int] = None) -> None:
+        """Credit an ack; ``reply_id`` is None for firmware that does not echo it."""
+        if reply_id is not None and reply_id != self.reply_id:
+            self.stale_acks += 1
+            return
+        played = min(int(played_bytes), self._sent)
+        if played > self._played:
+            self._played = played
+            self._last_credit_at = time.monotonic()
+            self.stalled = False
+            self._changed.set()
+
+    async def acquire(self, nbytes: int) -> None:
+        """Wait until ``nbytes`` more fit in the window, then count them as sent."""
+        now = time.monotonic()
+        if not self._first_sent_at:
+            self._first_sent_at = self._last_credit_at = now
+        window = self.window_bytes()
+        waited = False
+        while True:
+            in_flight = self._sent - self._credited(now)
+            # A chunk larger than the window still goes out once nothing is in flight.
+            if in_flight <= 0 or in_flight + nbytes <= window:
+                break
+            if not waited:
+                waited = True
+                self.waits += 1
+            # When the playback clock alone would make room for this chunk.
+            clock_at = self._first_sent_at + (self._sent + nbytes - window) / PLAYBACK_BYTES_PER_SEC
+            if self.credit_mode and not self.stalled:
+                wake_at = self._last_credit_at + self.ack_timeout_s
+            else:
+                wake_at = clock_at
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=max(0.0, wake_at - now))
+            except asyncio.TimeoutError:
+                pass
+            now = time.monotonic()
+        self._sent += nbytes
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "flow": "credit" if self.credit_mode else "clock",
+            "window_bytes": self.window_bytes(),
+            "rtt_ms": int(self.rtt_s * 1000),
+            "flow_waits": self.waits,
+            "ack_stalls": self.stalls,
+            "stale_acks": self.stale_acks,
+        }
+
+    def _credited(self, now: float) -> int:
+        clock = int((now - self._first_sent_at) * PLAYBACK_BYTES_PER_SEC)
+        if not self.credit_mode:
+            return clock
+        if not self.stalled and now - self._last_credit_at >= self.ack_timeout_s:
+            self.stalled = True
+            self.stalls += 1
+        return max(self._played, clock) if self.stalled else self._played
@@ -0,0 +1,602 @@
+"""Load test for ws_server: N simulated satellites at real-time pace.
+
+Each satellite speaks the real protocol (``hello``, ``wake``, ``audio_start``,
+audio frames, ``audio_end``) and plays back the reply like a device would.
+By default the server runs in this process with stub STT/TTS/agent/VAD of
+configurable latency; ``--stub none`` uses the backends from the config, and
+``--url`` targets a server that is already running.
+
+    python -m voice_satellite.loadtest --config config.ws-server.example.yaml --satellites 8 --turns 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import dataclasses
+import json
+import os
+import resource
+import tempfile
+import time
+import wave
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from .audio_types import SynthesizedAudio
+from .common import PROCESS_BLOCK_SIZE, PROCESS_SAMPLE_RATE
+from .config import AppConfig, load_config
+from .log import Logger
+from .metrics import EXPORT_QUANTILES, STAGES, LatencyHistogram, PipelineMetrics
+from .remote_server import run_ws_server
+from .stt_fake import FakeStt
+from .ws_framing import FRAME_AUDIO, FRAME_TTS, FRAMING_BINARY, FRAMING_JSON, decode_frame, encode_frame, session_tag
+
+# Uplink frame size: one VAD block, as the satellite firmware sends it.
+UPLINK_CHUNK_BYTES = PROCESS_BLOCK_SIZE * 2
+UPLINK_CHUNK_SEC = PROCESS_BLOCK_SIZE / float(PROCESS_SAMPLE_RATE)
+# Keep streaming silence this long after the fixture while waiting for stop_capture.
+TRAILING_SILENCE_MS = 3000
+# Client-side latencies measured by every simulated satellite.
+CLIENT_STAGES = ("audio_end_to_transcript", "audio_end_to_first_tts", "wake_to_tts_end")
+STUBS = ("stt", "tts", "agent", "vad")
+
+
+@dataclass
+class StubStt(FakeStt):
+    """``FakeStt`` that holds the worker thread for ``latency_ms``, like a real decode."""
+
+    latency_ms: int = 0
+
+    def transcribe(self, audio: np.ndarray, *, sample_rate: int):
+        time.sleep(self.latency_ms / 1000.0)
+        return super().transcribe(audio, sample_rate=sample_rate)
+
+
+@dataclass
+class StubTts:
+    """Silent 16 kHz speech, ``ms_per_char`` long, first audio after ``latency_ms``.
+
+    The rest of the reply is produced at ``rtf`` (synthesis seconds per second
+    of audio), streamed in quarter-second pieces.
+    """
+
+    latency_ms: int = 0
+    ms_per_char: int = 200
+    rtf: float = 0.1
+
+    def stream_sample_rate(self) -> int:
+        return PROCESS_SAMPLE_RATE
+
+    def synthesize_stream(self, text: str) -> Iterator[bytes]:
+        remaining = self._samples(text)
+        piece = PROCESS_SAMPLE_RATE // 4
+        time.sleep(self.latency_ms / 1000.0)
+        while remaining > 0:
+            n = min(piece, remaining)
+            remaining -= n
+            yield bytes(n * 2)
+            if remaining:
+                time.sleep(n / float(PROCESS_SAMPLE_RATE) * self.rtf)
+
+    def synthesize(self, text: str) -> SynthesizedAudio:
+        pcm = b"".join(self.synthesize_stream(text))
+        return SynthesizedAudio(sample_rate=PROCESS_SAMPLE_RATE, channels=1, sample_width=2, pcm_s16le=pcm)
+
+    def _samples(self, text: str) -> int:
+        return max(1, len(text)) * self.ms_per_char * PROCESS_SAMPLE_RATE // 1000
+
+
+@dataclass
+class StubAgent:
+    """Answers every turn with ``reply`` after ``latency_ms``."""
+
+    latency_ms: int = 0
+    reply: str = "好的，已经为你打开客厅的灯。"
+
+    async def turn(self, *, session_id: str, text: str, confirm: bool, wake_source: Optional[dict] = None) -> Dict[str, Any]:
+        await asyncio.sleep(self.latency_ms / 1000.0)
+        return {"type": "answer", "message": self.reply}
+
+
+class StubDevices:
+    """Empty device catalog; no api-gateway is contacted."""
+
+    def __init__(self) -> None:
+        self.by_id: Dict[str, Dict[str, Any]] = {}
+
+    def refresh_in_background(self, force: bool = False) -> bool:
+        return False
+
+
+class EnergyVad:
+    """RMS threshold instead of Silero, so synthetic fixtures trigger it."""
+
+    def __init__(self, threshold_rms: float = 0.02):
+        self.threshold = threshold_rms * 32768.0
+
+    def probability(self, block: np.ndarray) -> float:
+        rms = float(np.sqrt(np.mean(np.square(block, dtype=np.float32)))) if block.size else 0.0
+        return 1.0 if rms >= self.threshold else 0.0
+
+
+def load_fixture(path: str) -> bytes:
+    """pcm_s16le frames of a 16 kHz mono 16-bit WAV file."""
+    with wave.open(path, "rb") as wf:
+        if wf.getframerate() != PROCESS_SAMPLE_RATE or wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+            raise SystemExit(f"{path}: fixtures must be {PROCESS_SAMPLE_RATE} Hz mono 16-bit WAV")
+        return wf.readframes(wf.getnframes())
+
+
+def synthetic_fixture(*, lead_ms: int = 200, speech_ms: int = 1200, seed: int = 0) -> bytes:
+    """Quiet lead-in followed by a speech-loud noise burst (deterministic)."""
+    rng = np.random.default_rng(seed)
+    lead = rng.normal(0, 30, PROCESS_SAMPLE_RATE * lead_ms // 1000)
+    speech = rng.normal(0, 3000, PROCESS_SAMPLE_RATE * speech_ms // 1000)
+    return np.concatenate([lead, speech]).clip(-32768, 32767).astype(np.int16).tobytes()
+
+
+@dataclass
+class TurnResult:
+    ok: bool
+    error: str = ""
+    latencies_ms: Dict[str, float] = field(default_factory=dict)
+    chunks: int = 0
+    dropped: int = 0
+    late: int = 0
+
+
+class _Playback:
+    """Tracks a device playing tts chunks as they arrive.
+
+    A chunk is late when it arrives after the audio before it has finished
+    playing (plus ``jitter_ms`` of device buffering): the speaker underran.
+    A gap in ``seq`` counts the missing chunks as dropped.
+    """
+
+    def __init__(self, jitter_ms: int):
+        self.jitter = jitter_ms / 1000.0
+        self.play_until = 0.0
+        self.next_seq: Optional[int] = None
+        self.received = 0
+        self.chunks = 0
+        self.dropped = 0
+        self.late = 0
+
+    def chunk(self, at: float, seq: int, nbytes: int, *, wrap: bool) -> None:
+        if self.next_seq is not None and seq != self.next_seq:
+            gap = (seq - self.next_seq) & 0xFFFF if wrap else seq - self.next_seq
+            self.dropped += max(0, gap)
+        self.next_seq = (seq + 1) & 0xFFFF if wrap else seq + 1
+        if self.chunks and at > self.play_until + self.jitter:
+            self.late += 1
+        self.chunks += 1
+        self.received += nbytes
+        self.play_until = max(self.play_until, at) + nbytes / 2.0 / PROCESS_SAMPLE_RATE
+
+    def played_bytes(self, now: float) -> int:
+        buffered = int(max(0.0, self.play_until - now) * PROCESS_SAMPLE_RATE) * 2
+        return max(0, self.received - buffered)
+
+    def played_at(self, played_bytes: int) -> float:
+        """When playback reaches ``played_bytes`` (of the audio received so far)."""
+        return self.play_until - (self.received - played_bytes) / 2.0 / PROCESS_SAMPLE_RATE
+
+
+class SimulatedSatellite:
+    def __init__(
+        self,
+        url: str,
+        device_id: str,
+        fixture: bytes,
+        *,
+        auth_token: str = "",
+        framing: str = FRAMING_BINARY,
+        jitter_ms: int = 100,
+        playback_buffer_bytes: int = 16384,
+        turn_timeout_s: float = 30.0,
+    ):
+        self.url = url
+        self.device_id = device_id
+        self.fixture = fixture
+        self.auth_token = auth_token
+        self.framing = framing
+        self.jitter_ms = jitter_ms
+        self.playback_buffer_bytes = playback_buffer_bytes
+        self.turn_timeout_s = turn_timeout_s
+        self._inbox: asyncio.Queue = asyncio.Queue()
+        self._ws: Any = None
+        self._binary = False
+        self._ack_interval = 0
+        self._uplink_seq = 0
+
+    async def run(self, *, turns: int, think_ms: int = 500, start_delay_s: float = 0.0) -> List[TurnResult]:
+        from websockets.legacy.client import connect
+
+        await asyncio.sleep(start_delay_s)
+        results: List[TurnResult] = []
+        try:
+            async with connect(self.url, max_size=None) as ws:
+                self._ws = ws
+                await ws.send(
+                    json.dumps(
+                        {
+                            "type": "hello",
+                            "deviceId": self.device_id,
+                            "authToken": self.auth_token,
+                            "encoding": "pcm_s16le",
+                            "sampleRate": PROCESS_SAMPLE_RATE,
+                            "channels": 1,
+                            "framing": self.framing,
+                            "playbackBufferBytes": self.playback_buffer_bytes,
+                        }
+                    )
+                )
+                ack = json.loads(await asyncio.wait_for(ws.recv(), timeout=10))
+                if ack.get("type") != "hello_ack":
+                    return [TurnResult(ok=False, error=str(ack.get("code") or ack.get("type")))] * turns
+                self._binary = ack.get("framing") == FRAMING_BINARY
+                flow = ack.get("flowControl") or {}
+                if flow.get("mode") == "credit":
+                    self._ack_interval = max(1, int(flow.get("ackIntervalBytes") or 4096))
+                reader = asyncio.create_task(self._read())
+                try:
+                    for i in range(turns):
+                        if i:
+                            await asyncio.sleep(think_ms / 1000.0)
+                        results.append(await self._turn())
+                finally:
+                    reader.cancel()
+        except Exception as exc:  # OSError, TimeoutError, websockets ConnectionClosed / InvalidStatusCode
+            results.append(TurnResult(ok=False, error=type(exc).__name__))
+        return results + [TurnResult(ok=False, error="not_run")] * (turns - len(results))
+
+    async def _read(self) -> None:
+        async for raw in self._ws:
+            self._inbox.put_nowait((time.monotonic(), raw))
+
+    def _decode(self, raw: Any) -> Dict[str, Any]:
+        if isinstance(raw, bytes):
+            frame = decode_frame(raw)
+            if frame.kind != FRAME_TTS:
+                return {"type": "unknown_frame"}
+            return {"type": "tts_chunk", "seq": frame.seq, "bytes": len(frame.payload)}
+        event = json.loads(raw)
+        if event.get("type") == "tts_chunk":
+            event["bytes"] = len(base64.b64decode(event.pop("data", "") or ""))
+        return event
+
+    async def _next_event(self, deadline: float) -> tuple[float, Dict[str, Any]]:
+        at, raw = await asyncio.wait_for(self._inbox.get(), timeout=max(0.0, deadline - time.monotonic()))
+        return at, self._decode(raw)
+
+    async def _send_audio(self, chunk: bytes, session_id: str) -> None:
+        if self._binary:
+            await self._ws.send(encode_frame(FRAME_AUDIO, chunk, seq=self._uplink_seq, session_tag=session_tag(session_id)))
+            self._uplink_seq += 1
+        else:
+            await self._ws.send(json.dumps({"type": "audio_chunk", "data": base64.b64encode(chunk).decode("ascii")}))
+
+    async def _turn(self) -> TurnResult:
+        result = TurnResult(ok=False)
+        deadline = time.monotonic() + self.turn_timeout_s
+        wake_at = time.monotonic()
+        try:
+            await self._ws.send(json.dumps({"type": "wake"}))
+            while True:
+                _, event = await self._next_event(deadline)
+                if event.get("type") == "listening":
+                    session_id = str(event.get("sessionId") or "")
+                    break
+                if event.get("type") == "error":
+                    result.error = str(event.get("code"))
+                    return result
+            await self._ws.send(json.dumps({"type": "audio_start"}))
+
+            silence = bytes(UPLINK_CHUNK_BYTES)
+            max_pos = len(self.fixture) + TRAILING_SILENCE_MS * PROCESS_SAMPLE_RATE * 2 // 1000
+            pos = 0
+            next_at = time.monotonic()
+            stopped = False
+            while not stopped and pos < max_pos:
+                await self._send_audio(self.fixture[pos : pos + UPLINK_CHUNK_BYTES] if pos < len(self.fixture) else silence, session_id)
+                pos += UPLINK_CHUNK_BYTES
+                next_at += UPLINK_CHUNK_SEC
+                stopped = self._drain_until_stop(result)
+                if result.error:
+                    return result
+                await asyncio.sleep(max(0.0, next_at - time.monotonic()))
+            await self._ws.send(json.dumps({"type": "audio_end"}))
+            audio_end_at = time.monotonic()
+
+            playback = _Playback(self.jitter_ms)
+            acked = 0
+            reply_id = None
+            while True:
+                ack_due = deadline
+                if self._ack_interval and playback.received > acked:
+                    ack_due = min(deadline, playback.played_at(min(playback.received, acked + self._ack_interval)))
+                try:
+                    at, event = await self._next_event(ack_due)
+                except asyncio.TimeoutError:
+                    if time.monotonic() >= deadline:
+                        raise
+                    # Return credit for what the speaker has played, like the firmware does.
+                    acked = playback.played_bytes(time.monotonic())
+                    await self._ws.send(json.dumps({"type": "tts_ack", "sessionId": session_id, "replyId": reply_id, "playedBytes": acked}))
+                    continue
+                kind = event.get("type")
+                if kind == "transcript":
+                    result.latencies_ms["audio_end_to_transcript"] = (at - audio_end_at) * 1000
+                elif kind == "tts_start":
+                    reply_id = event.get("replyId")
+                elif kind == "tts_chunk":
+                    if not playback.chunks:
+                        result.latencies_ms["audio_end_to_first_tts"] = (at - audio_end_at) * 1000
+                    playback.chunk(at, int(event.get("seq") or 0), int(event.get("bytes") or 0), wrap=self._binary)
+                elif kind == "tts_end":
+                    result.latencies_ms["wake_to_tts_end"] = (at - wake_at) * 1000
+                    result.ok = not event.get("aborted")
+                    result.error = "tts_aborted" if event.get("aborted") else ""
+                    break
+                elif kind in ("error", "session_closed"):
+                    result.error = str(event.get("code") or event.get("reason") or kind)
+                    break
+            result.chunks, result.dropped, result.late = playback.chunks, playback.dropped, playback.late
+        except asyncio.TimeoutError:
+            result.error = "turn_timeout"
+        return result
+
+    def _drain_until_stop(self, result: TurnResult) -> bool:
+        stopped = False
+        while not self._inbox.empty():
+            event = self._decode(self._inbox.get_nowait()[1])
+            if event.get("type") == "stop_capture":
+                stopped = True
+            elif event.get("type") == "error":
+                result.error = str(event.get("code"))
+        return stopped
+
+
+def build_stubs(
+    names: List[str],
+    *,
+    stt_ms: int = 300,
+    stt_text: str = "打开客厅的灯",
+    agent_ms: int = 400,
+    tts_ms: int = 150,
+    tts_ms_per_char: int = 200,
+) -> Dict[str, Any]:
+    """``run_ws_server`` keyword arguments replacing the named backends with stubs."""
+    unknown = set(names) - set(STUBS)
+    if unknown:
+        raise SystemExit(f"unknown stub(s): {', '.join(sorted(unknown))}; expected some of {', '.join(STUBS)}")
+    out: Dict[str, Any] = {}
+    if "stt" in names:
+        out["stt"] = StubStt(text=stt_text, latency_ms=stt_ms)
+    if "tts" in names:
+        out["tts"] = StubTts(latency_ms=tts_ms, ms_per_char=tts_ms_per_char)
+    if "agent" in names:
+        out["agent"] = StubAgent(latency_ms=agent_ms)
+        out["devices"] = StubDevices()
+    if "vad" in names:
+        out["vad_factory"] = EnergyVad
+    return out
+
+
+async def run_load_test(
+    cfg: AppConfig,
+    logger: Logger,
+    *,
+    satellites: int,
+    turns: int,
+    fixtures: List[bytes],
+    backends: Optional[Dict[str, Any]] = None,
+    url: str = "",
+    device_ids: Optional[List[str]] = None,
+    framing: str = FRAMING_BINARY,
+    ramp_s: float = 1.0,
+    think_ms: int = 500,
+    jitter_ms: int = 100,
+    playback_buffer_bytes: int = 16384,
+    turn_timeout_s: float = 30.0,
+) -> Dict[str, Any]:
+    """Run ``satellites`` x ``turns`` conversations and return the report.
+
+    Without ``url`` a server is started in this process on a free port, with
+    a temporary satellite registry and ``backends`` (see ``build_stubs``)
+    injected; its per-stage histograms are included in the report. With
+    ``url`` the satellites connect as ``device_ids`` (cycled) instead.
+    """
+    metrics: Optional[PipelineMetrics] = None
+    server: Optional[asyncio.Task] = None
+    tmp: Optional[tempfile.TemporaryDirectory] = None
+    if not url:
+        tmp = tempfile.TemporaryDirectory(prefix="voice-loadtest-")
+        device_ids = [f"loadtest-{i + 1:02d}" for i in range(satellites)]
+        registry_path = os.path.join(tmp.name, "devices.config.json")
+        with open(registry_path, "w", encoding="utf-8") as f:
+            json.dump({"voice_control": {"mics": [{"id": d, "placement": {"room": f"room-{d[-2:]}"}} for d in device_ids]}}, f)
+        server_cfg = dataclasses.replace(
+            cfg,
+            device_config_path=registry_path,
+            satellite_server=dataclasses.replace(cfg.satellite_server, host="127.0.0.1", port=0, metrics_port=0),
+        )
+        if backends and "tts" in backends:
+            # A fixed stub reply would be a cache hit from the second turn on.
+            server_cfg = dataclasses.replace(server_cfg, tts=dataclasses.replace(cfg.tts, cache_max_mb=0))
+        metrics = PipelineMetrics()
+        ready: asyncio.Future = asyncio.get_running_loop().create_future()
+        server = asyncio.create_task(run_ws_server(server_cfg, logger, metrics=metrics, on_ready=ready.set_result, **(backends or {})))
+        await asyncio.wait({ready, server}, return_when=asyncio.FIRST_COMPLETED)
+        if not ready.done():
+            server.result()
+            raise RuntimeError("ws_server stopped before listening")
+        url = f"ws://127.0.0.1:{ready.result()}{cfg.satellite_server.path or '/ws'}"
+    if not device_ids:
+        raise SystemExit("--device-id is required with --url")
+
+    cpu_started, wall_started = time.process_time(), time.monotonic()
+    children_started = resource.getrusage(resource.RUSAGE_CHILDREN)
+    try:
+        sims = [
+            SimulatedSatellite(
+                url,
+                device_ids[i % len(device_ids)],
+                fixtures[i % len(fixtures)],
+                auth_token=cfg.satellite_server.auth_token,
+                framing=framing,
+                jitter_ms=jitter_ms,
+                playback_buffer_bytes=playback_buffer_bytes,
+                turn_timeout_s=turn_timeout_s,
+            )
+            for i in range(satellites)
+        ]
+        # Spread connections over ramp_s so the satellites do not speak in lockstep.
+        per_sim = await asyncio.gather(
+            *(sim.run(turns=turns, think_ms=think_ms, start_delay_s=ramp_s * i / max(1, satellites)) for i, sim in enumerate(sims))
+        )
+        wall = time.monotonic() - wall_started
+        cpu = time.process_time() - cpu_started
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    finally:
+        if server is not None:
+            server.cancel()
+            try:
+                await server
+            except asyncio.CancelledError:
+                pass
+        if tmp is not None:
+            tmp.cleanup()
+
+    results = [r for sim_results in per_sim for r in sim_results]
+    client = {stage: LatencyHistogram() for stage in CLIENT_STAGES}
+    errors: Dict[str, int] = {}
+    for r in results:
+        for stage, ms in r.latencies_ms.items():
+            client[stage].record(ms)
+        if not r.ok:
+            errors[r.error or "unknown"] = errors.get(r.error or "unknown", 0) + 1
+    ok = sum(1 for r in results if r.ok)
+    return {
+        "satellites": satellites,
+        "turns": len(results),
+        "turns_ok": ok,
+        "turns_failed": len(results) - ok,
+        "errors": errors,
+        "wall_s": round(wall, 2),
+        "turns_per_min": round(ok / wall * 60, 1) if wall > 0 else 0.0,
+        "client_ms": {stage: _summary(h) for stage, h in client.items()},
+        "server_ms": {stage: _summary(metrics.merged(stage)) for stage in STAGES} if metrics is not None else {},
+        "tts_chunks": {
+            "received": sum(r.chunks for r in results),
+            "dropped": sum(r.dropped for r in results),
+            "late": sum(r.late for r in results),
+        },
+        "process": {
+            "cpu_s": round(cpu, 2),
+            "cpu_percent": round(cpu / wall * 100, 1) if wall > 0 else 0.0,
+            # Worker processes (piper, STT pools) count only once they have exited.
+            "children_cpu_s": round(
+                (children.ru_utime + children.ru_stime) - (children_started.ru_utime + children_started.ru_stime), 2
+            ),
+            "rss_mb": _rss_mb(),
+            "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0, 1),
+        },
+    }
+
+
+def _summary(histogram: LatencyHistogram) -> Dict[str, Any]:
+    out: Dict[str, Any] = {"count": histogram.count}
+    for q in EXPORT_QUANTILES:
+        out[f"p{int(q * 100)}"] = round(histogram.quantile(q), 1)
+    out["max"] = round(histogram.max, 1)
+    return out
+
+
+def _rss_mb() -> Optional[float]:
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return round(pages * os.sysconf("SC_PAGE_SIZE") / (1024.0 * 1024.0), 1)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="voice-satellite-loadtest", description="Simulate N satellites against ws_server")
+    parser.add_argument("--config", required=True, help="Path to a ws_server config.yaml")
+    parser.add_argument("--satellites", type=int, default=4)
+    parser.add_argument("--turns", type=int, default=3, help="Conversations per satellite")
+    parser.add_argument("--wav", action="append", default=[], help="16 kHz mono 16-bit utterance fixture (repeatable); default: synthetic noise burst")
+    parser.add_argument("--stub", default="all", help="Backends to stub: all | none | comma list of stt,tts,agent,vad")
+    parser.add_argument("--stt-ms", type=int, default=300)
+    parser.add_argument("--stt-text", default="打开客厅的灯")
+    parser.add_argument("--agent-ms", type=int, default=400)
+    parser.add_argument("--tts-ms", type=int, default=150, help="Stub TTS time to first audio")
+    parser.add_argument("--tts-ms-per-char", type=int, default=200, help="Stub TTS audio length per reply character")
+    parser.add_argument("--url", default="", help="Target a running ws_server instead of starting one")
+    parser.add_argument("--device-id", action="append", default=[], help="Registered satellite id to use with --url (repeatable)")
+    parser.add_argument("--framing", choices=(FRAMING_BINARY, FRAMING_JSON), default=FRAMING_BINARY)
+    parser.add_argument("--ramp-s", type=float, default=1.0, help="Spread satellite start times over this many seconds")
+    parser.add_argument("--think-ms", type=int, default=500, help="Pause between turns of one satellite")
+    parser.add_argument("--jitter-ms", type=int, default=100, help="Device playback buffer; chunks arriving later are counted late")
+    parser.add_argument(
+        "--playback-buffer-bytes", type=int, default=16384, help="Advertised device buffer for tts_ack credits; 0 = old firmware (clock pacing)"
+    )
+    parser.add_argument("--turn-timeout-s", type=float, default=30.0)
+    parser.add_argument("--max-first-tts-p95-ms", type=float, default=0.0, help="Fail when client audio_end_to_first_tts p95 exceeds this")
+    parser.add_argument("--log-level", default="warn")
+    parser.add_argument("--out", default="", help="Also write the JSON report here")
+    args = parser.parse_args(argv)
+
+    cfg = load_config(args.config)
+    logger = Logger(args.log_level)
+    stub = [s.strip() for s in args.stub.split(",") if s.strip()]
+    stub = list(STUBS) if stub == ["all"] else [] if stub == ["none"] else stub
+    backends = {} if args.url else build_stubs(
+        stub,
+        stt_ms=args.stt_ms,
+        stt_text=args.stt_text,
+        agent_ms=args.agent_ms,
+        tts_ms=args.tts_ms,
+        tts_ms_per_char=args.tts_ms_per_char,
+    )
+    fixtures = [load_fixture(path) for path in args.wav] or [synthetic_fixture()]
+    report = asyncio.run(
+        run_load_test(
+            cfg,
+            logger,
+            satellites=max(1, args.satellites),
+            turns=max(1, args.turns),
+            fixtures=fixtures,
+            backends=backends,
+            url=args.url,
+            device_ids=args.device_id,
+            framing=args.framing,
+            ramp_s=args.ramp_s,
+            think_ms=args.think_ms,
+            jitter_ms=args.jitter_ms,
+            playback_buffer_bytes=args.playback_buffer_bytes,
+            turn_timeout_s=args.turn_timeout_s,
+        )
+    )
+    p95 = report["client_ms"]["audio_end_to_first_tts"]["p95"]
+    report["passed"] = (
+        not report["turns_failed"]
+        and not report["tts_chunks"]["dropped"]
+        and not (args.max_first_tts_p95_ms and p95 > args.max_first_tts_p95_ms)
+    )
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    return 0 if report["passed"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
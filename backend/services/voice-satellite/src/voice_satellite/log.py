@@ -1,21 +1,26 @@
 from __future__ import annotations
 
+import atexit
 import json
 import sys
+import threading
 import time
-from dataclasses import dataclass
-from typing import Any, Dict
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Tuple
+
+LEVELS = {"error": 0, "warn": 1, "info": 2, "debug": 3}
 
 
 @dataclass
 class Logger:
     level: str = "info"
 
+    def __post_init__(self) -> None:
+        self._threshold = LEVELS.get(self.level, LEVELS["info"])
+
     def _enabled(self, lvl: str) -> bool:
-        order = ["error", "warn", "info", "debug"]
-        lvl = lvl if lvl in order else "info"
-        cur = self.level if self.level in order else "info"
-        return order.index(lvl) <= order.index(cur)
+        return LEVELS.get(lvl, LEVELS["info"]) <= self._threshold
 
     def _log(self, lvl: str, payload: Dict[str, Any]) -> None:
         if not self._enabled(lvl):
@@ -37,3 +42,88 @@ class Logger:
     def error(self, payload: Dict[str, Any]) -> None:
         self._log("error", payload)
 
+    def close(self) -> None:
+        pass
+
+
+@dataclass
+class AsyncLogger(Logger):
+    """``Logger`` that hands records to a writer thread instead of writing inline.
+
+    The caller only checks the level and appends ``(level, ts, payload)`` to a
+    queue; JSON encoding, writing and flushing happen on the writer thread once
+    per ``flush_interval_ms`` (warn/error wake it early). Payloads are encoded
+    later, so they must not be mutated after logging. When the queue passes
+    half of ``max_queue`` debug records are dropped, at ``max_queue`` info
+    records too; warn/error are always kept. Drops are counted and reported by
+    a ``log.dropped`` line.
+    """
+
+    flush_interval_ms: int = 200
+    max_queue: int = 10000
+    dropped: int = field(default=0, init=False)
+    _queue: Deque[Tuple[str, int, Dict[str, Any]]] = field(default_factory=deque, init=False, repr=False)
+    _wake: threading.Event = field(default_factory=threading.Event, init=False, repr=False)
+    _stop: threading.Event = field(default_factory=threading.Event, init=False, repr=False)
+    _thread: Any = field(default=None, init=False, repr=False)
+    _reported_dropped: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        super().__post_init__()
+        self.max_queue = max(2, int(self.max_queue))
+        self._soft_limit = self.max_queue // 2
+        self._thread = threading.Thread(target=self._writer, name="log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _log(self, lvl: str, payload: Dict[str, Any]) -> None:
+        rank = LEVELS.get(lvl, LEVELS["info"])
+        if rank > self._threshold:
+            return
+        depth = len(self._queue)
+        if depth >= self._soft_limit and (rank == LEVELS["debug"] or (depth >= self.max_queue and rank == LEVELS["info"])):
+            self.dropped += 1
+            return
+        self._queue.append((lvl, int(time.time() * 1000), payload))
+        if rank <= LEVELS["warn"]:
+            self._wake.set()
+
+    def close(self) -> None:
+        thread = self._thread
+        if thread is None:
+            return
+        self._thread = None
+        self._stop.set()
+        self._wake.set()
+        thread.join(timeout=5)
+        atexit.unregister(self.close)
+
+    def _writer(self) -> None:
+        interval = max(1, int(self.flush_interval_ms)) / 1000.0
+        while True:
+            self._wake.wait(interval)
+            self._wake.clear()
+            stopping = self._stop.is_set()
+            self._drain()
+            if stopping:
+                return
+
+    def _drain(self) -> None:
+        out: List[str] = []
+        err: List[str] = []
+        queue = self._queue
+        while queue:
+            lvl, ts, payload = queue.popleft()
+            try:
+                line = json.dumps({"level": lvl, "ts": ts, **payload}, ensure_ascii=False, default=str)
+            except Exception as exc:
+                line = json.dumps({"level": lvl, "ts": ts, "msg": payload.get("msg"), "log_error": str(exc)}, ensure_ascii=False, default=str)
+            (err if lvl in ("error", "warn") else out).append(line)
+        dropped = self.dropped
+        if dropped != self._reported_dropped:
+            err.append(json.dumps({"level": "warn", "ts": int(time.time() * 1000), "msg": "log.dropped", "dropped_total": dropped}))
+            self._reported_dropped = dropped
+        for stream, lines in ((sys.stdout, out), (sys.stderr, err)):
+            if lines:
+                stream.write("\n".join(lines) + "\n")
+                stream.flush()
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+import math
+from typing import Dict, List, Optional, Tuple
+
+from .log import Logger
+
+# Pipeline stages recorded by RemoteSatelliteSession, in pipeline order.
+STAGES = (
+    "wake_to_listening",
+    "speech_to_stop_capture",
+    "stop_to_audio_end",
+    "stt",
+    "agent",
+    "audio_end_to_first_tts",
+    "tts_first_chunk",
+    "tts_last_chunk",
+)
+# Prometheus ``le`` bounds (ms) exposed for every histogram.
+EXPORT_BOUNDS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+EXPORT_QUANTILES = (0.5, 0.95, 0.99)
+SUB_BUCKET_BITS = 4
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+MAX_EXPONENT = 24  # 2^24 ms is about 4.6 hours; longer values land in the last bucket
+
+
+class LatencyHistogram:
+    """HDR-style latency histogram in milliseconds.
+
+    Each power-of-two range is split into ``SUB_BUCKETS`` linear buckets, so
+    a recorded value (and any quantile read back) is within ~6% of the real
+    one at every scale. Memory is fixed regardless of how many values are
+    recorded.
+    """
+
+    def __init__(self) -> None:
+        # Bucket 0..SUB_BUCKETS-1 cover [0, SUB_BUCKETS) ms one ms at a time.
+        self._counts = [0] * (SUB_BUCKETS * (MAX_EXPONENT + 1))
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def record(self, value_ms: float) -> None:
+        value = max(0.0, float(value_ms))
+        self._counts[self._index(value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for index, n in enumerate(other._counts):
+            if n:
+                self._counts[index] += n
+        self.count += other.count
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the ``q`` quantile (0 when empty)."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(min(1.0, max(0.0, q)) * self.count))
+        seen = 0
+        for index, n in enumerate(self._counts):
+            seen += n
+            if seen >= rank:
+                return min(self._upper(index), self.max)
+        return self.max
+
+    def cumulative(self, bounds: Tuple[float, ...]) -> List[int]:
+        """Counts of values whose bucket lies entirely at or below each bound."""
+        out: List[int] = []
+        seen = 0
+        index = 0
+        for bound in bounds:
+            while index < len(self._counts) and self._upper(index) <= bound:
+                seen += self._counts[index]
+                index += 1
+            out.append(seen)
+        return out
+
+    @staticmethod
+    def _index(value: float) -> int:
+        if value < SUB_BUCKETS:
+            return int(value)
+        # frexp gives value = m * 2**e with m in [0.5, 1): floor(log2(value)) == e - 1, exactly.
+        exponent = min(MAX_EXPONENT, math.frexp(value)[1] - SUB_BUCKET_BITS)
+        step = 2.0 ** (exponent - 1)
+        sub = min(SUB_BUCKETS - 1, int((value - SUB_BUCKETS * step) / step))
+        return exponent * SUB_BUCKETS + sub
+
+    @staticmethod
+    def _upper(index: int) -> float:
+        exponent, sub = divmod(index, SUB_BUCKETS)
+        if exponent == 0:
+            return float(sub + 1)
+        step = 2.0 ** (exponent - 1)
+        return SUB_BUCKETS * step + (sub + 1) * step
+
+
+class PipelineMetrics:
+    """Per-stage latency histograms labelled by device and room."""
+
+    def __init__(self, *, prefix: str = "voice_satellite") -> None:
+        self.prefix = prefix
+        self._histograms: Dict[Tuple[str, str, str], LatencyHistogram] = {}
+
+    def observe(self, stage: str, value_ms: float, *, device: str, room: str = "") -> None:
+        key = (stage, device, room or "")
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = LatencyHistogram()
+        histogram.record(value_ms)
+
+    def histogram(self, stage: str, *, device: str, room: str = "") -> Optional[LatencyHistogram]:
+        return self._histograms.get((stage, device, room or ""))
+
+    def merged(self, stage: str) -> LatencyHistogram:
+        """One histogram for ``stage`` across every device and room."""
+        out = LatencyHistogram()
+        for (key_stage, _device, _room), histogram in self._histograms.items():
+            if key_stage == stage:
+                out.merge(histogram)
+        return out
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        name = f"{self.prefix}_stage_latency_ms"
+        qname = f"{self.prefix}_stage_latency_quantile_ms"
+        order = {stage: i for i, stage in enumerate(STAGES)}
+        keys = sorted(self._histograms, key=lambda k: (order.get(k[0], len(order)), k[0], k[1], k[2]))
+        lines = [
+            f"# HELP {name} Latency of one satellite pipeline stage in milliseconds.",
+            f"# TYPE {name} histogram",
+        ]
+        for key in keys:
+            histogram = self._histograms[key]
+            labels = _labels(key)
+            for bound, n in zip(EXPORT_BOUNDS_MS, histogram.cumulative(EXPORT_BOUNDS_MS)):
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {n}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f"{name}_sum{{{labels}}} {histogram.sum:.3f}")
+            lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+        lines.append(f"# HELP {qname} Latency quantiles per stage from the in-process HDR histogram.")
+        lines.append(f"# TYPE {qname} gauge")
+        for key in keys:
+            histogram = self._histograms[key]
+            labels = _labels(key)
+            for q in EXPORT_QUANTILES:
+                lines.append(f'{qname}{{{labels},quantile="{q}"}} {histogram.quantile(q):.3f}')
+        return "\n".join(lines) + "\n"
+
+
+def _labels(key: Tuple[str, str, str]) -> str:
+    stage, device, room = key
+    return f'stage="{_escape(stage)}",device="{_escape(device)}",room="{_escape(room)}"'
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+async def start_metrics_server(metrics: PipelineMetrics, *, host: str, port: int, logger: Logger | None = None) -> asyncio.AbstractServer:
+    """Serve ``GET /metrics`` (plain HTTP/1.0, one response per connection)."""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+            while (await asyncio.wait_for(reader.readline(), timeout=5)) not in (b"\r\n", b"\n", b""):
+                pass
+            parts = request_line.decode("latin-1").split()
+            if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+                status, body, ctype = "200 OK", metrics.render().encode(), "text/plain; version=0.0.4; charset=utf-8"
+            else:
+                status, body, ctype = "404 Not Found", b"not found\n", "text/plain; charset=utf-8"
+            writer.write(
+                f"HTTP/1.0 {status}\r\nContent-Type: {ctype}\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    logger and logger.info({"msg": "metrics.ready", "host": host, "port": port, "path": "/metrics"})
+    return server
@@ -8,33 +8,108 @@ import threading
 import time
 import uuid
 import wave
-from typing import Any, Callable, Optional
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, Optional, TypeVar
 
 import numpy as np
 
-from .agent_client import AgentClient
+from .agent_client import AgentClient, AsyncAgentClient
 from .audio_types import SynthesizedAudio
+from .capture_buffer import CaptureBuffer
 from .common import (
     PROCESS_BLOCK_SIZE,
     PROCESS_SAMPLE_RATE,
+    StreamingResampler,
     audio_stats,
-    build_resampler,
     clean_user_text,
     match_short_phrase,
     normalize_for_match,
     prepare_stt_audio,
-    resample_block,
-    split_pcm16le_blocks,
+    resample,
 )
 from .config import AppConfig
 from .devices import DeviceCatalog
+from .endpointing import Endpointer
+from .fast_path import FastPath
+from .flow_control import DownlinkCredit
 from .log import Logger
+from .metrics import PipelineMetrics, start_metrics_server
 from .satellite_registry import SatelliteRegistry
-from .speech import compose_speech
+from .speech import SentenceStream, clean_text, compose_action_speech, compose_speech, split_sentences
+from .stt_incremental import IncrementalTranscriber
+from .stt_pool import SttWorkerPool
+from .stt_scheduler import SttScheduler
+from .tts_cache import TtsCache
+from .vad_shared import SharedVadEngine
+from .ws_framing import (
+    FRAME_AUDIO,
+    FRAMING_BINARY,
+    FRAMING_JSON,
+    decode_frame,
+    encode_event,
+    negotiate_framing,
+    session_tag,
+)
 
 TTS_CHUNK_BYTES = 4096
-TTS_CHUNK_PACING_SEC = TTS_CHUNK_BYTES / float(PROCESS_SAMPLE_RATE * 2)
+# Device messages that cut off a reply that is playing (barge-in).
+BARGE_IN_TYPES = ("barge_in", "wake", "audio_start")
+# Per-connection queues: messages waiting for the turn processor (about 8 s of
+# 32 ms audio frames) and encoded frames waiting for the socket writer.
+INBOX_MAX_MESSAGES = 256
+OUTBOX_MAX_FRAMES = 64
 WAIT_AUDIO_END_TIMEOUT_MS = 2000
+EXIT_REPLY = "好的，再见。"
+TURN_FAILED_REPLY = "抱歉，我刚才没有处理成功。"
+DEBUG_TTS_TEXT = "这是网络语音播报测试。"
+# Fixed replies pre-synthesized into the TTS cache at startup.
+PREWARM_PHRASES = (EXIT_REPLY, TURN_FAILED_REPLY, DEBUG_TTS_TEXT)
+
+T = TypeVar("T")
+# Placeholder the connection reader queues for a text frame that is not JSON.
+_INVALID_JSON = object()
+
+
+async def _iterate_in_thread(make_iter: Callable[[], Iterator[T]]) -> AsyncIterator[T]:
+    """Drive a blocking iterator on a worker thread, yielding items as they arrive."""
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[tuple[bool, Any]] = asyncio.Queue()
+    stop = threading.Event()
+
+    def put(done: bool, item: Any) -> None:
+        with contextlib.suppress(RuntimeError):  # loop already closed
+            loop.call_soon_threadsafe(queue.put_nowait, (done, item))
+
+    def run() -> None:
+        it = make_iter()
+        try:
+            for item in it:
+                if stop.is_set():
+                    break
+                put(False, item)
+            put(True, None)
+        except BaseException as exc:
+            put(True, exc)
+        finally:
+            close = getattr(it, "close", None)
+            if close is not None:
+                close()
+
+    loop.run_in_executor(None, run)
+    try:
+        while True:
+            done, item = await queue.get()
+            if done:
+                if item is not None:
+                    raise item
+                return
+            yield item
+    finally:
+        stop.set()
+
+
+async def _iterate_list(items: Iterable[T]) -> AsyncIterator[T]:
+    for item in items:
+        yield item
 
 
 class RemoteSatelliteSession:
@@ -46,11 +121,14 @@ class RemoteSatelliteSession:
         cfg: AppConfig,
         logger: Logger,
         devices: DeviceCatalog,
-        agent: AgentClient,
+        agent: AgentClient | AsyncAgentClient,
         stt: Any,
         tts: Any,
-        stt_lock: Optional[threading.Lock] = None,
+        stt_scheduler: Optional[Any] = None,
+        tts_cache: Optional[TtsCache] = None,
         vad_factory: Optional[Callable[[], Any]] = None,
+        metrics: Optional[PipelineMetrics] = None,
+        fast_path: Optional[FastPath] = None,
     ):
         self.device_id = device_id
         self.placement = dict(placement or {})
@@ -60,21 +138,44 @@ class RemoteSatelliteSession:
         self.agent = agent
         self.stt = stt
         self.tts = tts
-        self._stt_lock = stt_lock
+        self._stt_scheduler = stt_scheduler
+        self._tts_cache = tts_cache
+        self._cache_writes: set[asyncio.Task] = set()
+        self._metrics = metrics
+        self._fast_path = fast_path
         if vad_factory:
             self._vad = vad_factory()
         else:
-            from .vad_silero import SileroVad
+            from .vad_silero import create_vad
 
-            self._vad = SileroVad(threshold=cfg.vad.threshold, sample_rate=PROCESS_SAMPLE_RATE)
+            self._vad = create_vad(cfg.vad, sample_rate=PROCESS_SAMPLE_RATE)
 
         self.pre_roll_chunks = max(0, int(cfg.vad.pre_roll_ms / 1000 * PROCESS_SAMPLE_RATE / PROCESS_BLOCK_SIZE))
         self.end_silence_chunks = max(1, int(cfg.vad.end_silence_ms / 1000 * PROCESS_SAMPLE_RATE / PROCESS_BLOCK_SIZE))
         self.max_utt_chunks = max(1, int(cfg.vad.max_utterance_ms / 1000 * PROCESS_SAMPLE_RATE / PROCESS_BLOCK_SIZE))
         self.min_utt_chunks = max(1, int(cfg.vad.min_utterance_ms / 1000 * PROCESS_SAMPLE_RATE / PROCESS_BLOCK_SIZE))
+        self._incremental: Optional[IncrementalTranscriber] = None
+        if cfg.stt.partial_interval_ms > 0:
+            self._incremental = IncrementalTranscriber(
+                transcribe=self._transcribe,
+                prepare=lambda pcm: prepare_stt_audio(self._trim_capture_pcm(pcm))[0],
+                interval_ms=cfg.stt.partial_interval_ms,
+                commit_silence_blocks=int(cfg.stt.partial_commit_silence_ms / 1000 * PROCESS_SAMPLE_RATE / PROCESS_BLOCK_SIZE),
+                logger=logger,
+            )
         self.confirm_set = {normalize_for_match(s) for s in cfg.agent.confirm_phrases}
         self.cancel_set = {normalize_for_match(s) for s in cfg.agent.cancel_phrases}
         self.exit_set = {normalize_for_match(s) for s in cfg.agent.exit_phrases}
+        self.last_reply_type = ""
+        self.endpointer: Optional[Endpointer] = None
+        if cfg.vad.adaptive_endpoint:
+            self.endpointer = Endpointer(
+                base_ms=cfg.vad.end_silence_ms,
+                complete_ms=cfg.vad.end_silence_complete_ms,
+                short_reply_ms=cfg.vad.end_silence_short_reply_ms,
+                max_ms=cfg.vad.end_silence_max_ms,
+                short_phrases=[*cfg.agent.confirm_phrases, *cfg.agent.cancel_phrases, *cfg.agent.exit_phrases],
+            )
 
         self.state = "IDLE"
         self.session_id: Optional[str] = None
@@ -83,16 +184,19 @@ class RemoteSatelliteSession:
         self.last_turn_at = 0.0
         self.prebuffer: list[np.ndarray] = []
         self.utterance: list[np.ndarray] = []
-        self.capture_blocks: list[np.ndarray] = []
+        # Sized for the longest utterance plus the audio still in flight after stop_capture.
+        self.capture = CaptureBuffer(int((cfg.vad.max_utterance_ms + WAIT_AUDIO_END_TIMEOUT_MS) / 1000 * PROCESS_SAMPLE_RATE))
         self.speech_started = False
         self.silence_chunks = 0
+        self.last_speech_block = -1
         self.capture_max_vad_probability = 0.0
         self.capture_started_at = 0.0
         self.speech_started_at = 0.0
         self.stop_requested = False
         self.stop_requested_at = 0.0
         self.stop_reason = ""
-        self.pending_pcm = bytearray()
+        self.audio_end_at = 0.0
+        self.last_partial_text = ""
 
     async def start_session(self) -> list[dict[str, Any]]:
         now = time.monotonic()
@@ -119,6 +223,7 @@ class RemoteSatelliteSession:
                 "devices_refresh_started": refresh_started,
             }
         )
+        self._observe("wake_to_listening", now)
         return [
             {
                 "type": "listening",
@@ -164,15 +269,18 @@ class RemoteSatelliteSession:
         if self.state != "LISTEN":
             return []
         self.capture_started_at = time.monotonic()
-        self.pending_pcm.clear()
-        self.capture_blocks = []
+        self.capture.clear()
         self.capture_max_vad_probability = 0.0
         self.speech_started = False
         self.silence_chunks = 0
+        self.last_speech_block = -1
         self.speech_started_at = 0.0
         self.stop_requested = False
         self.stop_requested_at = 0.0
         self.stop_reason = ""
+        self._reset_partial()
+        if self.endpointer is not None:
+            self.endpointer.reset()
         return []
 
     async def ingest_audio_chunk(self, pcm_bytes: bytes) -> list[dict[str, Any]]:
@@ -182,35 +290,41 @@ class RemoteSatelliteSession:
         if self.state not in ("LISTEN", "WAIT_AUDIO_END") or not self.session_id:
             return [{"type": "error", "code": "session_not_started", "message": "wake the device before sending audio"}]
 
-        self.pending_pcm.extend(pcm_bytes)
-        for block in split_pcm16le_blocks(self.pending_pcm, block_samples=PROCESS_BLOCK_SIZE):
-            self.capture_blocks.append(block.copy())
+        for index in self.capture.write(pcm_bytes):
             if not self.stop_requested:
-                block_events = await self._process_block(block)
+                block_events = await self._process_block(self.capture.block(index))
                 if block_events:
-                    return block_events
-        return []
+                    return [*self._partial_events(), *block_events]
+        return self._partial_events()
 
     async def finalize_audio(self) -> list[dict[str, Any]]:
+        return [event async for event in self.finalize_audio_stream()]
+
+    async def finalize_audio_stream(self) -> AsyncIterator[dict[str, Any]]:
+        """Like ``finalize_audio`` but yields events (incl. tts audio) as soon as they exist."""
         timeout_events = await self.tick()
         if timeout_events:
-            return timeout_events
+            for event in timeout_events:
+                yield event
+            return
         if self.state not in ("LISTEN", "WAIT_AUDIO_END"):
-            return []
-        if not self.capture_blocks:
+            return
+        if not len(self.capture):
             self._reset_recording()
             self.state = "LISTEN"
-            return []
+            return
         if not self.speech_started:
             self.logger.warn(
                 {
                     "msg": "satellite.vad.no_speech_fallback",
                     "device_id": self.device_id,
                     "session_id": self.session_id,
-                    "chunks": len(self.capture_blocks),
+                    "chunks": len(self.capture),
                 }
             )
+        self.audio_end_at = time.monotonic()
         if self.stop_requested and self.stop_requested_at:
+            self._observe("stop_to_audio_end", self.stop_requested_at, self.audio_end_at)
             self.logger.info(
                 {
                     "msg": "satellite.audio_end.received",
@@ -220,21 +334,64 @@ class RemoteSatelliteSession:
                     "wait_audio_end_ms": int((time.monotonic() - self.stop_requested_at) * 1000),
                 }
             )
-        return await self._complete_capture()
+        async for event in self._complete_capture():
+            yield event
+
+    def abort_reply(self, *, reason: str) -> list[dict[str, Any]]:
+        """The handler cancelled the reply stream (barge-in); get ready for the next utterance."""
+        if self.state == "SPEAK":
+            self.state = "LISTEN"
+            self.last_turn_at = time.monotonic()
+            self._reset_recording()
+        self.logger.info({"msg": "satellite.tts.barge_in", "device_id": self.device_id, "session_id": self.session_id, "reason": reason})
+        return [{"type": "tts_abort", "deviceId": self.device_id, "sessionId": self.session_id, "reason": reason}]
+
+    def close(self) -> None:
+        """Release per-connection resources (shared VAD stream, pending decodes)."""
+        self._reset_partial()
+        close_vad = getattr(self._vad, "close", None)
+        if callable(close_vad):
+            close_vad()
+
+    async def _vad_probability(self, block: np.ndarray) -> float:
+        probability_async = getattr(self._vad, "probability_async", None)
+        if probability_async is not None:
+            return await probability_async(block)
+        return self._vad.probability(block)
 
     def _reset_recording(self) -> None:
         self.prebuffer = []
         self.utterance = []
-        self.capture_blocks = []
+        self.capture.clear()
         self.speech_started = False
         self.silence_chunks = 0
+        self.last_speech_block = -1
         self.capture_max_vad_probability = 0.0
         self.capture_started_at = 0.0
         self.speech_started_at = 0.0
         self.stop_requested = False
         self.stop_requested_at = 0.0
         self.stop_reason = ""
-        self.pending_pcm.clear()
+        self.audio_end_at = 0.0
+        self._reset_partial()
+        if self.endpointer is not None:
+            self.endpointer.reset()
+
+    def _reset_partial(self) -> None:
+        self.last_partial_text = ""
+        if self._incremental is not None:
+            self._incremental.reset()
+
+    def _partial_events(self) -> list[dict[str, Any]]:
+        if self._incremental is None:
+            return []
+        text = self._incremental.poll()
+        if text and self.endpointer is not None:
+            self.endpointer.on_partial(text, end_block=self._incremental.text_end_block)
+        if not text or text == self.last_partial_text or not self.cfg.stt.partial_events:
+            return []
+        self.last_partial_text = text
+        return [{"type": "partial_transcript", "deviceId": self.device_id, "sessionId": self.session_id, "text": text}]
 
     def _close_session(self, *, reason: str) -> list[dict[str, Any]]:
         session_id = self.session_id
@@ -244,6 +401,8 @@ class RemoteSatelliteSession:
         self.awaiting_first_utterance = False
         self.last_turn_at = 0.0
         self._reset_recording()
+        # A new session starts a new agent conversation.
+        self._expect_reply_to("")
         return [{"type": "session_closed", "deviceId": self.device_id, "sessionId": session_id, "reason": reason}]
 
     async def _process_block(self, block: np.ndarray) -> list[dict[str, Any]]:
@@ -251,14 +410,18 @@ class RemoteSatelliteSession:
         if self.awaiting_first_utterance and self.wake_started_at and (now - self.wake_started_at) * 1000 > self.cfg.wake.timeout_ms:
             return self._close_session(reason="wake_timeout")
 
-        prob = float(self._vad.probability(block))
+        prob = float(await self._vad_probability(block))
         if prob > self.capture_max_vad_probability:
             self.capture_max_vad_probability = prob
         is_speech = prob >= self.cfg.vad.threshold
+        if is_speech:
+            self.last_speech_block = len(self.capture) - 1
 
         if not self.speech_started:
             if is_speech:
                 self.speech_started = True
+                # Block indices must stay put from here on (VAD end, incremental STT).
+                self.capture.pin()
                 if self.awaiting_first_utterance:
                     self.awaiting_first_utterance = False
                 self.last_turn_at = now
@@ -275,15 +438,24 @@ class RemoteSatelliteSession:
             return []
 
         if is_speech:
+            if self.silence_chunks and self.endpointer is not None:
+                self.endpointer.on_resume(self.silence_chunks)
             self.last_turn_at = now
             self.silence_chunks = 0
         else:
             self.silence_chunks += 1
 
-        if len(self.capture_blocks) >= self.max_utt_chunks:
+        if len(self.capture) >= self.max_utt_chunks:
             return self._request_stop_capture(reason="max_utterance_reached")
-        if self.silence_chunks >= self.end_silence_chunks:
+        end_silence_chunks = self.end_silence_chunks
+        if self.endpointer is not None:
+            end_silence_chunks = self.endpointer.limit_blocks(last_speech_block=self.last_speech_block)
+        if self.silence_chunks >= end_silence_chunks:
             return self._request_stop_capture(reason="vad_end")
+        if self._incremental is not None:
+            # A pause just began: decode now, so the endpointer sees text that covers all speech.
+            force = self.endpointer is not None and self.silence_chunks == 1
+            self._incremental.maybe_start(self.capture, now=now, silence_blocks=self.silence_chunks, force=force)
         return []
 
     def _request_stop_capture(self, *, reason: str) -> list[dict[str, Any]]:
@@ -294,6 +466,14 @@ class RemoteSatelliteSession:
         self.stop_requested_at = now
         self.stop_reason = reason
         self.state = "WAIT_AUDIO_END"
+        if self.speech_started_at:
+            self._observe("speech_to_stop_capture", self.speech_started_at, now)
+        if self._incremental is not None:
+            self._incremental.start_final(self.capture)
+        endpoint: dict[str, Any] = {}
+        if self.endpointer is not None:
+            endpoint = self.endpointer.decision()
+            self.endpointer.finish()
         self.logger.info(
             {
                 "msg": "satellite.stop_capture.requested",
@@ -301,7 +481,8 @@ class RemoteSatelliteSession:
                 "session_id": self.session_id,
                 "reason": reason,
                 "speech_to_stop_capture_ms": int((now - self.speech_started_at) * 1000) if self.speech_started_at else 0,
-                "captured_chunks": len(self.capture_blocks),
+                "captured_chunks": len(self.capture),
+                **endpoint,
             }
         )
         return [
@@ -313,8 +494,8 @@ class RemoteSatelliteSession:
             }
         ]
 
-    async def _complete_capture(self) -> list[dict[str, Any]]:
-        pcm = np.concatenate(self.capture_blocks).astype(np.float32) / 32768.0
+    async def _complete_capture(self) -> AsyncIterator[dict[str, Any]]:
+        pcm = self.capture.float32()
         trimmed = self._trim_capture_pcm(pcm)
         self.logger.debug(
             {
@@ -323,11 +504,13 @@ class RemoteSatelliteSession:
                 "session_id": self.session_id,
                 "full_samples": int(pcm.size),
                 "trimmed_samples": int(trimmed.size),
+                "dropped_samples": self.capture.dropped_samples,
             }
         )
-        return await self._complete_pcm(trimmed)
+        async for event in self._complete_pcm(trimmed):
+            yield event
 
-    async def _complete_pcm(self, pcm: np.ndarray) -> list[dict[str, Any]]:
+    async def _complete_pcm(self, pcm: np.ndarray) -> AsyncIterator[dict[str, Any]]:
         self.state = "SPEAK"
         self.awaiting_first_utterance = False
         try:
@@ -351,8 +534,9 @@ class RemoteSatelliteSession:
                 }
             )
             stt_started_at = time.monotonic()
-            text_raw, _meta = await asyncio.to_thread(self._transcribe_blocking, stt_pcm)
+            text_raw, meta = await self._transcribe_capture(stt_pcm)
             stt_ms = int((time.monotonic() - stt_started_at) * 1000)
+            self._observe("stt", stt_started_at)
             text_raw = clean_user_text(text_raw)
             self.logger.info(
                 {
@@ -360,6 +544,9 @@ class RemoteSatelliteSession:
                     "device_id": self.device_id,
                     "session_id": self.session_id,
                     "stt_ms": stt_ms,
+                    "stt_queue_wait_ms": meta.get("queue_wait_ms"),
+                    "stt_batch_size": meta.get("batch_size"),
+                    "stt_tail_samples": meta.get("tail_samples"),
                     "text": text_raw,
                 }
             )
@@ -378,53 +565,61 @@ class RemoteSatelliteSession:
                 self.state = "LISTEN"
                 self.last_turn_at = time.monotonic()
                 self._reset_recording()
-                return []
+                return
 
             match = normalize_for_match(text_raw)
             confirm = match in self.confirm_set
             cancel = match in self.cancel_set
             exit_requested = match_short_phrase(match, self.exit_set, max_extra_chars=4)
-            events = [
-                {
-                    "type": "transcript",
-                    "deviceId": self.device_id,
-                    "sessionId": self.session_id,
-                    "text": text_raw,
-                    "confirm": bool(confirm),
-                    "cancel": bool(cancel),
-                }
-            ]
+            yield {
+                "type": "transcript",
+                "deviceId": self.device_id,
+                "sessionId": self.session_id,
+                "text": text_raw,
+                "confirm": bool(confirm),
+                "cancel": bool(cancel),
+            }
 
             if exit_requested:
-                events.extend(await self._build_tts_events("好的，再见。", turn_type="exit"))
-                events.extend(self._close_session(reason="exit"))
-                return events
-
-            agent_started_at = time.monotonic()
-            out = await asyncio.to_thread(
-                self.agent.turn,
-                session_id=self.session_id or "",
-                text=text_raw,
-                confirm=confirm,
-                wake_source=self._agent_wake_source(),
-            )
-            agent_ms = int((time.monotonic() - agent_started_at) * 1000)
-            speech = compose_speech(out, self.devices.by_id)
-            self.logger.info(
-                {
-                    "msg": "satellite.agent.reply",
-                    "device_id": self.device_id,
-                    "session_id": self.session_id,
-                    "agent_ms": agent_ms,
-                    "type": out.get("type"),
-                    "speech": speech,
-                }
-            )
-            events.extend(await self._build_tts_events(speech, turn_type=str(out.get("type") or "answer")))
+                async for event in self._stream_tts_events(EXIT_REPLY, turn_type="exit"):
+                    yield event
+                for event in self._close_session(reason="exit"):
+                    yield event
+                return
+
+            fast = await self._fast_path_turn(text_raw) if not (confirm or cancel) else None
+            if fast is not None:
+                speech = compose_speech(fast, self.devices.by_id)
+                self._expect_reply_to(str(fast["type"]))
+                async for event in self._stream_tts_events(speech, turn_type=str(fast["type"])):
+                    yield event
+            elif self.cfg.agent.stream and hasattr(self.agent, "turn_stream"):
+                reply = {"text": "", "turnType": "answer"}
+                async for event in self._stream_tts_segments(self._agent_reply_segments(text_raw, confirm=confirm, reply=reply), reply):
+                    yield event
+            else:
+                agent_started_at = time.monotonic()
+                out = await self._agent_turn(text_raw, confirm=confirm)
+                agent_ms = int((time.monotonic() - agent_started_at) * 1000)
+                self._observe("agent", agent_started_at)
+                speech = compose_speech(out, self.devices.by_id)
+                self.logger.info(
+                    {
+                        "msg": "satellite.agent.reply",
+                        "device_id": self.device_id,
+                        "session_id": self.session_id,
+                        "agent_ms": agent_ms,
+                        "type": out.get("type"),
+                        "speech": speech,
+                    }
+                )
+                # Set before speaking, so a confirm that barges into the prompt is already expected.
+                self._expect_reply_to(str(out.get("type") or "answer"))
+                async for event in self._stream_tts_events(speech, turn_type=str(out.get("type") or "answer")):
+                    yield event
             self.state = "LISTEN"
             self.last_turn_at = time.monotonic()
             self._reset_recording()
-            return events
         except Exception as exc:
             self.logger.error(
                 {
@@ -434,17 +629,16 @@ class RemoteSatelliteSession:
                     "error": str(exc),
                 }
             )
-            error_events: list[dict[str, Any]] = [
-                {
-                    "type": "error",
-                    "deviceId": self.device_id,
-                    "sessionId": self.session_id,
-                    "code": "turn_failed",
-                    "message": str(exc),
-                }
-            ]
+            yield {
+                "type": "error",
+                "deviceId": self.device_id,
+                "sessionId": self.session_id,
+                "code": "turn_failed",
+                "message": str(exc),
+            }
             try:
-                error_events.extend(await self._build_tts_events("抱歉，我刚才没有处理成功。", turn_type="error"))
+                async for event in self._stream_tts_events(TURN_FAILED_REPLY, turn_type="error"):
+                    yield event
             except Exception as synth_exc:
                 self.logger.error(
                     {
@@ -457,7 +651,12 @@ class RemoteSatelliteSession:
             self.state = "LISTEN"
             self.last_turn_at = time.monotonic()
             self._reset_recording()
-            return error_events
+
+    def _expect_reply_to(self, turn_type: str) -> None:
+        self.last_reply_type = turn_type
+        if self.endpointer is not None:
+            # A propose is answered with a short confirm/cancel.
+            self.endpointer.expect_short_reply = turn_type == "propose"
 
     def _trim_capture_pcm(self, pcm: np.ndarray) -> np.ndarray:
         if pcm.size <= PROCESS_BLOCK_SIZE:
@@ -491,84 +690,284 @@ class RemoteSatelliteSession:
         trimmed = pcm[start:end]
         return trimmed if trimmed.size else pcm
 
-    def _transcribe_blocking(self, pcm: np.ndarray) -> tuple[str, dict[str, Any]]:
-        if self._stt_lock is None:
-            return self.stt.transcribe(pcm, sample_rate=PROCESS_SAMPLE_RATE)
-        with self._stt_lock:
-            return self.stt.transcribe(pcm, sample_rate=PROCESS_SAMPLE_RATE)
+    async def _transcribe_capture(self, pcm: np.ndarray) -> tuple[str, dict[str, Any]]:
+        if self._incremental is not None and self._incremental.has_progress() and len(self.capture):
+            try:
+                return await self._incremental.finish(
+                    self.capture,
+                    last_speech_block=self.last_speech_block,
+                    reuse_final=self.stop_reason == "vad_end",
+                )
+            except Exception as exc:
+                self.logger.warn({"msg": "satellite.stt.incremental_failed", "device_id": self.device_id, "error": str(exc)})
+        return await self._transcribe(pcm)
+
+    async def _transcribe(self, pcm: np.ndarray) -> tuple[str, dict[str, Any]]:
+        if self._stt_scheduler is not None:
+            return await asyncio.wrap_future(self._stt_scheduler.submit(pcm))
+        return await asyncio.to_thread(self.stt.transcribe, pcm, sample_rate=PROCESS_SAMPLE_RATE)
+
+    async def _stream_tts_events(self, text: str, *, turn_type: str) -> AsyncIterator[dict[str, Any]]:
+        """Yield one tts_start, ordered tts_chunk events and one tts_end for ``text``."""
+        segments = (split_sentences(text) if self.cfg.tts.split_sentences else []) or [text]
+        reply = {"text": text, "turnType": turn_type}
+        async for event in self._stream_tts_segments(_iterate_list(segments), reply):
+            yield event
+
+    async def _stream_tts_segments(self, segments: AsyncIterator[str], reply: dict[str, str]) -> AsyncIterator[dict[str, Any]]:
+        """Speak ``segments`` in order as one tts_start ... tts_end reply.
 
-    async def _build_tts_events(self, text: str, *, turn_type: str) -> list[dict[str, Any]]:
+        Sentence N+1 is synthesized while sentence N is being streamed, and
+        ``seq`` runs across all of them. ``segments`` may still be producing
+        text (a streamed agent reply); ``reply`` supplies the text and turn
+        type of the start/end events and is read when each is sent.
+        """
         started_at = time.monotonic()
-        audio = await asyncio.to_thread(self.tts.synthesize, text)
-        elapsed_ms = int((time.monotonic() - started_at) * 1000)
+        first_chunk_ms: Optional[int] = None
+        pending = bytearray()
+        seq = 0
+        tasks: list[asyncio.Task] = []
+        order: asyncio.Queue = asyncio.Queue()
+        # The sentence being streamed plus one prefetched sentence.
+        slots = asyncio.Semaphore(2)
+
+        async def produce(segment: str, queue: asyncio.Queue) -> bool:
+            await slots.acquire()
+            return await self._produce_segment_pcm(segment, queue)
+
+        async def feed() -> None:
+            # Keep reading ``segments`` while synthesis waits for a slot, so a
+            # streamed agent reply is never held up by TTS.
+            try:
+                async for segment in segments:
+                    queue: asyncio.Queue = asyncio.Queue()
+                    tasks.append(asyncio.create_task(produce(segment, queue)))
+                    order.put_nowait(queue)
+                order.put_nowait(None)
+            except Exception as exc:
+                order.put_nowait(exc)
+
+        feeder = asyncio.create_task(feed())
+        try:
+            while True:
+                queue = await order.get()
+                if queue is None:
+                    break
+                if isinstance(queue, BaseException):
+                    raise queue
+                while True:
+                    item = await queue.get()
+                    if item is None:
+                        break
+                    if isinstance(item, BaseException):
+                        raise item
+                    pending.extend(item)
+                    if first_chunk_ms is None:
+                        first_chunk_ms = int((time.monotonic() - started_at) * 1000)
+                        self._observe_first_tts(started_at)
+                        yield self._tts_start_event(text=reply["text"], turn_type=reply["turnType"])
+                    while len(pending) >= TTS_CHUNK_BYTES:
+                        yield self._tts_chunk_event(seq, bytes(pending[:TTS_CHUNK_BYTES]))
+                        del pending[:TTS_CHUNK_BYTES]
+                        seq += 1
+                slots.release()
+        except Exception:
+            if first_chunk_ms is not None:
+                yield {**self._tts_end_event(text=reply["text"], turn_type=reply["turnType"]), "aborted": True}
+            raise
+        finally:
+            feeder.cancel()
+            for task in tasks:
+                task.cancel()
+
+        if first_chunk_ms is None:
+            first_chunk_ms = int((time.monotonic() - started_at) * 1000)
+            self._observe_first_tts(started_at)
+            yield self._tts_start_event(text=reply["text"], turn_type=reply["turnType"])
+        if pending:
+            yield self._tts_chunk_event(seq, bytes(pending))
+        # Resumed only once the consumer has sent the last chunk.
+        self._observe("tts_last_chunk", started_at)
         self.logger.info(
             {
                 "msg": "satellite.tts.ready",
                 "device_id": self.device_id,
                 "session_id": self.session_id,
-                "turn_type": turn_type,
-                "tts_synth_ms": elapsed_ms,
-                "first_tts_chunk_ms": elapsed_ms,
+                "turn_type": reply["turnType"],
+                "tts_synth_ms": int((time.monotonic() - started_at) * 1000),
+                "first_tts_chunk_ms": first_chunk_ms,
+                "segments": len(tasks),
+                "cache_hits": sum(1 for task in tasks if task.done() and not task.cancelled() and task.result()),
+                **self._tts_cache_counters(),
             }
         )
-        return self._audio_to_events(audio, text=text, turn_type=turn_type)
+        yield self._tts_end_event(text=reply["text"], turn_type=reply["turnType"])
 
-    def _audio_to_events(self, audio: SynthesizedAudio, *, text: str, turn_type: str) -> list[dict[str, Any]]:
-        audio = self._normalize_tts_audio(audio)
-        events: list[dict[str, Any]] = [
-            {
-                "type": "tts_start",
-                "deviceId": self.device_id,
-                "sessionId": self.session_id,
-                "turnType": turn_type,
-                "text": text,
-                "encoding": "pcm_s16le",
-                "sampleRate": audio.sample_rate,
-                "channels": audio.channels,
-                "sampleWidth": audio.sample_width,
-                "chunkBytes": TTS_CHUNK_BYTES,
-            }
-        ]
-        payload = audio.pcm_s16le or b""
-        for seq, offset in enumerate(range(0, len(payload), TTS_CHUNK_BYTES)):
-            chunk = payload[offset : offset + TTS_CHUNK_BYTES]
-            events.append(
-                {
-                    "type": "tts_chunk",
-                    "deviceId": self.device_id,
-                    "sessionId": self.session_id,
-                    "seq": seq,
-                    "data": base64.b64encode(chunk).decode("ascii"),
-                }
-            )
-        events.append({"type": "tts_end", "deviceId": self.device_id, "sessionId": self.session_id, "turnType": turn_type, "text": text})
-        return events
+    def _observe(self, stage: str, started_at: float, ended_at: Optional[float] = None) -> None:
+        if self._metrics is None:
+            return
+        ms = ((ended_at if ended_at is not None else time.monotonic()) - started_at) * 1000
+        self._metrics.observe(stage, ms, device=self.device_id, room=str(self.placement.get("room") or ""))
+
+    def _observe_first_tts(self, started_at: float) -> None:
+        self._observe("tts_first_chunk", started_at)
+        if self.audio_end_at:
+            # End-to-end: user finished sending audio -> first reply audio.
+            self._observe("audio_end_to_first_tts", self.audio_end_at)
+            self.audio_end_at = 0.0
+
+    def _tts_cache_counters(self) -> dict[str, Any]:
+        if self._tts_cache is None:
+            return {}
+        return {"cache_hits_total": self._tts_cache.hits, "cache_misses_total": self._tts_cache.misses}
+
+    async def _produce_segment_pcm(self, segment: str, queue: asyncio.Queue) -> bool:
+        """Put 16 kHz mono pcm_s16le for one sentence on ``queue``, then None.
+
+        Serves the sentence from the TTS cache when possible. Otherwise streams
+        piper stdout when the engine supports it and ``tts.stream`` is on, or
+        synthesizes the sentence in one piece. Errors are put on the queue so
+        the consumer raises them in order. Returns True on a cache hit.
+        """
+        cache = self._tts_cache
+        if cache is not None:
+            cached = cache.get_memory(segment)
+            if cached is None:
+                # Disk reads go to a thread so slow storage never stalls the loop.
+                cached = await asyncio.to_thread(cache.load_disk, segment) if cache.disk_dir else cache.load_disk(segment)
+            if cached is not None:
+                queue.put_nowait(cached)
+                queue.put_nowait(None)
+                return True
+        produced = bytearray()
+        try:
+            synthesize_stream = getattr(self.tts, "synthesize_stream", None)
+            if synthesize_stream is not None and self.cfg.tts.stream:
+                resampler = StreamingResampler(self.tts.stream_sample_rate(), PROCESS_SAMPLE_RATE)
+                async for raw in _iterate_in_thread(lambda: synthesize_stream(segment)):
+                    pcm = resampler.process(np.frombuffer(raw, dtype=np.int16)).tobytes()
+                    if pcm:
+                        produced.extend(pcm)
+                        queue.put_nowait(pcm)
+                tail = resampler.flush().tobytes()
+                if tail:
+                    produced.extend(tail)
+                    queue.put_nowait(tail)
+            else:
+                audio = self._normalize_tts_audio(await asyncio.to_thread(self.tts.synthesize, segment))
+                if audio.pcm_s16le:
+                    produced.extend(audio.pcm_s16le)
+                    queue.put_nowait(audio.pcm_s16le)
+            queue.put_nowait(None)
+        except Exception as exc:
+            queue.put_nowait(exc)
+            return False
+        if cache is not None and produced:
+            pcm = bytes(produced)
+            # Memory first so the next reply already hits; the disk copy is
+            # written in the background and never holds up the next segment.
+            cache.remember(segment, pcm)
+            if cache.disk_dir:
+                write = asyncio.create_task(asyncio.to_thread(cache.persist, segment, pcm))
+                self._cache_writes.add(write)
+                write.add_done_callback(self._cache_writes.discard)
+        return False
+
+    def _tts_start_event(self, *, text: str, turn_type: str) -> dict[str, Any]:
+        # Audio is always normalized to 16 kHz mono s16le before it is sent.
+        return {
+            "type": "tts_start",
+            "deviceId": self.device_id,
+            "sessionId": self.session_id,
+            "turnType": turn_type,
+            "text": text,
+            "encoding": "pcm_s16le",
+            "sampleRate": PROCESS_SAMPLE_RATE,
+            "channels": 1,
+            "sampleWidth": 2,
+            "chunkBytes": TTS_CHUNK_BYTES,
+        }
+
+    def _tts_chunk_event(self, seq: int, chunk: bytes) -> dict[str, Any]:
+        return {"type": "tts_chunk", "deviceId": self.device_id, "sessionId": self.session_id, "seq": seq, "pcm": chunk}
+
+    def _tts_end_event(self, *, text: str, turn_type: str) -> dict[str, Any]:
+        return {"type": "tts_end", "deviceId": self.device_id, "sessionId": self.session_id, "turnType": turn_type, "text": text}
 
     def _normalize_tts_audio(self, audio: SynthesizedAudio) -> SynthesizedAudio:
-        if not audio.pcm_s16le:
-            return SynthesizedAudio(sample_rate=PROCESS_SAMPLE_RATE, channels=1, sample_width=2, pcm_s16le=b"")
-        if audio.sample_width != 2:
-            raise RuntimeError(f"unsupported tts sample width: {audio.sample_width}")
-
-        pcm = np.frombuffer(audio.pcm_s16le, dtype=np.int16)
-        if audio.channels > 1:
-            pcm = pcm.reshape(-1, audio.channels).astype(np.int32).mean(axis=1)
-            pcm = np.clip(pcm, -32768, 32767).astype(np.int16)
-        elif audio.channels == 1:
-            pcm = pcm.astype(np.int16, copy=False)
-        else:
-            raise RuntimeError(f"unsupported tts channels: {audio.channels}")
+        return normalize_tts_audio(audio)
+
+    async def _fast_path_turn(self, text: str) -> Optional[dict[str, Any]]:
+        """Agent-style reply from the fast path, or None to ask the agent."""
+        if self._fast_path is None or self.last_reply_type in ("propose", "clarify"):
+            # The agent is waiting for an answer to its own question.
+            return None
+        try:
+            return await self._fast_path.turn(text, room=str(self.placement.get("room") or ""))
+        except Exception as exc:
+            self.logger.warn({"msg": "satellite.fast_path.failed", "device_id": self.device_id, "session_id": self.session_id, "error": str(exc)})
+            return None
+
+    async def _agent_turn(self, text: str, *, confirm: bool) -> dict[str, Any]:
+        kwargs = {"session_id": self.session_id or "", "text": text, "confirm": confirm, "wake_source": self._agent_wake_source()}
+        if asyncio.iscoroutinefunction(self.agent.turn):
+            return await self.agent.turn(**kwargs)
+        return await asyncio.to_thread(self.agent.turn, **kwargs)
 
-        if audio.sample_rate != PROCESS_SAMPLE_RATE:
-            out_len = max(1, int(round(len(pcm) * PROCESS_SAMPLE_RATE / max(1, audio.sample_rate))))
-            pcm = resample_block(pcm, build_resampler(len(pcm), out_len))
+    async def _agent_reply_segments(self, text: str, *, confirm: bool, reply: dict[str, str]) -> AsyncIterator[str]:
+        """Yield sentences of a streamed agent reply as soon as they are complete.
 
-        return SynthesizedAudio(
-            sample_rate=PROCESS_SAMPLE_RATE,
-            channels=1,
-            sample_width=2,
-            pcm_s16le=pcm.astype(np.int16, copy=False).tobytes(),
+        Message deltas are split into sentences on arrival. The action summary
+        and confirm prompt come from the final reply and are spoken after the
+        message; an agent that answered with plain JSON is spoken exactly as
+        ``compose_speech`` would. ``reply`` is kept up to date for tts events.
+        """
+        started_at = time.monotonic()
+        first_delta_ms: Optional[int] = None
+        splitter = SentenceStream() if self.cfg.tts.split_sentences else None
+        message = ""
+        out: dict[str, Any] = {}
+        async for event in self.agent.turn_stream(
+            session_id=self.session_id or "", text=text, confirm=confirm, wake_source=self._agent_wake_source()
+        ):
+            if event.get("type") != "delta":
+                out = event
+                continue
+            delta = str(event.get("text") or "")
+            if first_delta_ms is None and delta:
+                first_delta_ms = int((time.monotonic() - started_at) * 1000)
+            message += delta
+            reply["text"] = clean_text(message)
+            for sentence in splitter.feed(delta) if splitter else []:
+                yield sentence
+
+        spoken = clean_text(message)
+        if spoken:
+            for sentence in splitter.flush() if splitter else [spoken]:
+                yield sentence
+            tail = compose_action_speech(out, self.devices.by_id)
+        else:
+            tail = compose_speech(out, self.devices.by_id)
+        reply["text"] = spoken + tail
+        reply["turnType"] = str(out.get("type") or "answer")
+        # Set before the tail is spoken: a barge-in closes this generator, and
+        # a confirm that cuts into the prompt must already be expected.
+        self._expect_reply_to(reply["turnType"])
+        self._observe("agent", started_at)
+        self.logger.info(
+            {
+                "msg": "satellite.agent.reply",
+                "device_id": self.device_id,
+                "session_id": self.session_id,
+                "agent_ms": int((time.monotonic() - started_at) * 1000),
+                "first_delta_ms": first_delta_ms,
+                "type": out.get("type"),
+                "speech": reply["text"],
+            }
         )
+        if tail:
+            for sentence in (split_sentences(tail) if splitter else []) or [tail]:
+                yield sentence
 
     def _agent_wake_source(self) -> dict[str, Any]:
         return {
@@ -588,27 +987,144 @@ class RemoteSatelliteSession:
         return path
 
 
-async def run_ws_server(cfg: AppConfig, logger: Logger) -> int:
+def normalize_tts_audio(audio: SynthesizedAudio) -> SynthesizedAudio:
+    """Convert synthesized audio to the 16 kHz mono s16le that satellites play."""
+    if not audio.pcm_s16le:
+        return SynthesizedAudio(sample_rate=PROCESS_SAMPLE_RATE, channels=1, sample_width=2, pcm_s16le=b"")
+    if audio.sample_width != 2:
+        raise RuntimeError(f"unsupported tts sample width: {audio.sample_width}")
+
+    pcm = np.frombuffer(audio.pcm_s16le, dtype=np.int16)
+    if audio.channels > 1:
+        pcm = pcm.reshape(-1, audio.channels).astype(np.int32).mean(axis=1)
+        pcm = np.clip(pcm, -32768, 32767).astype(np.int16)
+    elif audio.channels == 1:
+        pcm = pcm.astype(np.int16, copy=False)
+    else:
+        raise RuntimeError(f"unsupported tts channels: {audio.channels}")
+
+    if audio.sample_rate != PROCESS_SAMPLE_RATE:
+        pcm = resample(pcm, audio.sample_rate, PROCESS_SAMPLE_RATE)
+
+    return SynthesizedAudio(
+        sample_rate=PROCESS_SAMPLE_RATE,
+        channels=1,
+        sample_width=2,
+        pcm_s16le=pcm.astype(np.int16, copy=False).tobytes(),
+    )
+
+
+async def run_ws_server(
+    cfg: AppConfig,
+    logger: Logger,
+    *,
+    stt: Any = None,
+    tts: Any = None,
+    agent: Any = None,
+    devices: Any = None,
+    vad_factory: Optional[Callable[[], Any]] = None,
+    metrics: Optional[PipelineMetrics] = None,
+    on_ready: Optional[Callable[[int], None]] = None,
+) -> int:
+    """Serve satellites until cancelled.
+
+    Backends not passed in are built from ``cfg``; passed-in ones (the load
+    test's stubs) are used as-is and stay owned by the caller. ``on_ready``
+    gets the bound port once the server listens.
+    """
     from websockets.legacy.server import serve
     from websockets.exceptions import ConnectionClosed
-    from .stt_whisper import WhisperStt
+    from .stt_engines import create_stt
     from .tts_piper import PiperTts
+    from .tts_pool import PiperWorkerPool
 
-    devices = DeviceCatalog(base_url=cfg.api_gateway.base_url, api_key=cfg.api_gateway.api_key, logger=logger)
+    metrics = metrics if metrics is not None else PipelineMetrics()
+    own_devices = devices is None
+    if own_devices:
+        devices = DeviceCatalog(base_url=cfg.api_gateway.base_url, api_key=cfg.api_gateway.api_key, logger=logger)
+        devices.refresh_in_background(force=True)
+        if cfg.api_gateway.watch:
+            devices.watch()
     registry = SatelliteRegistry(path=cfg.device_config_path, logger=logger)
     registry.refresh_if_needed()
-    agent = AgentClient(base_url=cfg.agent.base_url, timeout_s=cfg.agent.timeout_s, logger=logger)
-    stt = WhisperStt(model_ref=cfg.stt.whisper_model, device=cfg.stt.device, language=cfg.stt.language, logger=logger)
-    tts = PiperTts(
-        piper_bin=cfg.tts.piper_bin,
-        model_path=cfg.tts.model_path,
-        config_path=cfg.tts.config_path,
-        speaker=cfg.tts.speaker,
-        output_device=None,
-        output_backend="sounddevice",
-        logger=logger,
-    )
-    stt_lock = threading.Lock()
+    own_agent = agent is None
+    if own_agent:
+        agent = AsyncAgentClient(
+            base_url=cfg.agent.base_url,
+            timeout_s=cfg.agent.timeout_s,
+            max_concurrency=cfg.agent.max_concurrency,
+            logger=logger,
+        )
+    tts_pool: PiperWorkerPool | None = None
+    if tts is None:
+        if cfg.tts.workers > 0:
+            tts_pool = PiperWorkerPool(cfg.tts, workers=cfg.tts.workers, request_timeout_s=cfg.tts.worker_timeout_s, logger=logger)
+            tts_pool.start()
+        tts = PiperTts(
+            piper_bin=cfg.tts.piper_bin,
+            model_path=cfg.tts.model_path,
+            config_path=cfg.tts.config_path,
+            speaker=cfg.tts.speaker,
+            output_device=None,
+            output_backend="sounddevice",
+            logger=logger,
+            pool=tts_pool,
+        )
+    tts_cache: TtsCache | None = None
+    if cfg.tts.cache_max_mb > 0:
+        tts_cache = TtsCache(
+            model_path=cfg.tts.model_path,
+            speaker=cfg.tts.speaker,
+            max_bytes=cfg.tts.cache_max_mb * 1024 * 1024,
+            disk_dir=cfg.tts.cache_dir,
+            logger=logger,
+        )
+        phrases = [*PREWARM_PHRASES, *(cfg.tts.prewarm_phrases or [])]
+        if cfg.tts.split_sentences:
+            # Cache keys are per sentence, exactly as _stream_tts_events looks them up.
+            phrases = [segment for phrase in phrases for segment in split_sentences(phrase)]
+        threading.Thread(
+            target=tts_cache.prewarm,
+            args=(phrases, lambda text: normalize_tts_audio(tts.synthesize(text)).pcm_s16le),
+            name="tts-prewarm",
+            daemon=True,
+        ).start()
+    stt_scheduler: SttScheduler | SttWorkerPool
+    if stt is None and cfg.stt.workers > 0:
+        # Worker processes load the model themselves; keep this process light.
+        stt_scheduler = SttWorkerPool(
+            cfg.stt,
+            workers=cfg.stt.workers,
+            max_samples=int((cfg.vad.max_utterance_ms + WAIT_AUDIO_END_TIMEOUT_MS) / 1000 * PROCESS_SAMPLE_RATE),
+            request_timeout_s=cfg.stt.worker_timeout_s,
+            log_level=cfg.runtime.log_level,
+            logger=logger,
+        )
+        stt: Any = stt_scheduler
+    else:
+        if stt is None:
+            stt = create_stt(cfg.stt, logger)
+        stt_scheduler = SttScheduler(
+            stt,
+            batch_window_ms=cfg.stt.batch_window_ms,
+            max_batch_size=cfg.stt.max_batch_size,
+            logger=logger,
+        )
+    stt_scheduler.start()
+    vad_engine: SharedVadEngine | None = None
+    if vad_factory is None:
+        vad_engine = SharedVadEngine(model_path=cfg.vad.model_path, tick_ms=cfg.vad.tick_ms, logger=logger)
+        vad_engine.start()
+        vad_factory = vad_engine.open_stream
+    fast_path: FastPath | None = None
+    if cfg.agent.fast_path:
+        fast_path = FastPath(
+            devices=devices,
+            base_url=cfg.api_gateway.base_url,
+            api_key=cfg.api_gateway.api_key,
+            room_aliases=cfg.agent.fast_path_room_aliases,
+            logger=logger,
+        )
 
     async def handler(websocket: Any, path: str) -> None:
         expected_path = cfg.satellite_server.path or "/ws"
@@ -617,18 +1133,152 @@ async def run_ws_server(cfg: AppConfig, logger: Logger) -> int:
             return
 
         remote = getattr(websocket, "remote_address", None)
-        send_lock = asyncio.Lock()
         session: Optional[RemoteSatelliteSession] = None
+        framing = FRAMING_JSON
+        stale_frames = 0
+        dropped_frames = 0
+        downlink = DownlinkCredit(
+            prebuffer_ms=cfg.satellite_server.tts_prebuffer_ms,
+            ack_timeout_ms=cfg.satellite_server.tts_ack_timeout_ms,
+        )
+        inbox: asyncio.Queue = asyncio.Queue(maxsize=INBOX_MAX_MESSAGES)
+        outbox: asyncio.Queue = asyncio.Queue(maxsize=OUTBOX_MAX_FRAMES)
+        send_error: Optional[BaseException] = None
+        rtt_probe: Optional[asyncio.Task] = None
+        reply_task: Optional[asyncio.Task] = None
+        speaking = False
+        barge_in = ""
+        barge_ins = 0
 
         async def send_event(event: dict[str, Any]) -> None:
-            async with send_lock:
-                await websocket.send(json.dumps(event, ensure_ascii=False))
+            # Encoded here so each frame uses the framing in effect when it was queued.
+            if send_error is not None:
+                raise send_error
+            await outbox.put((event.get("type"), encode_event(event, framing=framing)))
 
-        async def send_events(events: list[dict[str, Any]]) -> None:
-            for event in events:
-                await send_event(event)
-                if event.get("type") == "tts_chunk":
-                    await asyncio.sleep(TTS_CHUNK_PACING_SEC)
+        async def close(code: int, reason: str) -> None:
+            await outbox.join()
+            await websocket.close(code=code, reason=reason)
+
+        async def writer() -> None:
+            nonlocal send_error
+            while True:
+                _kind, frame = await outbox.get()
+                try:
+                    if send_error is None:
+                        await websocket.send(frame)
+                except ConnectionClosed as exc:
+                    # Keep draining so nobody blocks on a full outbox; the next send_event raises.
+                    send_error = exc
+                finally:
+                    outbox.task_done()
+
+        async def send_events(events: Iterable[dict[str, Any]] | AsyncIterator[dict[str, Any]]) -> None:
+            if isinstance(events, AsyncIterator):
+                try:
+                    async for event in events:
+                        await send_paced(event)
+                finally:
+                    # A barge-in may cancel us while the generator waits at a yield; closing
+                    # it runs the reply's cleanup, which cancels synthesis still in progress.
+                    aclose = getattr(events, "aclose", None)
+                    if aclose is not None:
+                        await aclose()
+            else:
+                for event in events:
+                    await send_paced(event)
+
+        async def speak(events: AsyncIterator[dict[str, Any]]) -> bool:
+            """Send a reply stream; False when a barge-in cut it off (tts_abort already sent)."""
+            nonlocal reply_task, speaking, barge_in, barge_ins
+            reply_task = asyncio.create_task(send_events(events))
+            try:
+                await reply_task
+            except asyncio.CancelledError:
+                if not barge_in:
+                    raise
+            finally:
+                reply_task = None
+                speaking = False
+            if not barge_in:
+                return True
+            reason, barge_in = barge_in, ""
+            barge_ins += 1
+            # Audio of the cut-off reply that is still queued would only delay tts_abort.
+            kept = []
+            while not outbox.empty():
+                item = outbox.get_nowait()
+                outbox.task_done()
+                if item[0] != "tts_chunk":
+                    kept.append(item)
+            for item in kept:
+                outbox.put_nowait(item)
+            await send_events(session.abort_reply(reason=reason))
+            if reason == "barge_in":
+                # wake / audio_start are still queued and start the next turn themselves.
+                await send_events(await session.start_session())
+            return False
+
+        async def send_paced(event: dict[str, Any]) -> None:
+            nonlocal speaking
+            kind = event.get("type")
+            if kind == "tts_start":
+                speaking = True
+                # Kept current by the keepalive pings.
+                downlink.observe_rtt(getattr(websocket, "latency", 0.0))
+                event = {**event, "replyId": downlink.start_reply()}
+            elif kind == "tts_chunk":
+                await downlink.acquire(len(event.get("pcm") or b""))
+            await send_event(event)
+            if kind == "tts_end":
+                # The reply is complete; a barge-in from here on interrupts nothing.
+                speaking = False
+                logger.debug({"msg": "satellite.tts.flow", "device_id": getattr(session, "device_id", None), **downlink.stats()})
+
+        async def reader() -> None:
+            # Credits, pings and barge-in are handled on arrival, also while a turn is being processed.
+            nonlocal dropped_frames, barge_in
+            try:
+                async for raw in websocket:
+                    msg: Any = None
+                    if not isinstance(raw, bytes):
+                        try:
+                            msg = json.loads(raw)
+                        except json.JSONDecodeError:
+                            msg = _INVALID_JSON
+                        if session is not None and isinstance(msg, dict):
+                            if msg.get("type") == "tts_ack":
+                                with contextlib.suppress(TypeError, ValueError):
+                                    reply_id = msg.get("replyId")
+                                    downlink.on_ack(int(msg.get("playedBytes") or 0), None if reply_id is None else int(reply_id))
+                                continue
+                            if msg.get("type") == "ping":
+                                with contextlib.suppress(TypeError, ValueError):
+                                    downlink.observe_rtt(float(msg.get("rttMs") or 0) / 1000.0)
+                                pong = {"type": "pong", "deviceId": session.device_id, "ts": int(time.time() * 1000)}
+                                with contextlib.suppress(asyncio.QueueFull):
+                                    # Never block the reader on a busy writer; the device pings again.
+                                    outbox.put_nowait(("pong", encode_event(pong, framing=framing)))
+                                continue
+                            # cancel() is False once the reply has finished: then there is nothing to abort.
+                            if msg.get("type") in BARGE_IN_TYPES and speaking and reply_task is not None and not barge_in and reply_task.cancel():
+                                barge_in = str(msg.get("type"))
+                            if msg.get("type") == "barge_in":
+                                continue
+                    if inbox.full() and (isinstance(raw, bytes) or (isinstance(msg, dict) and msg.get("type") == "audio_chunk")):
+                        # The processor is far behind; audio is the one thing worth losing.
+                        dropped_frames += 1
+                        continue
+                    await inbox.put((raw, msg))
+                await inbox.put(None)
+            except Exception as exc:
+                await inbox.put(exc)
+
+        async def probe_rtt() -> None:
+            # One ping right after hello, so the first reply is already sized by RTT.
+            with contextlib.suppress(Exception):
+                pong_waiter = await websocket.ping()
+                downlink.observe_rtt(await asyncio.wait_for(pong_waiter, timeout=5))
 
         async def watchdog() -> None:
             while True:
@@ -640,16 +1290,38 @@ async def run_ws_server(cfg: AppConfig, logger: Logger) -> int:
                     await send_events(events)
 
         logger.info({"msg": "satellite.connection.open", "remote": str(remote), "path": path})
+        writer_task = asyncio.create_task(writer())
         watchdog_task = asyncio.create_task(watchdog())
+        reader_task = asyncio.create_task(reader())
         try:
             try:
-                async for raw in websocket:
+                # This coroutine is the connection's turn processor: one message at a time, in order.
+                while True:
+                    item = await inbox.get()
+                    if item is None:
+                        break
+                    if isinstance(item, BaseException):
+                        raise item
+                    raw, msg = item
                     if isinstance(raw, bytes):
-                        await send_event({"type": "error", "code": "binary_not_supported", "message": "send JSON text frames only"})
+                        if session is None or framing != FRAMING_BINARY:
+                            await send_event({"type": "error", "code": "binary_not_supported", "message": "send JSON text frames only"})
+                            continue
+                        try:
+                            frame = decode_frame(raw)
+                        except ValueError as exc:
+                            await send_event({"type": "error", "code": "invalid_frame", "message": str(exc)})
+                            continue
+                        if frame.kind != FRAME_AUDIO:
+                            await send_event({"type": "error", "code": "unsupported_frame", "message": f"unsupported frame type: {frame.kind}"})
+                            continue
+                        if frame.session_tag and frame.session_tag != session_tag(session.session_id):
+                            # Late audio from a session that already ended; drop it quietly.
+                            stale_frames += 1
+                            continue
+                        await send_events(await session.ingest_audio_chunk(frame.payload))
                         continue
-                    try:
-                        msg = json.loads(raw)
-                    except json.JSONDecodeError:
+                    if msg is _INVALID_JSON:
                         await send_event({"type": "error", "code": "invalid_json", "message": "message must be valid JSON"})
                         continue
                     if not isinstance(msg, dict):
@@ -660,17 +1332,17 @@ async def run_ws_server(cfg: AppConfig, logger: Logger) -> int:
                     if session is None:
                         if msg_type != "hello":
                             await send_event({"type": "error", "code": "hello_required", "message": "send hello before other messages"})
-                            await websocket.close(code=1008, reason="hello required")
+                            await close(code=1008, reason="hello required")
                             return
                         device_id = str(msg.get("deviceId") or "").strip()
                         if not device_id:
                             await send_event({"type": "error", "code": "missing_device_id", "message": "hello.deviceId is required"})
-                            await websocket.close(code=1008, reason="missing device id")
+                            await close(code=1008, reason="missing device id")
                             return
                         auth_token = str(msg.get("authToken") or "")
                         if cfg.satellite_server.auth_token and auth_token != cfg.satellite_server.auth_token:
                             await send_event({"type": "error", "code": "auth_failed", "message": "invalid auth token"})
-                            await websocket.close(code=1008, reason="auth failed")
+                            await close(code=1008, reason="auth failed")
                             return
                         sample_rate = int(msg.get("sampleRate") or PROCESS_SAMPLE_RATE)
                         encoding = str(msg.get("encoding") or "pcm_s16le").strip().lower()
@@ -683,7 +1355,7 @@ async def run_ws_server(cfg: AppConfig, logger: Logger) -> int:
                                     "message": "expected mono 16kHz pcm_s16le audio",
                                 }
                             )
-                            await websocket.close(code=1008, reason="unsupported audio format")
+                            await close(code=1008, reason="unsupported audio format")
                             return
                         registration, error_code, error_message = registry.resolve(device_id)
                         if not registration:
@@ -704,8 +1376,19 @@ async def run_ws_server(cfg: AppConfig, logger: Logger) -> int:
                                     "message": error_message,
                                 }
                             )
-                            await websocket.close(code=1008, reason=error_code or "satellite rejected")
+                            await close(code=1008, reason=error_code or "satellite rejected")
                             return
+                        framing = negotiate_framing(msg.get("framing"))
+                        try:
+                            playback_buffer_bytes = max(0, int(msg.get("playbackBufferBytes") or 0))
+                        except (TypeError, ValueError):
+                            playback_buffer_bytes = 0
+                        downlink = DownlinkCredit(
+                            buffer_bytes=playback_buffer_bytes,
+                            prebuffer_ms=cfg.satellite_server.tts_prebuffer_ms,
+                            ack_timeout_ms=cfg.satellite_server.tts_ack_timeout_ms,
+                        )
+                        rtt_probe = asyncio.create_task(probe_rtt())
                         session = RemoteSatelliteSession(
                             device_id=device_id,
                             placement=registration.placement,
@@ -715,7 +1398,11 @@ async def run_ws_server(cfg: AppConfig, logger: Logger) -> int:
                             agent=agent,
                             stt=stt,
                             tts=tts,
-                            stt_lock=stt_lock,
+                            stt_scheduler=stt_scheduler,
+                            vad_factory=vad_factory,
+                            tts_cache=tts_cache,
+                            metrics=metrics,
+                            fast_path=fast_path,
                         )
                         logger.info(
                             {
@@ -723,6 +1410,8 @@ async def run_ws_server(cfg: AppConfig, logger: Logger) -> int:
                                 "device_id": device_id,
                                 "remote": str(remote),
                                 "room": registration.placement.get("room"),
+                                "framing": framing,
+                                "playback_buffer_bytes": playback_buffer_bytes,
                             }
                         )
                         await send_event(
@@ -736,20 +1425,22 @@ async def run_ws_server(cfg: AppConfig, logger: Logger) -> int:
                                     "channels": 1,
                                     "frameSamples": PROCESS_BLOCK_SIZE,
                                 },
+                                "framing": framing,
+                                "flowControl": {
+                                    "mode": "credit" if downlink.credit_mode else "clock",
+                                    "windowBytes": downlink.window_bytes(),
+                                    "ackIntervalBytes": TTS_CHUNK_BYTES,
+                                },
                             }
                         )
                         continue
 
-                    if msg_type == "ping":
-                        await send_event({"type": "pong", "deviceId": session.device_id, "ts": int(time.time() * 1000)})
-                        continue
                     if msg_type == "debug_tts":
-                        text = str(msg.get("text") or "这是网络语音播报测试。").strip() or "这是网络语音播报测试。"
+                        text = str(msg.get("text") or DEBUG_TTS_TEXT).strip() or DEBUG_TTS_TEXT
                         if not session.session_id:
                             session.session_id = f"voice-{uuid.uuid4().hex[:8]}"
-                        events = await session._build_tts_events(text, turn_type="debug")
-                        events.extend(session._close_session(reason="debug_tts"))
-                        await send_events(events)
+                        if await speak(session._stream_tts_events(text, turn_type="debug")):
+                            await send_events(session._close_session(reason="debug_tts"))
                         continue
                     if msg_type == "wake":
                         await send_events(await session.start_session())
@@ -758,7 +1449,7 @@ async def run_ws_server(cfg: AppConfig, logger: Logger) -> int:
                         await send_events(await session.begin_capture())
                         continue
                     if msg_type == "audio_end":
-                        await send_events(await session.finalize_audio())
+                        await speak(session.finalize_audio_stream())
                         continue
                     if msg_type == "audio_chunk":
                         data = msg.get("data")
@@ -785,10 +1476,25 @@ async def run_ws_server(cfg: AppConfig, logger: Logger) -> int:
                     }
                 )
         finally:
-            watchdog_task.cancel()
-            with contextlib.suppress(asyncio.CancelledError):
-                await watchdog_task
-            logger.info({"msg": "satellite.connection.close", "remote": str(remote), "device_id": getattr(session, 'device_id', None)})
+            for task in (watchdog_task, reader_task, rtt_probe, writer_task):
+                if task is None:
+                    continue
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError, ConnectionClosed):
+                    await task
+            if session is not None:
+                session.close()
+            logger.info(
+                {
+                    "msg": "satellite.connection.close",
+                    "remote": str(remote),
+                    "device_id": getattr(session, "device_id", None),
+                    "framing": framing,
+                    "stale_frames": stale_frames,
+                    "dropped_frames": dropped_frames,
+                    "barge_ins": barge_ins,
+                }
+            )
 
     logger.info(
         {
@@ -798,13 +1504,42 @@ async def run_ws_server(cfg: AppConfig, logger: Logger) -> int:
             "path": cfg.satellite_server.path,
         }
     )
-    async with serve(
-        handler,
-        cfg.satellite_server.host,
-        cfg.satellite_server.port,
-        max_size=cfg.satellite_server.max_message_bytes,
-        ping_interval=cfg.satellite_server.ping_interval_s,
-        ping_timeout=cfg.satellite_server.ping_timeout_s,
-    ):
-        await asyncio.Future()
+    metrics_server: asyncio.AbstractServer | None = None
+    if cfg.satellite_server.metrics_port:
+        metrics_server = await start_metrics_server(
+            metrics, host=cfg.satellite_server.host, port=cfg.satellite_server.metrics_port, logger=logger
+        )
+    try:
+        async with serve(
+            handler,
+            cfg.satellite_server.host,
+            cfg.satellite_server.port,
+            max_size=cfg.satellite_server.max_message_bytes,
+            ping_interval=cfg.satellite_server.ping_interval_s,
+            ping_timeout=cfg.satellite_server.ping_timeout_s,
+        ) as server:
+            if on_ready is not None:
+                on_ready(server.sockets[0].getsockname()[1])
+            await asyncio.Future()
+    finally:
+        if metrics_server is not None:
+            metrics_server.close()
+        logger.info({"msg": "stt.stats", **stt_scheduler.stats()})
+        stt_scheduler.close()
+        if vad_engine is not None:
+            logger.info({"msg": "vad.stats", **vad_engine.stats()})
+            vad_engine.close()
+        if tts_cache is not None:
+            logger.info({"msg": "tts.cache.stats", **tts_cache.stats()})
+        if tts_pool is not None:
+            logger.info({"msg": "tts.stats", **tts_pool.stats()})
+            tts_pool.close()
+        if fast_path is not None:
+            logger.info({"msg": "fast_path.stats", **fast_path.stats()})
+            await fast_path.aclose()
+        if own_agent:
+            await agent.aclose()
+        if own_devices:
+            logger.info({"msg": "devices.stats", **devices.stats()})
+            devices.close()
     return 0
@@ -39,6 +39,32 @@ def compose_speech(agent_out: Dict[str, Any], devices_by_id: Dict[str, Dict[str,
     return message or "好的。"
 
 
+def compose_action_speech(agent_out: Dict[str, Any], devices_by_id: Dict[str, Dict[str, Any]]) -> str:
+    """The part of ``compose_speech`` that is not the agent message.
+
+    Used after the message has already been spoken from a streamed reply:
+    only the action summary, result counts and the confirm prompt remain.
+    """
+    t = str(agent_out.get("type") or "").strip()
+    message = clean_text(str(agent_out.get("message") or ""))
+    actions = agent_out.get("actions") if isinstance(agent_out.get("actions"), list) else []
+
+    if t == "executed" and actions:
+        summary = summarize_actions(actions, devices_by_id)
+        ok, total, failures = summarize_results(agent_out.get("result"), actions)
+        prefix = f"部分失败（成功 {ok}，失败 {total - ok}）：" if total and ok != total else "已提交执行："
+        return "。".join([p.rstrip("。") for p in [prefix + summary, "；".join(failures)] if p]) + "。"
+
+    if t == "propose" and actions:
+        summary = summarize_actions(actions, devices_by_id)
+        # Like ``compose_speech``: a message that already names the actions is spoken as-is.
+        if summary and summary in message:
+            return ""
+        return f"我准备执行：{summary}。请说确认或取消。"
+
+    return ""
+
+
 def summarize_actions(actions: List[dict], devices_by_id: Dict[str, Dict[str, Any]]) -> str:
     parts = []
     for a in actions:
@@ -116,3 +142,92 @@ def clean_text(text: str) -> str:
         t = t.replace("  ", " ")
     return t.strip()
 
+
+_SENTENCE_END = "。！？!?；;…\n"
+_CLAUSE_END = "，、,：:"
+_STREAM_BREAKS = "。！？!?；;\n"
+
+
+def split_sentences(text: str, *, min_chars: int = 4, max_chars: int = 40) -> List[str]:
+    """Split a reply into sentences for pipelined TTS.
+
+    Breaks after Chinese/ASCII sentence punctuation (``.`` only when followed by
+    whitespace, so ``25.5度`` stays intact). Sentences longer than ``max_chars``
+    are further broken at clause punctuation, and pieces shorter than
+    ``min_chars`` are merged into a neighbour so piper is not started for "好。".
+    """
+    t = (text or "").strip()
+    if not t:
+        return []
+    pieces: List[str] = []
+    start = 0
+    last_clause = -1
+    for i, ch in enumerate(t):
+        end = ch in _SENTENCE_END or (ch == "." and (i + 1 == len(t) or t[i + 1].isspace()))
+        if not end and i - start + 1 > max_chars and last_clause >= start:
+            pieces.append(t[start : last_clause + 1])
+            start = last_clause + 1
+        if ch in _CLAUSE_END:
+            last_clause = i
+        if end:
+            # Keep runs like "？！" or "……" attached to the sentence they end.
+            if i + 1 < len(t) and t[i + 1] in _SENTENCE_END:
+                continue
+            pieces.append(t[start : i + 1])
+            start = i + 1
+    pieces.append(t[start:])
+
+    out: List[str] = []
+    for piece in (p.strip() for p in pieces):
+        if not piece:
+            continue
+        if out and len(_speakable(out[-1])) < min_chars:
+            out[-1] = _join(out[-1], piece)
+        else:
+            out.append(piece)
+    if len(out) > 1 and len(_speakable(out[-1])) < min_chars:
+        tail = out.pop()
+        out[-1] = _join(out[-1], tail)
+    return out
+
+
+class SentenceStream:
+    """Incremental ``split_sentences`` for reply text that arrives in deltas.
+
+    ``feed`` returns the sentences completed by the new text; the unfinished
+    tail is held back until more text arrives or ``flush`` is called.
+    """
+
+    def __init__(self, *, min_chars: int = 4, max_chars: int = 40):
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self._buffer = ""
+
+    def feed(self, text: str) -> List[str]:
+        self._buffer += text or ""
+        # "." and "…" are not break points here: "25." may still become "25.5".
+        cut = max(self._buffer.rfind(ch) for ch in _STREAM_BREAKS)
+        if cut >= 0:
+            pieces = split_sentences(self._buffer[: cut + 1], min_chars=self.min_chars, max_chars=self.max_chars)
+            if pieces and len(_speakable(pieces[-1])) >= self.min_chars:
+                self._buffer = self._buffer[cut + 1 :]
+                return pieces
+        if len(self._buffer) > self.max_chars:
+            pieces = split_sentences(self._buffer, min_chars=self.min_chars, max_chars=self.max_chars)
+            if len(pieces) > 1:
+                self._buffer = pieces.pop()
+                return pieces
+        return []
+
+    def flush(self) -> List[str]:
+        pieces = split_sentences(self._buffer, min_chars=self.min_chars, max_chars=self.max_chars)
+        self._buffer = ""
+        return pieces
+
+
+def _join(head: str, tail: str) -> str:
+    return f"{head} {tail}" if head[-1].isascii() and tail[0].isascii() else head + tail
+
+
+def _speakable(text: str) -> str:
+    return "".join(ch for ch in text if ch not in _SENTENCE_END and ch not in _CLAUSE_END and not ch.isspace())
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Protocol, Tuple
+
+import numpy as np
+
+from .config import SttConfig
+from .log import Logger
+
+
+class SttEngine(Protocol):
+    def transcribe(self, audio: np.ndarray, *, sample_rate: int) -> Tuple[str, Dict[str, Any]]:
+        """Transcribe mono float32 audio; return (text, engine metadata)."""
+        ...
+
+
+SttFactory = Callable[[SttConfig, "Logger | None"], SttEngine]
+
+_ENGINES: Dict[str, SttFactory] = {}
+
+
+def register_stt_engine(name: str, factory: SttFactory) -> None:
+    _ENGINES[str(name).strip().lower()] = factory
+
+
+def available_stt_engines() -> List[str]:
+    return sorted(_ENGINES)
+
+
+def create_stt(cfg: SttConfig, logger: Logger | None = None) -> SttEngine:
+    name = str(cfg.engine or "whisper").strip().lower()
+    factory = _ENGINES.get(name)
+    if factory is None:
+        raise RuntimeError(f"unknown stt.engine {name!r}; expected one of: {' | '.join(available_stt_engines())}")
+    return factory(cfg, logger)
+
+
+def _whisper(cfg: SttConfig, logger: Logger | None) -> SttEngine:
+    from .stt_whisper import WhisperStt
+
+    return WhisperStt(model_ref=cfg.whisper_model, device=cfg.device, language=cfg.language, logger=logger)
+
+
+def _faster_whisper(cfg: SttConfig, logger: Logger | None) -> SttEngine:
+    from .stt_faster_whisper import FasterWhisperStt
+
+    return FasterWhisperStt(
+        model_ref=cfg.whisper_model,
+        language=cfg.language,
+        device=cfg.device,
+        compute_type=cfg.compute_type,
+        cpu_threads=cfg.cpu_threads,
+        num_workers=cfg.num_workers,
+        beam_size=cfg.beam_size,
+        logger=logger,
+    )
+
+
+def _fake(cfg: SttConfig, _logger: Logger | None) -> SttEngine:
+    from .stt_fake import FakeStt
+
+    return FakeStt(text=cfg.fake_text)
+
+
+register_stt_engine("whisper", _whisper)
+register_stt_engine("faster_whisper", _faster_whisper)
+register_stt_engine("fake", _fake)
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+
+@dataclass
+class FakeStt:
+    """Deterministic engine for tests and load runs: no model, fixed reply."""
+
+    text: str = ""
+
+    def transcribe(self, audio: np.ndarray, *, sample_rate: int) -> Tuple[str, Dict[str, Any]]:
+        samples = int(np.asarray(audio).size)
+        return self.text, {"engine": "fake", "samples": samples, "duration": samples / float(max(1, sample_rate))}
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+from .log import Logger
+from .stt_whisper import INITIAL_PROMPT
+
+
+@dataclass
+class FasterWhisperStt:
+    """CTranslate2 Whisper engine (faster-whisper), quantized for CPU hosts.
+
+    ``model_ref`` is a converted CTranslate2 model directory (or a model name,
+    which downloads weights and is therefore not offline).
+    """
+
+    model_ref: str
+    language: str
+    device: str = "cpu"
+    compute_type: str = "int8"
+    cpu_threads: int = 0  # 0: let CTranslate2 pick
+    num_workers: int = 1  # >1 allows concurrent transcribe() calls
+    beam_size: int = 1
+    logger: Logger | None = None
+
+    def __post_init__(self) -> None:
+        from faster_whisper import WhisperModel
+
+        ref = self.model_ref
+        if os.path.exists(ref):
+            self.logger and self.logger.info(
+                {
+                    "msg": "faster_whisper.load",
+                    "path": ref,
+                    "device": self.device,
+                    "compute_type": self.compute_type,
+                    "cpu_threads": self.cpu_threads,
+                    "num_workers": self.num_workers,
+                }
+            )
+        else:
+            self.logger and self.logger.warn({"msg": "faster_whisper.model_not_found_path", "ref": ref, "hint": "Use a local CTranslate2 model dir for offline runtime."})
+        self._model = WhisperModel(
+            ref,
+            device=self.device,
+            compute_type=self.compute_type,
+            cpu_threads=max(0, int(self.cpu_threads)),
+            num_workers=max(1, int(self.num_workers)),
+        )
+
+    def transcribe(self, audio: np.ndarray, *, sample_rate: int) -> Tuple[str, Dict[str, Any]]:
+        if audio.dtype != np.float32:
+            audio = audio.astype(np.float32)
+        audio = audio.reshape(-1)
+        segments, info = self._model.transcribe(
+            audio,
+            language=self.language or None,
+            task="transcribe",
+            beam_size=max(1, int(self.beam_size)),
+            temperature=0.0,
+            condition_on_previous_text=False,
+            initial_prompt=INITIAL_PROMPT,
+            without_timestamps=True,
+            vad_filter=False,
+        )
+        # segments is a lazy generator: decoding happens while iterating.
+        text = "".join(str(seg.text or "") for seg in segments).strip()
+        return text, {"language": getattr(info, "language", None), "duration": getattr(info, "duration", None)}
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from .capture_buffer import CaptureBuffer
+from .common import PROCESS_BLOCK_SIZE, PROCESS_SAMPLE_RATE, clean_user_text
+from .log import Logger
+
+# Do not bother decoding less than this much new audio.
+MIN_PARTIAL_MS = 300
+
+
+@dataclass
+class _PendingDecode:
+    task: "asyncio.Future[Tuple[str, Dict[str, Any]]]"
+    start_block: int
+    end_block: int
+    paused: bool
+    final: bool
+
+
+class IncrementalTranscriber:
+    """Decode a growing capture while the user is still speaking.
+
+    Every ``interval_ms`` the not-yet-committed part of the capture is decoded
+    in the background. When a decode window ends inside a pause of at least
+    ``commit_silence_blocks`` the text is committed together with its audio, so
+    later passes (including the final one) only cover the remaining tail.
+    """
+
+    def __init__(
+        self,
+        *,
+        transcribe: Callable[[np.ndarray], Awaitable[Tuple[str, Dict[str, Any]]]],
+        prepare: Callable[[np.ndarray], np.ndarray],
+        interval_ms: int,
+        commit_silence_blocks: int,
+        logger: Logger | None = None,
+    ):
+        self._transcribe = transcribe
+        self._prepare = prepare
+        self.interval_s = max(1, int(interval_ms)) / 1000.0
+        self.commit_silence_blocks = max(1, int(commit_silence_blocks))
+        self.min_blocks = max(1, int(MIN_PARTIAL_MS / 1000 * PROCESS_SAMPLE_RATE / PROCESS_BLOCK_SIZE))
+        self.logger = logger
+        self.reset()
+
+    def reset(self) -> None:
+        pending = getattr(self, "_pending", None)
+        if pending is not None and not pending.task.done():
+            pending.task.cancel()
+        self._pending: Optional[_PendingDecode] = None
+        self._last_started_at = 0.0
+        self.committed_blocks = 0
+        self.committed_text = ""
+        self._tail_text = ""
+        self._final: Optional[Tuple[int, str]] = None
+        # Capture blocks covered by ``text`` (end of the last applied decode).
+        self.text_end_block = 0
+        self.decodes = 0
+
+    @property
+    def text(self) -> str:
+        return join_text(self.committed_text, self._tail_text)
+
+    def has_progress(self) -> bool:
+        return self.committed_blocks > 0 or self._final is not None or (self._pending is not None and self._pending.final)
+
+    def maybe_start(self, blocks: CaptureBuffer, *, now: float, silence_blocks: int, force: bool = False) -> None:
+        """Start a background decode if none is running and ``interval_ms`` has passed (or ``force``)."""
+        if self._pending is not None or (not force and (now - self._last_started_at) < self.interval_s):
+            return
+        if len(blocks) - self.committed_blocks < self.min_blocks:
+            return
+        self._start(blocks, end_block=len(blocks), paused=silence_blocks >= self.commit_silence_blocks, final=False)
+
+    def start_final(self, blocks: CaptureBuffer) -> None:
+        """Decode up to the stop_capture point while waiting for ``audio_end``."""
+        if self._pending is not None or len(blocks) <= self.committed_blocks:
+            return
+        self._start(blocks, end_block=len(blocks), paused=False, final=True)
+
+    def poll(self) -> Optional[str]:
+        """Consume a finished background decode; return the new partial text."""
+        pending = self._pending
+        if pending is None or not pending.task.done():
+            return None
+        self._pending = None
+        if pending.task.cancelled():
+            return None
+        try:
+            text, _meta = pending.task.result()
+        except Exception as exc:
+            self.logger and self.logger.warn({"msg": "stt.partial.failed", "error": str(exc)})
+            return None
+        return self._apply(pending, clean_user_text(text))
+
+    async def finish(self, blocks: CaptureBuffer, *, last_speech_block: int, reuse_final: bool) -> Tuple[str, Dict[str, Any]]:
+        """Return the full utterance text, decoding only what is not covered yet."""
+        if self._pending is not None:
+            await asyncio.wait([self._pending.task])
+            self.poll()
+        meta: Dict[str, Any] = {
+            "incremental": True,
+            "decodes": self.decodes,
+            "committed_samples": self.committed_blocks * PROCESS_BLOCK_SIZE,
+        }
+        if reuse_final and self._final is not None:
+            end_block, text = self._final
+            if end_block > last_speech_block:
+                return join_text(self.committed_text, text), {**meta, "tail_samples": 0}
+        if last_speech_block < self.committed_blocks or self.committed_blocks >= len(blocks):
+            return self.committed_text, {**meta, "tail_samples": 0}
+
+        tail = self._segment(blocks, self.committed_blocks, len(blocks))
+        text, tail_meta = await self._transcribe(self._prepare(tail))
+        meta.update({k: v for k, v in dict(tail_meta or {}).items() if k in ("queue_wait_ms", "batch_size")})
+        meta["tail_samples"] = int(tail.size)
+        return join_text(self.committed_text, clean_user_text(text)), meta
+
+    def _start(self, blocks: CaptureBuffer, *, end_block: int, paused: bool, final: bool) -> None:
+        start_block = self.committed_blocks
+        pcm = self._prepare(self._segment(blocks, start_block, end_block))
+        task = asyncio.ensure_future(self._transcribe(pcm))
+        self._pending = _PendingDecode(task=task, start_block=start_block, end_block=end_block, paused=paused, final=final)
+        self._last_started_at = time.monotonic()
+        self.decodes += 1
+
+    def _apply(self, pending: _PendingDecode, text: str) -> Optional[str]:
+        if pending.start_block != self.committed_blocks:
+            return None
+        self.text_end_block = pending.end_block
+        if pending.final:
+            self._final = (pending.end_block, text)
+            self._tail_text = text
+        elif pending.paused and text:
+            self.committed_text = join_text(self.committed_text, text)
+            self.committed_blocks = pending.end_block
+            self._tail_text = ""
+        else:
+            self._tail_text = text
+        self.logger and self.logger.debug(
+            {
+                "msg": "stt.partial",
+                "committed_samples": self.committed_blocks * PROCESS_BLOCK_SIZE,
+                "window_samples": (pending.end_block - pending.start_block) * PROCESS_BLOCK_SIZE,
+                "text": self.text,
+            }
+        )
+        return self.text
+
+    @staticmethod
+    def _segment(blocks: CaptureBuffer, start: int, end: int) -> np.ndarray:
+        return blocks.float32(start, end)
+
+
+def join_text(head: str, tail: str) -> str:
+    if not head:
+        return tail
+    if not tail:
+        return head
+    if head[-1].isascii() and head[-1].isalnum() and tail[0].isascii() and tail[0].isalnum():
+        return f"{head} {tail}"
+    return head + tail
@@ -0,0 +1,358 @@
+from __future__ import annotations
+
+import itertools
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from multiprocessing import connection as mp_connection
+from multiprocessing import shared_memory
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .common import PROCESS_SAMPLE_RATE
+from .config import SttConfig
+from .log import Logger
+
+HEALTH_INTERVAL_S = 5.0
+HEALTH_TIMEOUT_S = 10.0
+MAX_RESPAWN_BACKOFF_S = 30.0
+
+
+def _worker_main(stt_cfg: SttConfig, shm_name: str, capacity: int, conn: Any, log_level: str) -> None:
+    """Worker process: load the engine once, then serve jobs from the pipe.
+
+    Jobs carry only a sample count; the PCM itself is read from the shared
+    memory slot the parent filled before sending the job.
+    """
+    from .stt_engines import create_stt
+
+    logger = Logger(log_level)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        pcm = np.ndarray((capacity,), dtype=np.float32, buffer=shm.buf)
+        stt = create_stt(stt_cfg, logger)
+        conn.send(("ready", multiprocessing.current_process().pid))
+        while True:
+            try:
+                msg = conn.recv()
+            except EOFError:
+                return
+            kind = msg[0]
+            if kind == "stop":
+                return
+            if kind == "ping":
+                conn.send(("pong", msg[1]))
+                continue
+            if kind != "job":
+                continue
+            _kind, req_id, n_samples, sample_rate = msg
+            try:
+                text, meta = stt.transcribe(pcm[:n_samples], sample_rate=sample_rate)
+                conn.send(("result", req_id, True, text, _plain_meta(meta)))
+            except Exception as exc:
+                conn.send(("result", req_id, False, f"{type(exc).__name__}: {exc}", {}))
+    finally:
+        del pcm
+        shm.close()
+
+
+def _plain_meta(meta: Any) -> Dict[str, Any]:
+    if not isinstance(meta, dict):
+        return {}
+    return {str(k): v for k, v in meta.items() if isinstance(v, (str, int, float, bool)) or v is None}
+
+
+@dataclass
+class _PoolRequest:
+    req_id: int
+    audio: np.ndarray
+    future: Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class _Worker:
+    index: int
+    shm: shared_memory.SharedMemory
+    process: Any = None
+    conn: Any = None
+    ready: bool = False
+    request: Optional[_PoolRequest] = None
+    started_at: float = 0.0
+    ping_sent_at: float = 0.0
+    last_seen_at: float = 0.0
+    restarts: int = 0
+    crash_streak: int = 0
+    respawn_at: float = 0.0
+
+
+class SttWorkerPool:
+    """Run the STT engine in ``workers`` processes, one model per process.
+
+    Exposes the same ``submit``/``transcribe`` surface as ``SttScheduler`` so
+    sessions can use either. Each worker owns a shared-memory slot sized for
+    ``max_samples`` float32 samples; a crashed, hung or unresponsive worker is
+    killed, its in-flight request failed and the process respawned.
+    """
+
+    def __init__(
+        self,
+        stt_cfg: SttConfig,
+        *,
+        workers: int,
+        max_samples: int,
+        request_timeout_s: float = 60.0,
+        sample_rate: int = PROCESS_SAMPLE_RATE,
+        log_level: str = "info",
+        logger: Logger | None = None,
+    ):
+        self.stt_cfg = stt_cfg
+        self.size = max(1, int(workers))
+        self.capacity = max(1, int(max_samples))
+        self.request_timeout_s = max(1.0, float(request_timeout_s))
+        self.sample_rate = sample_rate
+        self.log_level = log_level
+        self.logger = logger
+        self._ctx = multiprocessing.get_context("spawn")
+        self._workers: List[_Worker] = []
+        self._pending: Deque[_PoolRequest] = deque()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._wake_r, self._wake_w = self._ctx.Pipe(duplex=False)
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._completed = 0
+        self._failures = 0
+        self._truncated = 0
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        for index in range(self.size):
+            shm = shared_memory.SharedMemory(create=True, size=self.capacity * 4)
+            worker = _Worker(index=index, shm=shm)
+            self._workers.append(worker)
+            self._spawn(worker)
+        self._thread = threading.Thread(target=self._dispatch_loop, name="stt-pool", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        if self._thread is None:
+            return
+        self._stopping = True
+        self._wake()
+        self._thread.join(timeout=5)
+        self._thread = None
+        for worker in self._workers:
+            self._stop_worker(worker, graceful=True)
+            worker.shm.close()
+            worker.shm.unlink()
+        with self._lock:
+            pending = list(self._pending)
+            self._pending.clear()
+        for req in pending:
+            if not req.future.done():
+                req.future.set_exception(RuntimeError("stt pool closed"))
+
+    def submit(self, audio: np.ndarray) -> "Future[Tuple[str, Dict[str, Any]]]":
+        self.start()
+        future: Future = Future()
+        req = _PoolRequest(req_id=next(self._ids), audio=audio, future=future)
+        with self._lock:
+            self._pending.append(req)
+        self._wake()
+        return future
+
+    def transcribe(self, audio: np.ndarray, *, sample_rate: int) -> Tuple[str, Dict[str, Any]]:
+        if sample_rate != self.sample_rate:
+            raise ValueError(f"stt pool expects {self.sample_rate} Hz audio, got {sample_rate}")
+        return self.submit(audio).result()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            queue_depth = len(self._pending)
+        return {
+            "workers": self.size,
+            "ready": sum(1 for w in self._workers if w.ready),
+            "busy": sum(1 for w in self._workers if w.request is not None),
+            "queue_depth": queue_depth,
+            "completed": self._completed,
+            "failures": self._failures,
+            "restarts": sum(w.restarts for w in self._workers),
+            "truncated": self._truncated,
+        }
+
+    def _wake(self) -> None:
+        with self._lock:
+            self._wake_w.send(None)
+
+    def _spawn(self, worker: _Worker) -> None:
+        parent_conn, child_conn = self._ctx.Pipe(duplex=True)
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(self.stt_cfg, worker.shm.name, self.capacity, child_conn, self.log_level),
+            name=f"stt-worker-{worker.index}",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        worker.process = process
+        worker.conn = parent_conn
+        worker.ready = False
+        worker.request = None
+        worker.ping_sent_at = 0.0
+        worker.last_seen_at = time.monotonic()
+        self.logger and self.logger.info({"msg": "stt.pool.worker.spawn", "worker": worker.index, "pid": process.pid})
+
+    def _stop_worker(self, worker: _Worker, *, graceful: bool) -> None:
+        process = worker.process
+        if process is None:
+            return
+        if graceful and process.is_alive():
+            try:
+                worker.conn.send(("stop",))
+            except Exception:
+                pass
+            process.join(timeout=2)
+        if process.is_alive():
+            process.kill()
+            process.join(timeout=2)
+        try:
+            worker.conn.close()
+        except Exception:
+            pass
+        worker.process = None
+        worker.conn = None
+        worker.ready = False
+
+    def _dispatch_loop(self) -> None:
+        while not self._stopping:
+            self._assign()
+            waitables: List[Any] = [self._wake_r]
+            for worker in self._workers:
+                if worker.process is not None:
+                    waitables.extend([worker.conn, worker.process.sentinel])
+            ready = mp_connection.wait(waitables, timeout=1.0)
+            if self._wake_r in ready:
+                while self._wake_r.poll():
+                    self._wake_r.recv()
+            for worker in self._workers:
+                if worker.process is None:
+                    continue
+                if worker.conn in ready:
+                    self._drain(worker)
+                if worker.process is not None and worker.process.sentinel in ready and not worker.process.is_alive():
+                    self._restart(worker, reason=f"exit_code_{worker.process.exitcode}")
+            self._health_check()
+
+    def _assign(self) -> None:
+        for worker in self._workers:
+            if not worker.ready or worker.request is not None:
+                continue
+            with self._lock:
+                if not self._pending:
+                    return
+                req = self._pending.popleft()
+            if not req.future.set_running_or_notify_cancel():
+                continue
+            audio = np.asarray(req.audio, dtype=np.float32).reshape(-1)
+            if audio.size > self.capacity:
+                self._truncated += 1
+                self.logger and self.logger.warn({"msg": "stt.pool.truncated", "samples": int(audio.size), "capacity": self.capacity})
+                audio = audio[: self.capacity]
+            slot = np.ndarray((self.capacity,), dtype=np.float32, buffer=worker.shm.buf)
+            slot[: audio.size] = audio
+            del slot
+            worker.request = req
+            worker.started_at = time.monotonic()
+            try:
+                worker.conn.send(("job", req.req_id, int(audio.size), self.sample_rate))
+            except Exception as exc:
+                self._restart(worker, reason=f"send_failed: {exc}")
+
+    def _drain(self, worker: _Worker) -> None:
+        while worker.conn is not None and worker.conn.poll():
+            try:
+                msg = worker.conn.recv()
+            except (EOFError, OSError):
+                return
+            worker.last_seen_at = time.monotonic()
+            kind = msg[0]
+            if kind == "ready":
+                worker.ready = True
+                worker.crash_streak = 0
+                self.logger and self.logger.info({"msg": "stt.pool.worker.ready", "worker": worker.index, "pid": msg[1]})
+            elif kind == "pong":
+                worker.ping_sent_at = 0.0
+            elif kind == "result":
+                _kind, req_id, ok, payload, meta = msg
+                req = worker.request
+                worker.request = None
+                if req is None or req.req_id != req_id:
+                    continue
+                now = time.monotonic()
+                if ok:
+                    self._completed += 1
+                    req.future.set_result(
+                        (
+                            payload,
+                            {
+                                **meta,
+                                "worker": worker.index,
+                                "queue_wait_ms": int((worker.started_at - req.enqueued_at) * 1000),
+                                "decode_ms": int((now - worker.started_at) * 1000),
+                            },
+                        )
+                    )
+                else:
+                    self._failures += 1
+                    req.future.set_exception(RuntimeError(f"stt worker failed: {payload}"))
+
+    def _health_check(self) -> None:
+        now = time.monotonic()
+        for worker in self._workers:
+            if worker.process is None:
+                if worker.respawn_at and now >= worker.respawn_at:
+                    worker.respawn_at = 0.0
+                    self._spawn(worker)
+                continue
+            if worker.request is not None:
+                if now - worker.started_at > self.request_timeout_s:
+                    self._restart(worker, reason="request_timeout")
+                continue
+            if not worker.ready:
+                continue
+            if worker.ping_sent_at:
+                if now - worker.ping_sent_at > HEALTH_TIMEOUT_S:
+                    self._restart(worker, reason="health_timeout")
+            elif now - worker.last_seen_at > HEALTH_INTERVAL_S:
+                worker.ping_sent_at = now
+                try:
+                    worker.conn.send(("ping", now))
+                except Exception as exc:
+                    self._restart(worker, reason=f"ping_failed: {exc}")
+
+    def _restart(self, worker: _Worker, *, reason: str) -> None:
+        req = worker.request
+        worker.request = None
+        was_ready = worker.ready
+        self._stop_worker(worker, graceful=False)
+        worker.restarts += 1
+        worker.crash_streak = 0 if was_ready else worker.crash_streak + 1
+        if req is not None and not req.future.done():
+            self._failures += 1
+            req.future.set_exception(RuntimeError(f"stt worker {worker.index} restarted: {reason}"))
+        backoff = min(MAX_RESPAWN_BACKOFF_S, 0.5 * (2 ** worker.crash_streak)) if worker.crash_streak else 0.0
+        self.logger and self.logger.warn(
+            {"msg": "stt.pool.worker.restart", "worker": worker.index, "reason": reason, "restarts": worker.restarts, "backoff_s": backoff}
+        )
+        if self._stopping:
+            return
+        if backoff:
+            worker.respawn_at = time.monotonic() + backoff
+        else:
+            self._spawn(worker)
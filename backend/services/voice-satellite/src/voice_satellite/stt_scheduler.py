@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .common import PROCESS_SAMPLE_RATE
+from .log import Logger
+
+DEFAULT_BATCH_WINDOW_MS = 30
+DEFAULT_MAX_BATCH_SIZE = 4
+WAIT_HISTORY_SIZE = 256
+
+
+@dataclass
+class _SttRequest:
+    audio: np.ndarray
+    future: Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class SttScheduler:
+    """Single STT worker thread that decodes queued utterances in batches.
+
+    Requests arriving within ``batch_window_ms`` of the first pending one are
+    decoded together through ``stt.transcribe_batch`` when the engine offers
+    it, otherwise one after another on the same thread.
+    """
+
+    def __init__(
+        self,
+        stt: Any,
+        *,
+        sample_rate: int = PROCESS_SAMPLE_RATE,
+        batch_window_ms: int = DEFAULT_BATCH_WINDOW_MS,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        logger: Logger | None = None,
+    ):
+        self.stt = stt
+        self.sample_rate = sample_rate
+        self.batch_window_s = max(0, int(batch_window_ms)) / 1000.0
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.logger = logger
+        self._queue: "queue.Queue[Optional[_SttRequest]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._stats_lock = threading.Lock()
+        self._waits_ms: deque[float] = deque(maxlen=WAIT_HISTORY_SIZE)
+        self._requests = 0
+        self._batches = 0
+        self._batched_items = 0
+        self._failures = 0
+        self._max_queue_depth = 0
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._worker, name="stt-scheduler", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+        self._thread = None
+
+    def submit(self, audio: np.ndarray) -> "Future[Tuple[str, Dict[str, Any]]]":
+        self.start()
+        future: Future = Future()
+        self._queue.put(_SttRequest(audio=audio, future=future))
+        depth = self._queue.qsize()
+        with self._stats_lock:
+            self._requests += 1
+            self._max_queue_depth = max(self._max_queue_depth, depth)
+        return future
+
+    def transcribe(self, audio: np.ndarray, *, sample_rate: int) -> Tuple[str, Dict[str, Any]]:
+        if sample_rate != self.sample_rate:
+            raise ValueError(f"scheduler expects {self.sample_rate} Hz audio, got {sample_rate}")
+        return self.submit(audio).result()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            waits = sorted(self._waits_ms)
+            return {
+                "queue_depth": self._queue.qsize(),
+                "max_queue_depth": self._max_queue_depth,
+                "requests": self._requests,
+                "batches": self._batches,
+                "avg_batch_size": (self._batched_items / self._batches) if self._batches else 0.0,
+                "failures": self._failures,
+                "wait_ms_p50": _percentile(waits, 0.50),
+                "wait_ms_p95": _percentile(waits, 0.95),
+            }
+
+    def _worker(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            stopping = False
+            deadline = first.enqueued_at + self.batch_window_s
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._run_batch(batch)
+            if stopping:
+                return
+
+    def _run_batch(self, batch: List[_SttRequest]) -> None:
+        started_at = time.monotonic()
+        waits = [(started_at - req.enqueued_at) * 1000 for req in batch]
+        live = [req for req in batch if req.future.set_running_or_notify_cancel()]
+        if not live:
+            return
+        try:
+            results = self._decode([req.audio for req in live])
+        except Exception as exc:
+            if len(live) == 1:
+                self._fail(live[0], exc)
+                return
+            # One bad clip must not fail its neighbours: retry them one by one.
+            self.logger and self.logger.warn({"msg": "stt.batch.failed", "size": len(live), "error": str(exc)})
+            results = []
+            for req in live:
+                try:
+                    results.append(self._decode([req.audio])[0])
+                except Exception as item_exc:
+                    results.append(item_exc)
+
+        decode_ms = int((time.monotonic() - started_at) * 1000)
+        with self._stats_lock:
+            self._batches += 1
+            self._batched_items += len(live)
+            self._waits_ms.extend(waits)
+        self.logger and self.logger.debug(
+            {
+                "msg": "stt.batch",
+                "size": len(live),
+                "queue_depth": self._queue.qsize(),
+                "wait_ms_max": int(max(waits)),
+                "decode_ms": decode_ms,
+            }
+        )
+        for req, wait_ms, result in zip(live, waits, results):
+            if isinstance(result, Exception):
+                self._fail(req, result)
+                continue
+            text, meta = result
+            meta = dict(meta or {})
+            meta.update({"queue_wait_ms": int(wait_ms), "batch_size": len(live), "decode_ms": decode_ms})
+            req.future.set_result((text, meta))
+
+    def _decode(self, audios: List[np.ndarray]) -> List[Tuple[str, Dict[str, Any]]]:
+        batch_fn = getattr(self.stt, "transcribe_batch", None)
+        if callable(batch_fn) and len(audios) > 1:
+            return list(batch_fn(audios, sample_rate=self.sample_rate))
+        return [self.stt.transcribe(a, sample_rate=self.sample_rate) for a in audios]
+
+    def _fail(self, req: _SttRequest, exc: Exception) -> None:
+        with self._stats_lock:
+            self._failures += 1
+        req.future.set_exception(exc)
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return float(sorted_values[idx])
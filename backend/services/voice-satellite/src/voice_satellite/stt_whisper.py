@@ -2,12 +2,16 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, List, Tuple
 
 import numpy as np
 
 from .log import Logger
 
+INITIAL_PROMPT = "以下是中文智能家居语音指令转写。"
+# whisper decodes fixed 30 s windows; longer clips must go through transcribe().
+WHISPER_WINDOW_SAMPLES = 16000 * 30
+
 
 @dataclass
 class WhisperStt:
@@ -59,7 +63,41 @@ class WhisperStt:
             verbose=False,
             temperature=0.0,
             condition_on_previous_text=False,
-            initial_prompt="以下是中文智能家居语音指令转写。",
+            initial_prompt=INITIAL_PROMPT,
         )
         text = str(result.get("text") or "").strip()
         return text, result
+
+    def transcribe_batch(self, audios: List[np.ndarray], *, sample_rate: int) -> List[Tuple[str, Dict[str, Any]]]:
+        """Decode several utterances in one padded forward pass.
+
+        Each clip is padded to whisper's 30 s window and the log-mel batch is
+        decoded together. Clips that do not fit the window fall back to
+        ``transcribe`` one by one.
+        """
+        clips = [a.astype(np.float32, copy=False).reshape(-1) for a in audios]
+        out: List[Tuple[str, Dict[str, Any]] | None] = [None] * len(clips)
+        batch_idx = [i for i, a in enumerate(clips) if a.size <= WHISPER_WINDOW_SAMPLES]
+        for i, a in enumerate(clips):
+            if a.size > WHISPER_WINDOW_SAMPLES:
+                out[i] = self.transcribe(a, sample_rate=sample_rate)
+        if batch_idx:
+            whisper = self._whisper
+            n_mels = self._model.dims.n_mels
+            mels = [whisper.log_mel_spectrogram(whisper.pad_or_trim(clips[i]), n_mels=n_mels) for i in batch_idx]
+            import torch
+
+            batch = torch.stack(mels).to(self._model.device)
+            options = whisper.DecodingOptions(
+                task="transcribe",
+                language=self.language or None,
+                temperature=0.0,
+                prompt=INITIAL_PROMPT,
+                without_timestamps=True,
+                fp16=self.device != "cpu",
+            )
+            results = whisper.decode(self._model, batch, options)
+            for i, res in zip(batch_idx, results):
+                meta = {"language": res.language, "avg_logprob": float(res.avg_logprob), "no_speech_prob": float(res.no_speech_prob)}
+                out[i] = (str(res.text or "").strip(), meta)
+        return [item for item in out if item is not None]
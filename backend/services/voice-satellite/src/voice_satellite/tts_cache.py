@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from .common import PROCESS_SAMPLE_RATE
+from .log import Logger
+
+
+class TtsCache:
+    """Content-addressed cache of normalized 16 kHz mono pcm_s16le replies.
+
+    Entries are keyed by sha256 over (text, voice model, speaker, sample
+    rate). The in-memory layer is an LRU bounded by ``max_bytes``; when
+    ``disk_dir`` is set every entry is also written there as raw PCM, so fixed
+    phrases survive restarts and repopulate memory on first use.
+    """
+
+    def __init__(
+        self,
+        *,
+        model_path: str,
+        speaker: Optional[int],
+        max_bytes: int,
+        disk_dir: str = "",
+        sample_rate: int = PROCESS_SAMPLE_RATE,
+        logger: Logger | None = None,
+    ):
+        self.voice = _voice_identity(model_path)
+        self.speaker = speaker
+        self.sample_rate = sample_rate
+        self.max_bytes = max(0, int(max_bytes))
+        self.disk_dir = disk_dir
+        self.logger = logger
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def key(self, text: str) -> str:
+        raw = "\x1f".join([text.strip(), self.voice, str(self.speaker), str(self.sample_rate)])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, text: str) -> Optional[bytes]:
+        pcm = self.get_memory(text)
+        return pcm if pcm is not None else self.load_disk(text)
+
+    def get_memory(self, text: str) -> Optional[bytes]:
+        """Memory lookup only; a miss is not counted until ``load_disk``."""
+        key = self.key(text)
+        with self._lock:
+            pcm = self._entries.get(key)
+            if pcm is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return pcm
+
+    def load_disk(self, text: str) -> Optional[bytes]:
+        """Read the disk copy into memory, counting a miss when there is none; blocking file I/O."""
+        key = self.key(text)
+        pcm = self._read_disk(key)
+        with self._lock:
+            if pcm is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._remember(key, pcm)
+        return pcm
+
+    def put(self, text: str, pcm: bytes) -> None:
+        self.remember(text, pcm)
+        self.persist(text, pcm)
+
+    def remember(self, text: str, pcm: bytes) -> None:
+        """Store in memory only; cheap enough for the event loop."""
+        if not pcm:
+            return
+        key = self.key(text)
+        with self._lock:
+            self._remember(key, pcm)
+
+    def persist(self, text: str, pcm: bytes) -> None:
+        """Write the disk copy (no-op without ``disk_dir``); blocking file I/O."""
+        if pcm:
+            self._write_disk(self.key(text), pcm)
+
+    def prewarm(self, phrases: Iterable[str], synthesize: Callable[[str], bytes]) -> int:
+        """Synthesize and store every phrase that is not cached yet; returns how many."""
+        added = 0
+        for text in phrases:
+            if not text.strip() or self.get(text) is not None:
+                continue
+            try:
+                self.put(text, synthesize(text))
+                added += 1
+            except Exception as exc:
+                self.logger and self.logger.warn({"msg": "tts.cache.prewarm_failed", "text": text, "error": str(exc)})
+        self.logger and self.logger.info({"msg": "tts.cache.prewarmed", "added": added, **self.stats()})
+        return added
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _remember(self, key: str, pcm: bytes) -> None:
+        if len(pcm) > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= len(old)
+        self._entries[key] = pcm
+        self._bytes += len(pcm)
+        while self._bytes > self.max_bytes and self._entries:
+            _key, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self.evictions += 1
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key[:2], f"{key}.pcm")
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key), "rb") as fh:
+                return fh.read() or None
+        except FileNotFoundError:
+            return None
+        except OSError as exc:
+            self.logger and self.logger.warn({"msg": "tts.cache.read_failed", "key": key, "error": str(exc)})
+            return None
+
+    def _write_disk(self, key: str, pcm: bytes) -> None:
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        if os.path.exists(path):
+            return
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp, "wb") as fh:
+                fh.write(pcm)
+            os.replace(tmp, path)
+        except OSError as exc:
+            self.logger and self.logger.warn({"msg": "tts.cache.write_failed", "key": key, "error": str(exc)})
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+
+def _voice_identity(model_path: str) -> str:
+    # Include size and mtime so swapping the .onnx in place invalidates old audio.
+    try:
+        st = os.stat(model_path)
+        return f"{os.path.abspath(model_path)}:{st.st_size}:{int(st.st_mtime)}"
+    except OSError:
+        return model_path
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
+import json
 import os
 import subprocess
 import tempfile
 import wave
-from dataclasses import dataclass
-from typing import Any, Optional
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Optional
 
 import numpy as np
 
@@ -17,6 +18,9 @@ except ImportError:  # pragma: no cover - exercised only in environments without
 from .audio_types import SynthesizedAudio
 from .log import Logger
 
+DEFAULT_PIPER_SAMPLE_RATE = 22050
+STREAM_READ_BYTES = 4096
+
 
 @dataclass
 class PiperTts:
@@ -27,6 +31,8 @@ class PiperTts:
     output_device: Optional[Any]
     output_backend: str = "sounddevice"
     logger: Logger | None = None
+    pool: Any = None  # PiperWorkerPool: reuse long-lived piper processes instead of one per reply
+    _stream_sample_rate: Optional[int] = field(default=None, init=False, repr=False)
 
     def say(self, text: str) -> None:
         t = (text or "").strip()
@@ -39,11 +45,72 @@ class PiperTts:
         t = (text or "").strip()
         if not t:
             return SynthesizedAudio(sample_rate=16000, channels=1, sample_width=2, pcm_s16le=b"")
+        if self.pool is not None:
+            return self.pool.synthesize(t)
         with tempfile.TemporaryDirectory(prefix="voice_satellite_") as td:
             wav_path = os.path.join(td, "tts.wav")
             self._synthesize(t, wav_path)
             return self._read_wav(wav_path)
 
+    def synthesize_stream(self, text: str) -> Iterator[bytes]:
+        """Yield mono pcm_s16le at ``stream_sample_rate()`` as piper produces it.
+
+        Uses ``--output-raw`` so audio is read from piper's stdout instead of a
+        temp WAV that only exists once the whole reply is synthesized.
+        """
+        t = (text or "").strip()
+        if not t:
+            return
+        if self.pool is not None:
+            # piper --json-input writes whole utterances; a warm worker still
+            # beats spawning piper and reloading the voice for every reply.
+            audio = self.pool.synthesize(t)
+            if audio.pcm_s16le:
+                yield audio.pcm_s16le
+            return
+        cmd = [self.piper_bin, "--model", self.model_path, "--config", self.config_path, "--output-raw"]
+        if self.speaker is not None:
+            cmd += ["--speaker", str(self.speaker)]
+        self.logger and self.logger.debug({"msg": "piper.exec", "cmd": cmd})
+        p = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        try:
+            p.stdin.write((t + "\n").encode("utf-8"))
+            p.stdin.close()
+            carry = b""
+            while True:
+                data = p.stdout.read1(STREAM_READ_BYTES)
+                if not data:
+                    break
+                if carry:
+                    data = carry + data
+                cut = len(data) - (len(data) % 2)
+                carry = data[cut:]
+                if cut:
+                    yield data[:cut]
+            stderr = p.stderr.read()
+            rc = p.wait()
+            if rc != 0:
+                raise RuntimeError(f"piper_failed rc={rc}: {(stderr or b'')[:300].decode('utf-8', 'ignore')}")
+        finally:
+            if p.poll() is None:
+                p.kill()
+                p.wait()
+            p.stdout.close()
+            p.stderr.close()
+
+    def stream_sample_rate(self) -> int:
+        """Sample rate of ``synthesize_stream`` output, from the voice config."""
+        rate = self._stream_sample_rate
+        if rate is None:
+            rate = DEFAULT_PIPER_SAMPLE_RATE
+            try:
+                with open(self.config_path, "r", encoding="utf-8") as fh:
+                    rate = int((json.load(fh).get("audio") or {}).get("sample_rate") or rate)
+            except (OSError, ValueError) as exc:
+                self.logger and self.logger.warn({"msg": "piper.config.unreadable", "path": self.config_path, "error": str(exc)})
+            self._stream_sample_rate = rate
+        return rate
+
     def play(self, audio: SynthesizedAudio) -> None:
         if not audio.pcm_s16le:
             return
@@ -72,13 +139,7 @@ class PiperTts:
             raise RuntimeError(f"piper_failed rc={p.returncode}: {(p.stderr or b'')[:300].decode('utf-8', 'ignore')}")
 
     def _read_wav(self, wav_path: str) -> SynthesizedAudio:
-        with wave.open(wav_path, "rb") as wf:
-            channels = wf.getnchannels()
-            sr = wf.getframerate()
-            sampwidth = wf.getsampwidth()
-            frames = wf.getnframes()
-            raw = wf.readframes(frames)
-        return SynthesizedAudio(sample_rate=sr, channels=channels, sample_width=sampwidth, pcm_s16le=raw)
+        return read_wav(wav_path)
 
     def _play_pcm_pulse(self, audio: SynthesizedAudio) -> None:
         if audio.sample_width != 2:
@@ -101,6 +162,16 @@ class PiperTts:
             raise RuntimeError(f"ffplay_failed rc={p.returncode}: {err}")
 
 
+def read_wav(wav_path: str) -> SynthesizedAudio:
+    with wave.open(wav_path, "rb") as wf:
+        channels = wf.getnchannels()
+        sr = wf.getframerate()
+        sampwidth = wf.getsampwidth()
+        frames = wf.getnframes()
+        raw = wf.readframes(frames)
+    return SynthesizedAudio(sample_rate=sr, channels=channels, sample_width=sampwidth, pcm_s16le=raw)
+
+
 def _resolve_output_device(selector: Any) -> Optional[int]:
     if selector is None:
         return None
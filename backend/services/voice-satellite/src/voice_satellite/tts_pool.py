@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import contextlib
+import itertools
+import json
+import os
+import queue
+import select
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+
+from .audio_types import SynthesizedAudio
+from .config import TtsConfig
+from .log import Logger
+from .tts_piper import read_wav
+
+MAX_RESPAWN_BACKOFF_S = 30.0
+STDERR_TAIL_LINES = 20
+
+
+@dataclass
+class _TtsRequest:
+    req_id: int
+    text: str
+    future: Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class _PiperWorker:
+    index: int
+    workdir: str
+    process: Optional[subprocess.Popen] = None
+    stdout_buf: bytearray = field(default_factory=bytearray)
+    stderr_tail: Deque[str] = field(default_factory=lambda: deque(maxlen=STDERR_TAIL_LINES))
+    busy: bool = False
+    spawns: int = 0
+    restarts: int = 0
+    crash_streak: int = 0
+
+
+class PiperWorkerPool:
+    """Keep ``workers`` piper processes running with the voice model loaded.
+
+    Each worker runs ``piper --json-input``; a request writes one JSON line
+    naming a per-request ``output_file`` and is complete when piper echoes that
+    path on stdout. A worker that exits, times out or breaks the protocol is
+    killed and respawned (with backoff while it keeps crashing); only its
+    in-flight request fails.
+    """
+
+    def __init__(
+        self,
+        tts_cfg: TtsConfig,
+        *,
+        workers: int,
+        request_timeout_s: float = 30.0,
+        logger: Logger | None = None,
+    ):
+        self.tts_cfg = tts_cfg
+        self.size = max(1, int(workers))
+        self.request_timeout_s = max(1.0, float(request_timeout_s))
+        self.logger = logger
+        self._queue: "queue.Queue[Optional[_TtsRequest]]" = queue.Queue()
+        self._ids = itertools.count(1)
+        self._workers: List[_PiperWorker] = []
+        self._threads: List[threading.Thread] = []
+        self._stopping = False
+        self._stats_lock = threading.Lock()
+        self._completed = 0
+        self._failures = 0
+        self._max_queue_depth = 0
+        self._queue_wait_ms_total = 0
+        self._synth_ms_total = 0
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stopping = False
+        for index in range(self.size):
+            worker = _PiperWorker(index=index, workdir=tempfile.mkdtemp(prefix=f"voice_satellite_tts{index}_"))
+            self._workers.append(worker)
+            self._spawn(worker)
+            thread = threading.Thread(target=self._worker_loop, args=(worker,), name=f"tts-worker-{index}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def close(self) -> None:
+        if not self._threads:
+            return
+        self._stopping = True
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads = []
+        for worker in self._workers:
+            self._stop_worker(worker, graceful=True)
+            shutil.rmtree(worker.workdir, ignore_errors=True)
+        self._workers = []
+        while True:
+            try:
+                req = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if req is not None and req.future.set_running_or_notify_cancel():
+                req.future.set_exception(RuntimeError("tts pool closed"))
+
+    def submit(self, text: str) -> "Future[SynthesizedAudio]":
+        self.start()
+        future: Future = Future()
+        self._queue.put(_TtsRequest(req_id=next(self._ids), text=text, future=future))
+        depth = self._queue.qsize()
+        with self._stats_lock:
+            self._max_queue_depth = max(self._max_queue_depth, depth)
+        return future
+
+    def synthesize(self, text: str) -> SynthesizedAudio:
+        return self.submit(text).result()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            completed = self._completed
+            return {
+                "workers": self.size,
+                "alive": sum(1 for w in self._workers if w.process is not None and w.process.poll() is None),
+                "busy": sum(1 for w in self._workers if w.busy),
+                "queue_depth": self._queue.qsize(),
+                "max_queue_depth": self._max_queue_depth,
+                "completed": completed,
+                "failures": self._failures,
+                "spawns": sum(w.spawns for w in self._workers),
+                "restarts": sum(w.restarts for w in self._workers),
+                "avg_queue_wait_ms": int(self._queue_wait_ms_total / completed) if completed else 0,
+                "avg_synth_ms": int(self._synth_ms_total / completed) if completed else 0,
+            }
+
+    def _worker_loop(self, worker: _PiperWorker) -> None:
+        while not self._stopping:
+            req = self._queue.get()
+            if req is None:
+                return
+            if not req.future.set_running_or_notify_cancel():
+                continue
+            if worker.process is None or worker.process.poll() is not None:
+                self._restart(worker, reason="not_running")
+                self._respawn(worker)
+            worker.busy = True
+            started_at = time.monotonic()
+            try:
+                audio = self._synthesize_on(worker, req)
+            except Exception as exc:
+                with self._stats_lock:
+                    self._failures += 1
+                self._restart(worker, reason=str(exc))
+                req.future.set_exception(RuntimeError(f"tts worker {worker.index} failed: {exc}"))
+                self._respawn(worker)
+                continue
+            finally:
+                worker.busy = False
+            worker.crash_streak = 0
+            queue_wait_ms = int((started_at - req.enqueued_at) * 1000)
+            synth_ms = int((time.monotonic() - started_at) * 1000)
+            with self._stats_lock:
+                self._completed += 1
+                self._queue_wait_ms_total += queue_wait_ms
+                self._synth_ms_total += synth_ms
+            self.logger and self.logger.debug(
+                {"msg": "tts.pool.done", "worker": worker.index, "queue_wait_ms": queue_wait_ms, "synth_ms": synth_ms, "chars": len(req.text)}
+            )
+            req.future.set_result(audio)
+
+    def _synthesize_on(self, worker: _PiperWorker, req: _TtsRequest) -> SynthesizedAudio:
+        process = worker.process
+        if process is None or process.stdin is None:
+            raise RuntimeError("piper not running")
+        wav_path = os.path.join(worker.workdir, f"{req.req_id}.wav")
+        line: Dict[str, Any] = {"text": req.text, "output_file": wav_path}
+        if self.tts_cfg.speaker is not None:
+            line["speaker_id"] = int(self.tts_cfg.speaker)
+        process.stdin.write((json.dumps(line, ensure_ascii=False) + "\n").encode("utf-8"))
+        process.stdin.flush()
+        deadline = time.monotonic() + self.request_timeout_s
+        while True:
+            echoed = self._read_line(worker, deadline)
+            if echoed == wav_path:
+                break
+        try:
+            return read_wav(wav_path)
+        finally:
+            with contextlib.suppress(OSError):
+                os.unlink(wav_path)
+
+    def _read_line(self, worker: _PiperWorker, deadline: float) -> str:
+        process = worker.process
+        assert process is not None and process.stdout is not None
+        fd = process.stdout.fileno()
+        while b"\n" not in worker.stdout_buf:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise RuntimeError("request_timeout")
+            readable, _w, _x = select.select([fd], [], [], remaining)
+            if not readable:
+                continue
+            data = os.read(fd, 4096)
+            if not data:
+                tail = " | ".join(worker.stderr_tail)
+                raise RuntimeError(f"piper exited rc={process.poll()}: {tail[-300:]}")
+            worker.stdout_buf.extend(data)
+        raw, _sep, rest = bytes(worker.stdout_buf).partition(b"\n")
+        worker.stdout_buf[:] = rest
+        return raw.decode("utf-8", "ignore").strip()
+
+    def _spawn(self, worker: _PiperWorker) -> None:
+        cmd = [self.tts_cfg.piper_bin, "--model", self.tts_cfg.model_path, "--config", self.tts_cfg.config_path, "--json-input"]
+        process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        worker.process = process
+        worker.stdout_buf.clear()
+        worker.stderr_tail.clear()
+        worker.spawns += 1
+        threading.Thread(target=self._drain_stderr, args=(worker, process), name=f"tts-worker-{worker.index}-stderr", daemon=True).start()
+        self.logger and self.logger.info({"msg": "tts.pool.worker.spawn", "worker": worker.index, "pid": process.pid})
+
+    def _drain_stderr(self, worker: _PiperWorker, process: subprocess.Popen) -> None:
+        assert process.stderr is not None
+        for raw in process.stderr:
+            if worker.process is process:
+                worker.stderr_tail.append(raw.decode("utf-8", "ignore").rstrip())
+
+    def _stop_worker(self, worker: _PiperWorker, *, graceful: bool) -> None:
+        process = worker.process
+        if process is None:
+            return
+        worker.process = None
+        if graceful:
+            # piper exits on stdin EOF once the current line is done.
+            with contextlib.suppress(OSError):
+                process.stdin.close()
+            with contextlib.suppress(subprocess.TimeoutExpired):
+                process.wait(timeout=2)
+        if process.poll() is None:
+            process.kill()
+            process.wait(timeout=2)
+        for pipe in (process.stdin, process.stdout):
+            with contextlib.suppress(OSError):
+                pipe.close()
+
+    def _restart(self, worker: _PiperWorker, *, reason: str) -> None:
+        """Kill the worker's piper process; ``_respawn`` starts the next one."""
+        self._stop_worker(worker, graceful=False)
+        worker.restarts += 1
+        worker.crash_streak += 1
+        self.logger and self.logger.warn({"msg": "tts.pool.worker.restart", "worker": worker.index, "reason": reason, "restarts": worker.restarts})
+
+    def _respawn(self, worker: _PiperWorker) -> None:
+        if self._stopping:
+            return
+        # Back off while a worker keeps crashing (e.g. a broken voice file).
+        if worker.crash_streak > 1:
+            time.sleep(min(MAX_RESPAWN_BACKOFF_S, 0.5 * (2 ** (worker.crash_streak - 2))))
+        self._spawn(worker)
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+
+import numpy as np
+
+from .common import PROCESS_BLOCK_SIZE, PROCESS_SAMPLE_RATE
+from .log import Logger
+from .vad_silero import SILERO_CONTEXT_SAMPLES, SILERO_STATE_SHAPE, load_silero_onnx_session
+
+
+@dataclass
+class _VadJob:
+    stream: "VadStream"
+    block: np.ndarray
+    future: Future
+
+
+@dataclass(eq=False)
+class VadStream:
+    """Per-session handle on a ``SharedVadEngine``: owns the recurrent state."""
+
+    engine: "SharedVadEngine"
+    state: np.ndarray = field(default_factory=lambda: np.zeros(SILERO_STATE_SHAPE, dtype=np.float32))
+    context: np.ndarray = field(default_factory=lambda: np.zeros(SILERO_CONTEXT_SAMPLES, dtype=np.float32))
+    closed: bool = False
+
+    def probability(self, chunk_i16: np.ndarray) -> float:
+        return self.engine.submit(self, chunk_i16).result()
+
+    async def probability_async(self, chunk_i16: np.ndarray) -> float:
+        return await asyncio.wrap_future(self.engine.submit(self, chunk_i16))
+
+    def reset(self) -> None:
+        self.state[...] = 0.0
+        self.context[...] = 0.0
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class SharedVadEngine:
+    """One Silero ONNX model shared by every satellite session.
+
+    Sessions submit 512-sample blocks through their ``VadStream``. A worker
+    thread waits ``tick_ms`` after the first pending block, then evaluates one
+    block per active stream in a single batched ``session.run`` call, so VAD
+    never runs on the asyncio event loop.
+    """
+
+    def __init__(
+        self,
+        *,
+        session: Any = None,
+        model_path: str = "",
+        sample_rate: int = PROCESS_SAMPLE_RATE,
+        tick_ms: int = 4,
+        logger: Logger | None = None,
+    ):
+        if session is None:
+            session = load_silero_onnx_session(model_path)
+        self._session = session
+        self.sample_rate = sample_rate
+        self.tick_s = max(0, int(tick_ms)) / 1000.0
+        self.logger = logger
+        self._sr = np.array(sample_rate, dtype=np.int64)
+        self._jobs: Deque[_VadJob] = deque()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._streams = 0
+        self._runs = 0
+        self._blocks = 0
+        self._max_batch = 0
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._worker, name="vad-engine", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        if self._thread is None:
+            return
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self._thread.join(timeout=2)
+        self._thread = None
+
+    def open_stream(self) -> VadStream:
+        self.start()
+        self._streams += 1
+        return VadStream(engine=self)
+
+    def submit(self, stream: VadStream, chunk_i16: np.ndarray) -> "Future[float]":
+        future: Future = Future()
+        if stream.closed:
+            future.set_exception(RuntimeError("vad stream closed"))
+            return future
+        if chunk_i16.size != PROCESS_BLOCK_SIZE:
+            future.set_exception(ValueError(f"vad expects {PROCESS_BLOCK_SIZE}-sample blocks, got {chunk_i16.size}"))
+            return future
+        with self._cond:
+            self._jobs.append(_VadJob(stream=stream, block=chunk_i16, future=future))
+            self._cond.notify()
+        return future
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "streams_opened": self._streams,
+            "runs": self._runs,
+            "blocks": self._blocks,
+            "avg_batch_size": (self._blocks / self._runs) if self._runs else 0.0,
+            "max_batch_size": self._max_batch,
+        }
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                while not self._jobs and not self._stopping:
+                    self._cond.wait()
+                if self._stopping:
+                    for job in self._jobs:
+                        job.future.cancel()
+                    self._jobs.clear()
+                    return
+            if self.tick_s:
+                time.sleep(self.tick_s)
+            with self._cond:
+                batch = self._take_batch()
+            if batch:
+                self._run(batch)
+
+    def _take_batch(self) -> List[_VadJob]:
+        # One block per stream per run: later blocks of the same stream depend
+        # on the state this run produces.
+        batch: List[_VadJob] = []
+        seen: set[int] = set()
+        rest: Deque[_VadJob] = deque()
+        while self._jobs:
+            job = self._jobs.popleft()
+            if job.stream.closed:
+                job.future.cancel()
+                continue
+            if id(job.stream) in seen:
+                rest.append(job)
+                continue
+            seen.add(id(job.stream))
+            batch.append(job)
+        self._jobs = rest
+        return batch
+
+    def _run(self, batch: List[_VadJob]) -> None:
+        live = [job for job in batch if job.future.set_running_or_notify_cancel()]
+        if not live:
+            return
+        size = len(live)
+        x = np.empty((size, SILERO_CONTEXT_SAMPLES + PROCESS_BLOCK_SIZE), dtype=np.float32)
+        state = np.empty((2, size, SILERO_STATE_SHAPE[2]), dtype=np.float32)
+        for i, job in enumerate(live):
+            x[i, :SILERO_CONTEXT_SAMPLES] = job.stream.context
+            np.multiply(job.block, 1.0 / 32768.0, out=x[i, SILERO_CONTEXT_SAMPLES:], casting="unsafe")
+            state[:, i, :] = job.stream.state[:, 0, :]
+        try:
+            out, state_n = self._session.run(None, {"input": x, "state": state, "sr": self._sr})
+        except Exception as exc:
+            self.logger and self.logger.error({"msg": "vad.engine.failed", "batch": size, "error": str(exc)})
+            for job in live:
+                job.future.set_exception(exc)
+            return
+        self._runs += 1
+        self._blocks += size
+        self._max_batch = max(self._max_batch, size)
+        probs = np.asarray(out, dtype=np.float32).reshape(size, -1)[:, 0]
+        for i, job in enumerate(live):
+            job.stream.state[:, 0, :] = state_n[:, i, :]
+            job.stream.context[:] = x[i, -SILERO_CONTEXT_SAMPLES:]
+            job.future.set_result(float(probs[i]))
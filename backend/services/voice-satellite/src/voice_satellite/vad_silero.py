@@ -1,26 +1,117 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+import importlib.util
+from pathlib import Path
 import sys
+from typing import Any
 
 import numpy as np
 
+from .config import VadConfig
+
+SILERO_ONNX_FILE = "silero_vad_16k_op15.onnx"
+SILERO_CONTEXT_SAMPLES = 64
+SILERO_STATE_SHAPE = (2, 1, 128)
+
+
+def silero_onnx_path(model_path: str = "") -> Path:
+    """Locate the Silero ONNX file shipped inside the silero-vad wheel.
+
+    Uses the package's search path only, so neither ``silero_vad`` nor torch is
+    imported.
+    """
+    if model_path:
+        path = Path(model_path)
+    else:
+        spec = importlib.util.find_spec("silero_vad")
+        if spec is None or not spec.submodule_search_locations:
+            raise RuntimeError("silero-vad is not installed; set vad.model_path to a Silero ONNX file")
+        path = Path(next(iter(spec.submodule_search_locations))) / "data" / SILERO_ONNX_FILE
+    if not path.is_file():
+        raise RuntimeError(f"Silero ONNX model not found: {path}")
+    return path
+
+
+def load_silero_onnx_session(model_path: str = "") -> Any:
+    """Open the 16 kHz Silero ONNX model with onnxruntime, single-threaded."""
+    import onnxruntime
+
+    opts = onnxruntime.SessionOptions()
+    opts.inter_op_num_threads = 1
+    opts.intra_op_num_threads = 1
+    return onnxruntime.InferenceSession(
+        str(silero_onnx_path(model_path)),
+        sess_options=opts,
+        providers=["CPUExecutionProvider"],
+    )
+
+
+def create_vad(cfg: VadConfig, *, sample_rate: int) -> Any:
+    engine = str(cfg.engine or "onnx").strip().lower()
+    if engine == "onnx":
+        return SileroOnnxVad(threshold=cfg.threshold, sample_rate=sample_rate, model_path=cfg.model_path)
+    if engine == "torch":
+        return SileroVad(threshold=cfg.threshold, sample_rate=sample_rate)
+    raise RuntimeError(f"unknown vad.engine: {cfg.engine!r} (expected onnx | torch)")
+
+
+def _ensure_torchaudio() -> None:
+    try:
+        import torchaudio  # noqa: F401
+    except ModuleNotFoundError:
+        from . import _torchaudio_stub as torchaudio_stub
+
+        sys.modules.setdefault("torchaudio", torchaudio_stub)
+
 
 @dataclass
-class SileroVad:
+class SileroOnnxVad:
+    """Silero VAD driven directly through onnxruntime (no torch import).
+
+    The model input (64 samples of context + one 512-sample block), the
+    recurrent state and the sample-rate tensor are allocated once and reused
+    for every block.
+    """
+
     threshold: float = 0.55
     sample_rate: int = 16000
+    model_path: str = ""
+    session: Any = None
 
     def __post_init__(self) -> None:
-        import torch
+        if self.sample_rate != 16000:
+            raise ValueError(f"Silero ONNX VAD expects 16000 Hz audio, got {self.sample_rate}")
+        if self.session is None:
+            self.session = load_silero_onnx_session(self.model_path)
+        self._input = np.zeros((1, SILERO_CONTEXT_SAMPLES + 512), dtype=np.float32)
+        self._state = np.zeros(SILERO_STATE_SHAPE, dtype=np.float32)
+        self._sr = np.array(self.sample_rate, dtype=np.int64)
+        self._feeds = {"input": self._input, "state": self._state, "sr": self._sr}
+
+    def probability(self, chunk_i16: np.ndarray) -> float:
+        # Expect exactly 512 samples at 16k for streaming.
+        x = self._input[0]
+        np.multiply(chunk_i16, 1.0 / 32768.0, out=x[SILERO_CONTEXT_SAMPLES:], casting="unsafe")
+        out, state = self.session.run(None, self._feeds)
+        self._state[...] = state
+        x[:SILERO_CONTEXT_SAMPLES] = x[-SILERO_CONTEXT_SAMPLES:]
+        return float(out[0, 0])
+
+    def reset(self) -> None:
+        self._input[...] = 0.0
+        self._state[...] = 0.0
 
-        try:
-            import torchaudio  # noqa: F401
-        except ModuleNotFoundError:
-            from . import _torchaudio_stub as torchaudio_stub
 
-            sys.modules.setdefault("torchaudio", torchaudio_stub)
+@dataclass
+class SileroVad:
+    threshold: float = 0.55
+    sample_rate: int = 16000
+
+    def __post_init__(self) -> None:
+        import torch
 
+        _ensure_torchaudio()
         from silero_vad import load_silero_vad
 
         torch.set_num_threads(1)
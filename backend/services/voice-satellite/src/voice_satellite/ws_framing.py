@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import base64
+import json
+import struct
+import zlib
+from dataclasses import dataclass
+from typing import Any
+
+# Binary frame header: type, flags, seq (uint16, wraps), session tag (uint32).
+FRAME_HEADER = struct.Struct("<BBHI")
+FRAME_AUDIO = 0x01  # device -> host: pcm_s16le mic audio (replaces audio_chunk)
+FRAME_TTS = 0x02  # host -> device: pcm_s16le tts audio (replaces tts_chunk)
+
+FRAMING_JSON = "json"
+FRAMING_BINARY = "binary"
+
+
+@dataclass(frozen=True)
+class BinaryFrame:
+    kind: int
+    flags: int
+    seq: int
+    session_tag: int
+    payload: memoryview
+
+
+def session_tag(session_id: str | None) -> int:
+    """Map a session id to the 32-bit tag carried in binary frame headers.
+
+    ``voice-<8 hex>`` ids use their hex suffix directly so the tag is readable
+    in packet dumps; anything else falls back to crc32. 0 means "no session".
+    """
+    if not session_id:
+        return 0
+    suffix = session_id.rsplit("-", 1)[-1]
+    if 0 < len(suffix) <= 8:
+        try:
+            return int(suffix, 16)
+        except ValueError:
+            pass
+    return zlib.crc32(session_id.encode("utf-8"))
+
+
+def negotiate_framing(requested: Any) -> str:
+    """Pick the framing for a connection from ``hello.framing`` (str or list)."""
+    if isinstance(requested, str):
+        requested = [requested]
+    if isinstance(requested, (list, tuple)) and any(str(v).strip().lower() == FRAMING_BINARY for v in requested):
+        return FRAMING_BINARY
+    return FRAMING_JSON
+
+
+def encode_frame(kind: int, payload: bytes, *, seq: int, session_tag: int, flags: int = 0) -> bytes:
+    return FRAME_HEADER.pack(kind, flags, seq & 0xFFFF, session_tag & 0xFFFFFFFF) + payload
+
+
+def decode_frame(data: bytes) -> BinaryFrame:
+    if len(data) < FRAME_HEADER.size:
+        raise ValueError(f"binary frame shorter than {FRAME_HEADER.size}-byte header")
+    kind, flags, seq, tag = FRAME_HEADER.unpack_from(data)
+    return BinaryFrame(kind=kind, flags=flags, seq=seq, session_tag=tag, payload=memoryview(data)[FRAME_HEADER.size :])
+
+
+def encode_event(event: dict[str, Any], *, framing: str) -> str | bytes:
+    """Serialize a session event for the wire.
+
+    ``tts_chunk`` events carry raw ``pcm`` bytes; they become a binary
+    ``FRAME_TTS`` frame on binary connections and base64 ``data`` in JSON
+    otherwise. Every other event is a JSON text frame.
+    """
+    if event.get("type") != "tts_chunk" or "pcm" not in event:
+        return json.dumps(event, ensure_ascii=False)
+    pcm = event["pcm"]
+    if framing == FRAMING_BINARY:
+        return encode_frame(FRAME_TTS, pcm, seq=int(event.get("seq") or 0), session_tag=session_tag(event.get("sessionId")))
+    payload = {k: v for k, v in event.items() if k != "pcm"}
+    payload["data"] = base64.b64encode(pcm).decode("ascii")
+    return json.dumps(payload, ensure_ascii=False)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+import unittest
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from voice_satellite.agent_client import AsyncAgentClient  # noqa: E402
+
+
+class AsyncAgentClientTest(unittest.IsolatedAsyncioTestCase):
+    async def test_turns_share_pool_and_respect_concurrency_limit(self) -> None:
+        active = 0
+        peak = 0
+        bodies: list[dict] = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            bodies.append(json.loads(request.content))
+            await asyncio.sleep(0.02)
+            active -= 1
+            return httpx.Response(200, json={"type": "answer", "message": "好的"})
+
+        client = AsyncAgentClient(base_url="http://agent:6100/", max_concurrency=2, transport=httpx.MockTransport(handler))
+        try:
+            outs = await asyncio.gather(
+                *[client.turn(session_id=f"voice-{i}", text="开灯", confirm=False, wake_source={"deviceId": "sat"}) for i in range(5)]
+            )
+        finally:
+            await client.aclose()
+
+        self.assertEqual([o["message"] for o in outs], ["好的"] * 5)
+        self.assertEqual(peak, 2)
+        self.assertEqual(bodies[0]["context"], {"wakeSource": {"deviceId": "sat"}})
+        self.assertEqual(client.url, "http://agent:6100/v1/agent/turn")
+
+    async def test_http_error_and_deadline(self) -> None:
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if json.loads(request.content)["input"] == "slow":
+                await asyncio.sleep(5)
+            return httpx.Response(503, text="agent overloaded")
+
+        client = AsyncAgentClient(base_url="http://agent:6100", timeout_s=1, transport=httpx.MockTransport(handler))
+        try:
+            with self.assertRaisesRegex(RuntimeError, "agent_http_503: agent overloaded"):
+                await client.turn(session_id="s", text="开灯", confirm=False)
+            with self.assertRaisesRegex(RuntimeError, "agent_timeout"):
+                await client.turn(session_id="s", text="slow", confirm=False)
+        finally:
+            await client.aclose()
+
+    async def test_turn_stream_reads_ndjson_sse_and_plain_json(self) -> None:
+        final = {"type": "answer", "message": "现在二十度。"}
+        ndjson = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in [{"type": "delta", "text": "现在"}, {"type": "delta", "text": "二十度。"}, final])
+        sse = ": keep-alive\n\ndata: " + json.dumps({"type": "delta", "text": "现在二十度。"}) + "\n\ndata: " + json.dumps(final) + "\n\ndata: [DONE]\n\n"
+        replies = {
+            "ndjson": httpx.Response(200, headers={"content-type": "application/x-ndjson"}, text=ndjson),
+            "sse": httpx.Response(200, headers={"content-type": "text/event-stream"}, text=sse),
+            "json": httpx.Response(200, json=final),
+            "cut": httpx.Response(200, headers={"content-type": "application/x-ndjson"}, text=ndjson.splitlines()[0]),
+        }
+        accepts: list[str] = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            accepts.append(request.headers["accept"])
+            return replies[json.loads(request.content)["input"]]
+
+        client = AsyncAgentClient(base_url="http://agent:6100", transport=httpx.MockTransport(handler))
+        try:
+            streams = {}
+            for kind in ("ndjson", "sse", "json"):
+                streams[kind] = [e async for e in client.turn_stream(session_id="s", text=kind, confirm=False)]
+            with self.assertRaisesRegex(RuntimeError, "agent_stream_incomplete"):
+                [e async for e in client.turn_stream(session_id="s", text="cut", confirm=False)]
+        finally:
+            await client.aclose()
+
+        self.assertEqual([e.get("text") for e in streams["ndjson"][:-1]], ["现在", "二十度。"])
+        self.assertEqual(streams["sse"], [{"type": "delta", "text": "现在二十度。"}, final])
+        self.assertEqual(streams["json"], [final])
+        self.assertEqual(streams["ndjson"][-1], final)
+        self.assertIn("application/x-ndjson", accepts[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
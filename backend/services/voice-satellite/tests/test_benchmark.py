@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+import sys
+import tempfile
+import unittest
+import wave
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from voice_satellite.benchmark import (  # noqa: E402
+    char_edit_distance,
+    compare,
+    estimate_speech_end_ms,
+    load_golden_dir,
+    run_benchmark,
+)
+from voice_satellite.config import load_config  # noqa: E402
+from voice_satellite.loadtest import EnergyVad, synthetic_fixture  # noqa: E402
+from voice_satellite.log import Logger  # noqa: E402
+
+
+class ScriptedStt:
+    def __init__(self, texts: list[str]):
+        self.texts = list(texts)
+
+    def transcribe(self, audio: np.ndarray, *, sample_rate: int) -> tuple[str, dict]:
+        return (self.texts.pop(0) if self.texts else ""), {}
+
+
+def write_wav(path: Path, pcm: bytes) -> None:
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(16000)
+        wf.writeframes(pcm)
+
+
+class BenchmarkTest(unittest.IsolatedAsyncioTestCase):
+    async def test_replays_golden_dir_and_scores_each_command(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            golden = Path(tmp)
+            write_wav(golden / "a.wav", synthetic_fixture(lead_ms=96, speech_ms=640))
+            write_wav(golden / "b.wav", synthetic_fixture(lead_ms=96, speech_ms=320, seed=1))
+            (golden / "labels.jsonl").write_text(json.dumps({"file": "a.wav", "text": "打开客厅的灯。", "speech_end_ms": 736}) + "\n", encoding="utf-8")
+            (golden / "b.txt").write_text("关灯", encoding="utf-8")
+            utterances = load_golden_dir(str(golden))
+
+        cfg = load_config(str(ROOT / "config.ws-server.example.yaml"))
+        cfg = dataclasses.replace(
+            cfg,
+            vad=dataclasses.replace(cfg.vad, end_silence_ms=320, pre_roll_ms=0, min_utterance_ms=64),
+            stt=dataclasses.replace(cfg.stt, partial_interval_ms=0),
+        )
+        run = await run_benchmark(cfg, Logger("error"), utterances, label="energy", stt=ScriptedStt(["打开客厅的灯", "开灯"]), vad_factory=EnergyVad)
+
+        a, b = run["utterances"]
+        self.assertEqual((a["edits"], a["ref_chars"]), (0, 6))
+        self.assertEqual((b["edits"], b["ref_chars"]), (1, 2))
+        self.assertEqual(run["summary"]["cer"], 0.125)
+        # VAD stops end_silence_ms (10 blocks of 32 ms) after the speech ends.
+        self.assertEqual(a["stop_reason"], "vad_end")
+        self.assertGreaterEqual(a["eos_delay_ms"], 320)
+        self.assertLess(a["eos_delay_ms"], 320 + 64)
+        self.assertLess(a["trimmed_samples"], a["full_samples"])
+        self.assertEqual(a["stt_calls"], 1)
+        self.assertEqual(run["summary"]["eos_missed"], 0)
+
+        self.assertEqual(compare([run], {"runs": [{"label": "energy", "summary": {**run["summary"], "cer": 0.5}}]})["energy"]["cer"], -0.375)
+
+    def test_helpers(self) -> None:
+        self.assertEqual(char_edit_distance("打开客厅的灯", "打开卧室灯"), 3)
+        self.assertAlmostEqual(estimate_speech_end_ms(synthetic_fixture(lead_ms=200, speech_ms=400) + bytes(16000)), 600, delta=20)
+
+
+if __name__ == "__main__":
+    unittest.main()
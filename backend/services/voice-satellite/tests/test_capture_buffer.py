@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from voice_satellite.capture_buffer import CaptureBuffer  # noqa: E402
+
+
+def pcm(start: int, count: int) -> bytes:
+    return np.arange(start, start + count, dtype=np.int16).tobytes()
+
+
+class CaptureBufferTest(unittest.TestCase):
+    def test_blocks_complete_across_odd_sized_chunks(self) -> None:
+        buf = CaptureBuffer(64, block_samples=4)
+        data = pcm(0, 10)
+
+        self.assertEqual(list(buf.write(data[:5])), [])
+        self.assertEqual(list(buf.write(data[5:17])), [0, 1])
+        self.assertEqual(list(buf.write(data[17:])), [])
+        self.assertEqual(buf.block(1).tolist(), [4, 5, 6, 7])
+        # The two trailing samples of an incomplete block are not part of the capture.
+        self.assertEqual(buf.view().tolist(), list(range(8)))
+        self.assertTrue(np.shares_memory(buf.view(), buf.block(0)))
+        self.assertEqual(buf.float32(1, 2).dtype, np.float32)
+        self.assertAlmostEqual(float(buf.float32(1, 2)[0]), 4 / 32768.0)
+
+    def test_drops_leading_audio_before_pin_and_trailing_audio_after(self) -> None:
+        buf = CaptureBuffer(16, block_samples=4)
+        buf.write(pcm(0, 16))
+
+        completed = buf.write(pcm(16, 4))
+
+        # Like a ring: the oldest block made room, the newest audio is kept.
+        self.assertEqual(list(completed), [3])
+        self.assertEqual(buf.view().tolist(), list(range(4, 20)))
+        self.assertEqual(buf.dropped_samples, 0)
+
+        buf.pin()
+        completed = buf.write(pcm(20, 6))
+
+        self.assertEqual(list(completed), [])
+        self.assertEqual(buf.view().tolist(), list(range(4, 20)))
+        self.assertEqual(buf.dropped_samples, 6)
+
+        buf.clear()
+        self.assertEqual(len(buf), 0)
+        self.assertEqual(buf.dropped_samples, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from websockets.datastructures import Headers
+from websockets.exceptions import ConnectionClosed
+from websockets.http11 import Response
+from websockets.sync.server import serve
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from voice_satellite.devices import DeviceCatalog, gateway_ws_url  # noqa: E402
+
+
+class FakeGateway:
+    """``GET /devices`` with ETag revalidation plus the ``/ws`` change feed."""
+
+    def __init__(self, items: list[dict]):
+        self.items = items
+        self.etag = 'W/"v1"'
+        self.requests: list[str | None] = []
+        self.feed: list[dict] = []
+        self.server = serve(self._feed, "127.0.0.1", 0, process_request=self._http)
+        self.base_url = f"http://127.0.0.1:{self.server.socket.getsockname()[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self.server.shutdown()
+
+    def _http(self, _conn, request) -> Response | None:
+        if request.path != "/devices":
+            return None
+        self.requests.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == self.etag:
+            return Response(304, "Not Modified", Headers({"ETag": self.etag, "Content-Length": "0"}), b"")
+        body = json.dumps({"items": self.items, "count": len(self.items)}).encode()
+        headers = Headers({"ETag": self.etag, "Content-Type": "application/json", "Content-Length": str(len(body))})
+        return Response(200, "OK", headers, body)
+
+    def _feed(self, conn) -> None:
+        with contextlib.suppress(ConnectionClosed):
+            conn.send(json.dumps({"type": "hello", "mode": "redis"}))
+            for msg in self.feed:
+                conn.send(json.dumps(msg))
+            conn.recv()
+
+
+def wait_until(predicate, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class DeviceCatalogTest(unittest.TestCase):
+    def test_refresh_revalidates_and_swaps_the_catalog(self) -> None:
+        gateway = FakeGateway([{"id": "light-lr-main", "name": "客厅主灯"}, {"id": "ac-1", "name": "卧室空调"}])
+        self.addCleanup(gateway.close)
+        catalog = DeviceCatalog(base_url=gateway.base_url)
+
+        catalog.refresh()
+        catalog.refresh()
+        by_id = catalog.by_id
+        gateway.items = [{"id": "light-lr-main", "name": "客厅吊灯"}]
+        gateway.etag = 'W/"v2"'
+        catalog.refresh()
+
+        self.assertEqual(gateway.requests, [None, 'W/"v1"', 'W/"v1"'])
+        self.assertEqual(catalog.stats()["not_modified"], 1)
+        self.assertEqual(catalog.by_id, {"light-lr-main": {"id": "light-lr-main", "name": "客厅吊灯"}})
+        # A reader's dict is never changed under it.
+        self.assertEqual(set(by_id), {"light-lr-main", "ac-1"})
+
+    def test_readers_can_iterate_while_the_feed_adds_devices(self) -> None:
+        catalog = DeviceCatalog(base_url="http://gateway.invalid")
+        done = threading.Event()
+
+        def feed() -> None:
+            for n in range(2000):
+                catalog.apply_update({"id": f"plug-{n}", "name": f"插座{n}"})
+            done.set()
+
+        thread = threading.Thread(target=feed)
+        thread.start()
+        while not done.is_set():
+            for _did, _device in catalog.by_id.items():
+                pass
+        thread.join()
+        self.assertEqual(len(catalog.by_id), 2000)
+
+    def test_watch_applies_change_feed(self) -> None:
+        gateway = FakeGateway([{"id": "light-lr-main", "name": "客厅主灯", "traits": {"switch": {"state": "off"}}}])
+        gateway.feed = [
+            {"type": "device_update", "data": {"id": "plug-1", "name": "插座", "event": {"type": "press"}}},
+            {"type": "state_snapshot", "data": {"id": "light-lr-main", "traits": {"switch": {"state": "on"}}, "ts": 1}},
+            {"type": "state_snapshot", "data": {"id": "unknown", "traits": {}}},
+            {"type": "action_result", "data": {"id": "light-lr-main", "status": "ok"}},
+        ]
+        self.addCleanup(gateway.close)
+        catalog = DeviceCatalog(base_url=gateway.base_url)
+        self.addCleanup(catalog.close)
+
+        catalog.watch()
+
+        self.assertTrue(wait_until(lambda: catalog.stats()["feed_updates"] == 2 and gateway.requests))
+        # The resync on connect lands before the feed, so the newer state wins.
+        self.assertEqual(catalog.by_id["light-lr-main"]["traits"], {"switch": {"state": "on"}})
+        self.assertEqual(catalog.by_id["light-lr-main"]["name"], "客厅主灯")
+        self.assertEqual(catalog.by_id["plug-1"], {"id": "plug-1", "name": "插座"})
+        self.assertNotIn("unknown", catalog.by_id)
+        self.assertEqual(gateway_ws_url("https://gw.local:4000/api/"), "wss://gw.local:4000/api/ws")
+
+
+if __name__ == "__main__":
+    unittest.main()
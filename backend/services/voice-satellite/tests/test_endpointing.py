@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from voice_satellite.endpointing import BLOCK_MS, Endpointer, looks_complete  # noqa: E402
+
+
+def make_endpointer() -> Endpointer:
+    return Endpointer(base_ms=640, complete_ms=320, short_reply_ms=256, max_ms=1280, short_phrases=["确认", "取消"])
+
+
+class EndpointingTest(unittest.TestCase):
+    def test_looks_complete(self) -> None:
+        self.assertTrue(looks_complete("打开客厅的灯"))
+        self.assertTrue(looks_complete("空调现在多少度呢"))
+        self.assertTrue(looks_complete("确认", {"确认"}))
+        self.assertFalse(looks_complete("打开客厅的灯和"))
+        self.assertFalse(looks_complete("把空调调到"))
+        self.assertIsNone(looks_complete("把空调调到二十"))
+        self.assertIsNone(looks_complete("今天"))
+        # Confirmations that end on "的", whether configured or not.
+        self.assertTrue(looks_complete("好的", {"好的"}))
+        self.assertTrue(looks_complete("对的"))
+        self.assertTrue(looks_complete("是的"))
+        # "开"/"关" alone are not a command verb.
+        self.assertFalse(looks_complete("关于明天的"))
+        self.assertIsNone(looks_complete("关于明天的天气"))
+        self.assertIsNone(looks_complete("开会时间是几点"))
+
+    def test_complete_partial_shrinks_the_window_only_when_it_covers_all_speech(self) -> None:
+        endpointer = make_endpointer()
+        self.assertEqual(endpointer.limit_blocks(last_speech_block=20), 20)
+
+        endpointer.on_partial("打开客厅的灯", end_block=15)
+        self.assertEqual(endpointer.limit_blocks(last_speech_block=20), 20)
+        endpointer.on_partial("打开客厅的灯", end_block=22)
+        self.assertEqual(endpointer.limit_blocks(last_speech_block=20), 10)
+        self.assertEqual(endpointer.decision()["endpoint_factors"], ["complete"])
+
+    def test_base_window_matches_the_fixed_one(self) -> None:
+        endpointer = Endpointer(base_ms=700, complete_ms=350, short_reply_ms=300, max_ms=1200)
+        self.assertEqual(endpointer.limit_blocks(last_speech_block=20), int(700 / BLOCK_MS))
+
+    def test_trailing_connective_lengthens_the_window(self) -> None:
+        endpointer = make_endpointer()
+        endpointer.expect_short_reply = True
+        endpointer.on_partial("打开客厅的灯然后", end_block=22)
+        self.assertEqual(endpointer.limit_blocks(last_speech_block=20), 40)
+        self.assertEqual(endpointer.decision()["endpoint_factors"], ["trailing_word"])
+
+    def test_short_reply_after_propose(self) -> None:
+        endpointer = make_endpointer()
+        endpointer.expect_short_reply = True
+        self.assertEqual(endpointer.limit_blocks(last_speech_block=5), 8)
+
+    def test_confirmation_ending_on_de_after_propose_keeps_the_short_window(self) -> None:
+        for reply in ("好的", "对的"):
+            endpointer = Endpointer(base_ms=640, complete_ms=320, short_reply_ms=256, max_ms=1280, short_phrases=["确认", "好的"])
+            endpointer.expect_short_reply = True
+            endpointer.on_partial(reply, end_block=22)
+            self.assertEqual(endpointer.limit_blocks(last_speech_block=20), 8, reply)
+            self.assertEqual(endpointer.decision()["endpoint_factors"], ["complete", "short_reply"], reply)
+
+    def test_hesitant_speaker_keeps_a_longer_window(self) -> None:
+        endpointer = make_endpointer()
+        endpointer.on_partial("打开客厅的灯", end_block=22)
+        endpointer.on_resume(3)  # an ordinary gap between words
+        self.assertEqual(endpointer.limit_blocks(last_speech_block=20), 10)
+
+        endpointer.on_resume(15)  # 480 ms, then the speaker went on
+        self.assertEqual(endpointer.limit_blocks(last_speech_block=20), int((15 * BLOCK_MS + 150) / BLOCK_MS))
+        self.assertIn("hesitation", endpointer.decision()["endpoint_factors"])
+
+        # The habit carries over to the next utterance, smoothed.
+        endpointer.finish()
+        endpointer.reset()
+        self.assertEqual(endpointer.decision()["speaker_pause_ms"], int(0.3 * 15 * BLOCK_MS))
+        endpointer.on_partial("打开客厅的灯", end_block=22)
+        self.assertEqual(endpointer.limit_blocks(last_speech_block=20), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import json
+import sys
+import unittest
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from voice_satellite.fast_path import AhoCorasick, FastPath, FastPathIndex, parse_number  # noqa: E402
+from voice_satellite.speech import compose_speech  # noqa: E402
+
+DEVICES = {
+    "light-lr-main": {
+        "name": "客厅主灯",
+        "placement": {"room": "living_room"},
+        "traits": {"dimmer": {"state": "on", "brightness": 60}},
+        "capabilities": [{"action": "turn_on"}, {"action": "turn_off"}, {"action": "set_brightness"}],
+    },
+    "light-lr-strip": {
+        "name": "客厅灯带",
+        "placement": {"room": "living_room"},
+        "traits": {"switch": {"state": "off"}},
+        "capabilities": [{"action": "turn_on"}, {"action": "turn_off"}],
+    },
+    "light-br-main": {
+        "name": "卧室主灯",
+        "placement": {"room": "bedroom"},
+        "traits": {"switch": {"state": "off"}},
+        "capabilities": [{"action": "turn_on"}, {"action": "turn_off"}],
+        "semantics": {"aliases": ["床头灯"]},
+    },
+    "plug-lr-heater": {
+        "name": "客厅取暖器插座",
+        "placement": {"room": "living_room"},
+        "traits": {"switch": {"state": "off"}},
+        "capabilities": [{"action": "turn_on"}, {"action": "turn_off"}],
+        "bindings": {"voice_control": {"actions": {"turn_on": {"risk": "high"}}}},
+    },
+    "ac-br": {
+        "name": "卧室空调",
+        "placement": {"room": "bedroom"},
+        "traits": {"climate": {"mode": "cool"}},
+        "capabilities": [{"action": "set_temperature"}],
+    },
+}
+
+
+class Catalog:
+    def __init__(self, by_id: dict):
+        self.by_id = {k: dict(v) for k, v in by_id.items()}
+
+
+class FastPathIndexTest(unittest.TestCase):
+    def test_aho_corasick_finds_overlapping_patterns(self) -> None:
+        automaton = AhoCorasick([("he", 1), ("she", 2), ("his", 3), ("hers", 4)])
+        self.assertEqual(sorted(automaton.find("ushers")), [(1, 4, 2), (2, 4, 1), (2, 6, 4)])
+
+    def test_parse_number(self) -> None:
+        self.assertEqual([parse_number(t) for t in ("50", "五十", "三十五", "十", "百", "两")], [50, 50, 35, 10, 100, 2])
+
+    def test_simple_commands_are_matched(self) -> None:
+        index = FastPathIndex(DEVICES)
+        cases = {
+            "打开客厅主灯": (("light-lr-main",), "turn_on", {}),
+            "关闭卧室灯": (("light-br-main",), "turn_off", {}),
+            "把床头灯打开": (("light-br-main",), "turn_on", {}),
+            # Room-less commands use the satellite's room.
+            "把灯关了": (("light-lr-main", "light-lr-strip"), "turn_off", {}),
+            "打开主灯": (("light-lr-main",), "turn_on", {}),
+            "客厅主灯亮度调到百分之三十": (("light-lr-main",), "set_brightness", {"brightness": 30}),
+            "把客厅主灯调到50%": (("light-lr-main",), "set_brightness", {"brightness": 50}),
+        }
+        for text, (devices, action, params) in cases.items():
+            intent, reason = index.match(text, room="living_room")
+            self.assertIsNotNone(intent, f"{text}: {reason}")
+            self.assertEqual((intent.device_ids, intent.action, intent.params), (devices, action, params), text)
+
+    def test_unsure_commands_are_left_to_the_agent(self) -> None:
+        index = FastPathIndex(DEVICES)
+        cases = {
+            "打开客厅灯然后播放音乐": "uncovered",
+            "卧室空调调到26度": "uncovered",
+            "打开空调": "device_room",
+            "打开客厅主灯和关闭卧室主灯": "uncovered",
+            "打开客厅主灯关闭卧室主灯": "intent",
+            "客厅灯带亮度调到五十": "not_supported",
+            "客厅主灯亮度调到一百二十": "brightness_value",
+            "今天天气怎么样": "uncovered",
+            # Scope words reach beyond the satellite's room.
+            "把所有灯都关了": "uncovered",
+            "关闭全部灯": "uncovered",
+            # The agent asks before running risky actions.
+            "打开插座": "risk",
+        }
+        for text, reason in cases.items():
+            self.assertEqual(index.match(text, room="living_room"), (None, reason), text)
+
+    def test_low_risk_actions_on_a_risky_device_still_match(self) -> None:
+        intent, reason = FastPathIndex(DEVICES).match("关闭插座", room="living_room")
+        self.assertEqual((intent.device_ids, intent.action), (("plug-lr-heater",), "turn_off"), reason)
+
+    def test_state_questions_are_answered_from_the_catalog(self) -> None:
+        index = FastPathIndex(DEVICES)
+        intent, _ = index.match("客厅主灯开着吗", room="bedroom")
+        self.assertEqual(index.answer(intent), "客厅主灯开着。")
+        intent, _ = index.match("客厅主灯亮度多少")
+        live = {**DEVICES, "light-lr-main": {**DEVICES["light-lr-main"], "traits": {"dimmer": {"state": "on", "brightness": 20}}}}
+        self.assertEqual(index.answer(intent, live), "客厅主灯亮度20%。")
+
+
+class FastPathTest(unittest.IsolatedAsyncioTestCase):
+    async def test_actions_go_straight_to_api_gateway(self) -> None:
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json={"status": "queued"})
+
+        catalog = Catalog(DEVICES)
+        fast_path = FastPath(devices=catalog, base_url="http://gw:4000/", api_key="k", transport=httpx.MockTransport(handler))
+        try:
+            out = await fast_path.turn("打开客厅主灯", room="bedroom")
+        finally:
+            await fast_path.aclose()
+
+        self.assertEqual(len(requests), 1)
+        self.assertEqual(str(requests[0].url), "http://gw:4000/devices/light-lr-main/actions")
+        self.assertEqual(requests[0].headers["X-API-Key"], "k")
+        self.assertEqual(json.loads(requests[0].content), {"action": "turn_on", "params": {}})
+        self.assertEqual(out["type"], "executed")
+        self.assertEqual(compose_speech(out, catalog.by_id), "已提交执行：打开客厅主灯")
+        self.assertEqual(fast_path.stats(), {"hits": 1, "misses": 0})
+
+    async def test_rejected_actions_fall_back_to_the_agent(self) -> None:
+        transport = httpx.MockTransport(lambda request: httpx.Response(400, json={"error": "action_not_supported"}))
+        fast_path = FastPath(devices=Catalog(DEVICES), base_url="http://gw:4000", transport=transport)
+        try:
+            self.assertIsNone(await fast_path.turn("关闭卧室主灯"))
+            self.assertIsNone(await fast_path.turn("讲个笑话"))
+        finally:
+            await fast_path.aclose()
+        self.assertEqual(fast_path.stats(), {"hits": 0, "misses": 2})
+
+    async def test_index_follows_catalog_renames(self) -> None:
+        catalog = Catalog(DEVICES)
+        fast_path = FastPath(devices=catalog, base_url="http://gw:4000", transport=httpx.MockTransport(lambda r: httpx.Response(200, json={})))
+        try:
+            self.assertIsNone(await fast_path.turn("打开阅读灯"))
+            catalog.by_id["light-br-main"] = {**catalog.by_id["light-br-main"], "name": "卧室阅读灯"}
+            out = await fast_path.turn("打开阅读灯", room="bedroom")
+        finally:
+            await fast_path.aclose()
+        self.assertEqual(out["actions"], [{"deviceId": "light-br-main", "action": "turn_on", "params": {}}])
+
+    async def test_index_follows_risk_changes(self) -> None:
+        catalog = Catalog(DEVICES)
+        fast_path = FastPath(devices=catalog, base_url="http://gw:4000", transport=httpx.MockTransport(lambda r: httpx.Response(200, json={})))
+        try:
+            self.assertIsNotNone(await fast_path.turn("打开卧室主灯"))
+            catalog.by_id["light-br-main"] = {
+                **catalog.by_id["light-br-main"],
+                "bindings": {"voice_control": {"actions": {"turn_on": {"risk": "medium"}}}},
+            }
+            self.assertIsNone(await fast_path.turn("打开卧室主灯"))
+        finally:
+            await fast_path.aclose()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from voice_satellite.flow_control import LEGACY_WINDOW_BYTES, PLAYBACK_BYTES_PER_SEC, DownlinkCredit  # noqa: E402
+
+CHUNK = 4096
+
+
+class DownlinkCreditTest(unittest.IsolatedAsyncioTestCase):
+    async def test_credit_mode_bursts_window_then_waits_for_ack(self) -> None:
+        credit = DownlinkCredit(buffer_bytes=3 * CHUNK, prebuffer_ms=1000, ack_timeout_ms=5000)
+        credit.start_reply()
+        self.assertEqual(credit.window_bytes(), 3 * CHUNK)
+
+        started = time.monotonic()
+        for _ in range(3):
+            await credit.acquire(CHUNK)
+        self.assertLess(time.monotonic() - started, 0.05)
+
+        pending = asyncio.create_task(credit.acquire(CHUNK))
+        await asyncio.sleep(0.05)
+        self.assertFalse(pending.done())
+        credit.on_ack(CHUNK)
+        await asyncio.wait_for(pending, timeout=1)
+        self.assertEqual(credit.stats()["flow_waits"], 1)
+        self.assertEqual(credit.stats()["ack_stalls"], 0)
+
+    async def test_late_ack_from_previous_reply_is_ignored(self) -> None:
+        credit = DownlinkCredit(buffer_bytes=2 * CHUNK, prebuffer_ms=1000, ack_timeout_ms=5000)
+        first = credit.start_reply()
+        await credit.acquire(CHUNK)
+        second = credit.start_reply()
+        self.assertNotEqual(first, second)
+        await credit.acquire(CHUNK)
+        await credit.acquire(CHUNK)
+
+        # The device reports the end of the first reply only now.
+        credit.on_ack(CHUNK, first)
+        pending = asyncio.create_task(credit.acquire(CHUNK))
+        await asyncio.sleep(0.05)
+        self.assertFalse(pending.done())
+        self.assertEqual(credit.stats()["stale_acks"], 1)
+
+        credit.on_ack(CHUNK, second)
+        await asyncio.wait_for(pending, timeout=1)
+
+    async def test_window_grows_with_rtt_up_to_device_buffer(self) -> None:
+        credit = DownlinkCredit(buffer_bytes=64000, prebuffer_ms=100)
+        self.assertEqual(credit.window_bytes(), int(0.1 * PLAYBACK_BYTES_PER_SEC))
+        credit.observe_rtt(0.2)
+        self.assertEqual(credit.window_bytes(), int(0.3 * PLAYBACK_BYTES_PER_SEC))
+        credit.observe_rtt(20.0)
+        self.assertEqual(credit.window_bytes(), 64000)
+
+    async def test_missing_acks_fall_back_to_playback_clock(self) -> None:
+        credit = DownlinkCredit(buffer_bytes=CHUNK, prebuffer_ms=1000, ack_timeout_ms=50)
+        credit.start_reply()
+        await credit.acquire(CHUNK)
+
+        started = time.monotonic()
+        await asyncio.wait_for(credit.acquire(CHUNK), timeout=1)
+        elapsed = time.monotonic() - started
+        # Waits for the ack timeout, then for the clock to have played the first chunk.
+        self.assertGreaterEqual(elapsed, CHUNK / PLAYBACK_BYTES_PER_SEC - 0.01)
+        self.assertEqual(credit.stats()["ack_stalls"], 1)
+
+        credit.on_ack(2 * CHUNK)
+        self.assertFalse(credit.stalled)
+
+    async def test_clock_mode_paces_at_playback_rate(self) -> None:
+        credit = DownlinkCredit()
+        credit.start_reply()
+        self.assertEqual(credit.stats()["flow"], "clock")
+
+        started = time.monotonic()
+        total = LEGACY_WINDOW_BYTES + 2 * CHUNK
+        for _ in range(total // CHUNK):
+            await credit.acquire(CHUNK)
+        elapsed = time.monotonic() - started
+        expected = (total - LEGACY_WINDOW_BYTES) / PLAYBACK_BYTES_PER_SEC
+        self.assertGreaterEqual(elapsed, expected - 0.02)
+        self.assertLess(elapsed, expected + 0.2)
+
+
+if __name__ == "__main__":
+    unittest.main()
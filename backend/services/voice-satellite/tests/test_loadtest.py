@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import dataclasses
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from voice_satellite.config import load_config  # noqa: E402
+from voice_satellite.log import Logger  # noqa: E402
+from voice_satellite.loadtest import _Playback, build_stubs, run_load_test, synthetic_fixture  # noqa: E402
+from voice_satellite.metrics import STAGES  # noqa: E402
+
+
+class LoadTestTest(unittest.IsolatedAsyncioTestCase):
+    async def test_simulated_satellites_complete_turns_against_stub_server(self) -> None:
+        cfg = load_config(str(ROOT / "config.ws-server.example.yaml"))
+        cfg = dataclasses.replace(cfg, vad=dataclasses.replace(cfg.vad, end_silence_ms=96, pre_roll_ms=0, min_utterance_ms=64))
+
+        report = await run_load_test(
+            cfg,
+            Logger("error"),
+            satellites=2,
+            turns=2,
+            fixtures=[synthetic_fixture(lead_ms=64, speech_ms=256)],
+            backends=build_stubs(["stt", "tts", "agent", "vad"], stt_ms=20, agent_ms=20, tts_ms=10, tts_ms_per_char=20),
+            ramp_s=0.1,
+            think_ms=50,
+            turn_timeout_s=10,
+        )
+
+        self.assertEqual((report["turns_ok"], report["turns_failed"]), (4, 0), report["errors"])
+        self.assertEqual(report["client_ms"]["audio_end_to_first_tts"]["count"], 4)
+        self.assertGreaterEqual(report["client_ms"]["audio_end_to_transcript"]["p50"], 20)
+        self.assertEqual(sorted(report["server_ms"]), sorted(STAGES))
+        self.assertEqual(report["server_ms"]["agent"]["count"], 4)
+        self.assertGreater(report["tts_chunks"]["received"], 0)
+        self.assertEqual(report["tts_chunks"]["dropped"], 0)
+        self.assertGreater(report["process"]["max_rss_mb"], 0)
+
+    def test_playback_counts_seq_gaps_and_underruns(self) -> None:
+        playback = _Playback(jitter_ms=50)
+        # 4096 bytes = 128 ms of 16 kHz audio per chunk.
+        playback.chunk(0.0, 65534, 4096, wrap=True)
+        playback.chunk(0.1, 65535, 4096, wrap=True)
+        playback.chunk(0.2, 1, 4096, wrap=True)  # seq 0 lost across the wrap
+        playback.chunk(0.9, 2, 4096, wrap=True)  # queued audio ran out at 0.384 s
+
+        self.assertEqual((playback.chunks, playback.dropped, playback.late), (4, 1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
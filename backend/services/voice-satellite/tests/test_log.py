@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import io
+import json
+import sys
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from voice_satellite.log import AsyncLogger, Logger  # noqa: E402
+
+
+class AsyncLoggerTest(unittest.TestCase):
+    def test_writes_batches_on_close_and_respects_level(self) -> None:
+        out, err = io.StringIO(), io.StringIO()
+        with redirect_stdout(out), redirect_stderr(err):
+            logger = AsyncLogger("info", flush_interval_ms=10_000)
+            logger.debug({"msg": "hidden"})
+            logger.info({"msg": "satellite.hello", "device_id": "客厅"})
+            logger.error({"msg": "satellite.turn.failed"})
+            logger.close()
+
+        self.assertEqual([json.loads(line)["msg"] for line in out.getvalue().splitlines()], ["satellite.hello"])
+        self.assertEqual(json.loads(out.getvalue())["device_id"], "客厅")
+        self.assertEqual([json.loads(line)["msg"] for line in err.getvalue().splitlines()], ["satellite.turn.failed"])
+
+    def test_drops_debug_then_info_under_pressure_but_keeps_errors(self) -> None:
+        out, err = io.StringIO(), io.StringIO()
+        with redirect_stdout(out), redirect_stderr(err):
+            logger = AsyncLogger("debug", flush_interval_ms=10_000, max_queue=4)
+            # The writer is idle for 10s, so the queue only grows here.
+            for i in range(3):
+                logger.debug({"msg": "vad", "i": i})
+            for i in range(3):
+                logger.info({"msg": "chunk", "i": i})
+            logger.error({"msg": "boom"})
+            dropped = logger.dropped
+            logger.close()
+
+        kept = [(r["msg"], r.get("i")) for r in map(json.loads, out.getvalue().splitlines())]
+        errors = [json.loads(line) for line in err.getvalue().splitlines()]
+        self.assertEqual(kept, [("vad", 0), ("vad", 1), ("chunk", 0), ("chunk", 1)])
+        self.assertEqual(dropped, 2)
+        self.assertEqual([e["msg"] for e in errors], ["boom", "log.dropped"])
+        self.assertEqual(errors[-1]["dropped_total"], 2)
+
+    def test_sync_logger_levels(self) -> None:
+        logger = Logger("warn")
+        self.assertTrue(logger._enabled("error"))
+        self.assertFalse(logger._enabled("info"))
+        self.assertTrue(Logger("bogus")._enabled("info"))
+
+
+if __name__ == "__main__":
+    unittest.main()
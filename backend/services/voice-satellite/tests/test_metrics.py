@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from voice_satellite.metrics import LatencyHistogram, PipelineMetrics, start_metrics_server  # noqa: E402
+
+
+class LatencyHistogramTest(unittest.TestCase):
+    def test_quantiles_stay_within_bucket_precision(self) -> None:
+        rng = random.Random(7)
+        values = sorted(rng.lognormvariate(5, 1) for _ in range(5000))
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+
+        for q in (0.5, 0.95, 0.99):
+            exact = values[int(q * len(values)) - 1]
+            self.assertLessEqual(abs(histogram.quantile(q) - exact) / exact, 1 / 16 + 0.01, q)
+        self.assertEqual(histogram.count, 5000)
+        self.assertEqual(histogram.quantile(1.0), values[-1])
+
+    def test_cumulative_counts_are_monotonic(self) -> None:
+        histogram = LatencyHistogram()
+        for value in (0, 3, 9, 9, 40, 700, 12000):
+            histogram.record(value)
+
+        self.assertEqual(histogram.cumulative((5, 10, 50, 1000, 60000)), [2, 4, 5, 6, 7])
+
+
+class PipelineMetricsTest(unittest.IsolatedAsyncioTestCase):
+    async def test_metrics_endpoint_serves_prometheus_text(self) -> None:
+        metrics = PipelineMetrics()
+        metrics.observe("stt", 120, device="living-room-respeaker", room="living_room")
+        metrics.observe("wake_to_listening", 2, device="living-room-respeaker", room="living_room")
+        server = await start_metrics_server(metrics, host="127.0.0.1", port=0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"GET /metrics HTTP/1.1\r\nHost: x\r\n\r\n")
+            response = (await reader.read()).decode()
+            writer.close()
+        finally:
+            server.close()
+            await server.wait_closed()
+
+        head, body = response.split("\r\n\r\n", 1)
+        labels = 'stage="stt",device="living-room-respeaker",room="living_room"'
+        self.assertTrue(head.startswith("HTTP/1.0 200 OK"))
+        self.assertIn("# TYPE voice_satellite_stage_latency_ms histogram", body)
+        self.assertIn(f'voice_satellite_stage_latency_ms_bucket{{{labels},le="100"}} 0', body)
+        self.assertIn(f'voice_satellite_stage_latency_ms_bucket{{{labels},le="250"}} 1', body)
+        self.assertIn(f"voice_satellite_stage_latency_ms_count{{{labels}}} 1", body)
+        self.assertIn(f'voice_satellite_stage_latency_quantile_ms{{{labels},quantile="0.99"}} 120.000', body)
+        # Stages are listed in pipeline order.
+        self.assertLess(body.index('stage="wake_to_listening"'), body.index('stage="stt"'))
+
+
+if __name__ == "__main__":
+    unittest.main()
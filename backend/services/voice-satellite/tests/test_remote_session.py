@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import asyncio
+import dataclasses
 import sys
+import tempfile
+import threading
 import unittest
 from pathlib import Path
 
@@ -25,7 +28,9 @@ from voice_satellite.config import (  # noqa: E402
 )
 from voice_satellite.audio_types import SynthesizedAudio  # noqa: E402
 from voice_satellite.common import prepare_stt_audio  # noqa: E402
+from voice_satellite.metrics import STAGES, PipelineMetrics  # noqa: E402
 from voice_satellite.remote_server import RemoteSatelliteSession  # noqa: E402
+from voice_satellite.tts_cache import TtsCache  # noqa: E402
 
 
 class FakeVad:
@@ -48,6 +53,17 @@ class FakeStt:
         return "", {"sample_rate": sample_rate}
 
 
+class SegmentStt:
+    """Returns one character per 512-sample block so joined partials are checkable."""
+
+    def __init__(self):
+        self.calls: list[int] = []
+
+    def transcribe(self, audio: np.ndarray, *, sample_rate: int) -> tuple[str, dict]:
+        self.calls.append(int(audio.size))
+        return "嗯" * int(round(audio.size / 512)), {"sample_rate": sample_rate}
+
+
 class FakeTts:
     def __init__(self):
         self.spoken: list[str] = []
@@ -58,6 +74,45 @@ class FakeTts:
         return SynthesizedAudio(sample_rate=16000, channels=1, sample_width=2, pcm_s16le=pcm)
 
 
+class StreamingTts(FakeTts):
+    """Blocks after the first chunk until the test has seen ``tts_start``."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def stream_sample_rate(self) -> int:
+        return 22050
+
+    def synthesize_stream(self, text: str):
+        self.spoken.append(text)
+        yield b"\x01\x02" * 3000
+        self.release.wait(timeout=5)
+        yield b"\x01\x02" * 3000
+
+
+class PipelinedTts(FakeTts):
+    """First sentence only finishes once the second one has started synthesizing."""
+
+    def __init__(self):
+        super().__init__()
+        self.second_started = threading.Event()
+        self.overlapped = False
+
+    def stream_sample_rate(self) -> int:
+        return 16000
+
+    def synthesize_stream(self, text: str):
+        self.spoken.append(text)
+        if len(self.spoken) == 1:
+            yield b"\x01\x00" * 3000
+            self.overlapped = self.second_started.wait(timeout=5)
+            yield b"\x01\x00" * 3000
+        else:
+            self.second_started.set()
+            yield b"\x02\x00" * 3000
+
+
 class FakeDevices:
     def __init__(self):
         self.by_id = {"light-lr-main": {"name": "客厅主灯"}}
@@ -81,6 +136,36 @@ class FakeAgent:
         return dict(self.out)
 
 
+class StreamingAgent(FakeAgent):
+    """Streams two message sentences; the second only after ``release`` is set."""
+
+    def __init__(self, out: dict):
+        super().__init__(out)
+        self.release = asyncio.Event()
+
+    async def turn_stream(self, *, session_id: str, text: str, confirm: bool, wake_source: dict | None = None):
+        self.calls.append({"session_id": session_id, "text": text, "confirm": confirm, "wake_source": wake_source})
+        yield {"type": "delta", "text": "好的，我来"}
+        yield {"type": "delta", "text": "打开客厅主灯。打开"}
+        await asyncio.wait_for(self.release.wait(), timeout=5)
+        yield {"type": "delta", "text": "后亮度是百分之八十。"}
+        yield dict(self.out)
+
+
+class FakeFastPath:
+    def __init__(self, out: dict | None):
+        self.out = out
+        self.calls: list[tuple[str, str]] = []
+
+    async def turn(self, text: str, *, room: str = "") -> dict | None:
+        self.calls.append((text, room))
+        return dict(self.out) if self.out else None
+
+
+async def _collect(events) -> list[dict]:
+    return [event async for event in events]
+
+
 def make_cfg() -> AppConfig:
     return AppConfig(
         mode="ws_server",
@@ -149,6 +234,75 @@ class RemoteSessionTest(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(session.state, "LISTEN")
         self.assertIsNotNone(session.session_id)
 
+    async def test_fast_path_hit_skips_the_agent(self) -> None:
+        fast_path = FakeFastPath(
+            {
+                "type": "executed",
+                "actions": [{"deviceId": "light-lr-main", "action": "turn_on", "params": {}}],
+                "result": {"results": [{"deviceId": "light-lr-main", "action": "turn_on", "ok": True}]},
+            }
+        )
+        agent = FakeAgent({"type": "propose", "message": "要打开客厅主灯吗？"})
+        tts = FakeTts()
+        session = RemoteSatelliteSession(
+            device_id="living-room-respeaker",
+            placement={"room": "living_room"},
+            cfg=make_cfg(),
+            logger=type("L", (), {"info": lambda *a, **k: None, "debug": lambda *a, **k: None, "warn": lambda *a, **k: None, "error": lambda *a, **k: None})(),
+            devices=FakeDevices(),
+            agent=agent,
+            stt=FakeStt(["打开客厅主灯", "打开卧室主灯", "打开"]),
+            tts=tts,
+            vad_factory=lambda: FakeVad([0.9, 0.9, 0.1, 0.1]),
+            fast_path=fast_path,
+        )
+        pcm = (np.ones(512 * 4, dtype=np.int16) * 1024).tobytes()
+
+        async def turn() -> None:
+            await session.begin_capture()
+            await session.ingest_audio_chunk(pcm)
+            await session.finalize_audio()
+
+        await session.start_session()
+        await turn()
+        self.assertEqual(fast_path.calls, [("打开客厅主灯", "living_room")])
+        self.assertEqual(agent.calls, [])
+        self.assertEqual(tts.spoken[0], "已提交执行：打开客厅主灯")
+
+        # A miss goes to the agent; while it waits for an answer to its
+        # proposal the fast path stays out of the way.
+        fast_path.out = None
+        await turn()
+        self.assertEqual(len(agent.calls), 1)
+        fast_path.out = {"type": "answer", "message": "不应使用"}
+        await turn()
+        self.assertEqual(len(fast_path.calls), 2)
+        self.assertEqual([call["text"] for call in agent.calls], ["打开卧室主灯", "打开"])
+
+    async def test_turn_records_every_pipeline_stage(self) -> None:
+        metrics = PipelineMetrics()
+        session = RemoteSatelliteSession(
+            device_id="living-room-respeaker",
+            placement={"room": "living_room"},
+            cfg=make_cfg(),
+            logger=type("L", (), {"info": lambda *a, **k: None, "debug": lambda *a, **k: None, "warn": lambda *a, **k: None, "error": lambda *a, **k: None})(),
+            devices=FakeDevices(),
+            agent=FakeAgent({"type": "answer", "message": "现在二十度"}),
+            stt=FakeStt(["现在几度"]),
+            tts=FakeTts(),
+            vad_factory=lambda: FakeVad([0.9, 0.9, 0.1, 0.1]),
+            metrics=metrics,
+        )
+
+        await session.start_session()
+        await session.ingest_audio_chunk((np.ones(512 * 4, dtype=np.int16) * 1024).tobytes())
+        await session.finalize_audio()
+
+        for stage in STAGES:
+            histogram = metrics.histogram(stage, device="living-room-respeaker", room="living_room")
+            self.assertIsNotNone(histogram, stage)
+            self.assertEqual(histogram.count, 1, stage)
+
     async def test_exit_phrase_closes_session(self) -> None:
         cfg = make_cfg()
         agent = FakeAgent({"type": "answer", "message": "不应调用"})
@@ -199,6 +353,198 @@ class RemoteSessionTest(unittest.IsolatedAsyncioTestCase):
         self.assertGreater(len(normalized.pcm_s16le), 0)
         self.assertNotEqual(len(normalized.pcm_s16le), len(audio.pcm_s16le))
 
+    async def test_streaming_tts_sends_audio_before_synthesis_finishes(self) -> None:
+        tts = StreamingTts()
+        session = RemoteSatelliteSession(
+            device_id="living-room-respeaker",
+            placement={"room": "living_room"},
+            cfg=make_cfg(),
+            logger=type("L", (), {"info": lambda *a, **k: None, "debug": lambda *a, **k: None, "warn": lambda *a, **k: None, "error": lambda *a, **k: None})(),
+            devices=FakeDevices(),
+            agent=FakeAgent({"type": "answer", "message": "现在二十度"}),
+            stt=FakeStt(["现在几度"]),
+            tts=tts,
+            vad_factory=lambda: FakeVad([0.9, 0.9, 0.1, 0.1]),
+        )
+        await session.start_session()
+        await session.ingest_audio_chunk((np.ones(512 * 4, dtype=np.int16) * 1024).tobytes())
+
+        events = []
+        async for event in session.finalize_audio_stream():
+            events.append(event)
+            if event["type"] == "tts_chunk" and event["seq"] == 0:
+                self.assertFalse(tts.release.is_set())
+                tts.release.set()
+        types = [event["type"] for event in events]
+        chunks = [event for event in events if event["type"] == "tts_chunk"]
+
+        self.assertEqual(types[0], "transcript")
+        self.assertEqual(types[1], "tts_start")
+        self.assertEqual(types[-1], "tts_end")
+        self.assertEqual([c["seq"] for c in chunks], list(range(len(chunks))))
+        # 2 x 3000 samples at 22.05 kHz -> ~4354 samples at 16 kHz
+        self.assertAlmostEqual(sum(len(c["pcm"]) for c in chunks) / 2, 6000 * 16000 / 22050, delta=2)
+        self.assertEqual(session.state, "LISTEN")
+
+    async def test_long_reply_is_synthesized_sentence_by_sentence_with_prefetch(self) -> None:
+        tts = PipelinedTts()
+        session = RemoteSatelliteSession(
+            device_id="living-room-respeaker",
+            placement={"room": "living_room"},
+            cfg=make_cfg(),
+            logger=type("L", (), {"info": lambda *a, **k: None, "debug": lambda *a, **k: None, "warn": lambda *a, **k: None, "error": lambda *a, **k: None})(),
+            devices=FakeDevices(),
+            agent=FakeAgent({"type": "answer", "message": ""}),
+            stt=FakeStt([""]),
+            tts=tts,
+            vad_factory=lambda: FakeVad([0.0]),
+        )
+        session.session_id = "voice-00000001"
+
+        events = [e async for e in session._stream_tts_events("客厅主灯已经打开了。卧室空调没有响应，请稍后再试。", turn_type="answer")]
+        chunks = [e for e in events if e["type"] == "tts_chunk"]
+        pcm = b"".join(c["pcm"] for c in chunks)
+
+        self.assertEqual(tts.spoken, ["客厅主灯已经打开了。", "卧室空调没有响应，请稍后再试。"])
+        self.assertTrue(tts.overlapped)
+        self.assertEqual([e["type"] for e in events].count("tts_start"), 1)
+        self.assertEqual(events[-1]["type"], "tts_end")
+        self.assertEqual([c["seq"] for c in chunks], list(range(len(chunks))))
+        self.assertEqual(pcm, b"\x01\x00" * 6000 + b"\x02\x00" * 3000)
+
+    async def test_streamed_agent_reply_is_spoken_before_the_agent_finishes(self) -> None:
+        cfg = make_cfg()
+        cfg = dataclasses.replace(cfg, agent=dataclasses.replace(cfg.agent, stream=True))
+        agent = StreamingAgent(
+            {
+                "type": "executed",
+                "message": "好的，我来打开客厅主灯。打开后亮度是百分之八十。",
+                "actions": [{"deviceId": "light-lr-main", "action": "turn_on"}],
+                "result": {"results": [{"deviceId": "light-lr-main", "action": "turn_on", "ok": True}]},
+            }
+        )
+        tts = FakeTts()
+        session = RemoteSatelliteSession(
+            device_id="living-room-respeaker",
+            placement={"room": "living_room"},
+            cfg=cfg,
+            logger=type("L", (), {"info": lambda *a, **k: None, "debug": lambda *a, **k: None, "warn": lambda *a, **k: None, "error": lambda *a, **k: None})(),
+            devices=FakeDevices(),
+            agent=agent,
+            stt=FakeStt(["打开客厅主灯"]),
+            tts=tts,
+            vad_factory=lambda: FakeVad([0.9, 0.9, 0.1, 0.1]),
+        )
+        await session.start_session()
+        await session.ingest_audio_chunk((np.ones(512 * 4, dtype=np.int16) * 1024).tobytes())
+
+        events = []
+        async for event in session.finalize_audio_stream():
+            events.append(event)
+            if event["type"] == "tts_start":
+                self.assertEqual(tts.spoken, ["好的，我来打开客厅主灯。"])
+                agent.release.set()
+        chunks = [e for e in events if e["type"] == "tts_chunk"]
+
+        self.assertEqual(tts.spoken, ["好的，我来打开客厅主灯。", "打开后亮度是百分之八十。", "已提交执行：打开客厅主灯。"])
+        self.assertEqual([e["type"] for e in events].count("tts_start"), 1)
+        self.assertEqual([c["seq"] for c in chunks], list(range(len(chunks))))
+        self.assertEqual(events[-1]["type"], "tts_end")
+        self.assertEqual(events[-1]["turnType"], "executed")
+        self.assertEqual(events[-1]["text"], "好的，我来打开客厅主灯。打开后亮度是百分之八十。已提交执行：打开客厅主灯。")
+        self.assertEqual(session.state, "LISTEN")
+
+    async def test_streamed_propose_cut_off_by_barge_in_still_expects_an_answer(self) -> None:
+        cfg = make_cfg()
+        cfg = dataclasses.replace(cfg, agent=dataclasses.replace(cfg.agent, stream=True))
+        agent = StreamingAgent({"type": "propose", "actions": [{"deviceId": "light-lr-main", "action": "turn_on"}]})
+        tts = FakeTts()
+        session = RemoteSatelliteSession(
+            device_id="living-room-respeaker",
+            placement={"room": "living_room"},
+            cfg=cfg,
+            logger=type("L", (), {"info": lambda *a, **k: None, "debug": lambda *a, **k: None, "warn": lambda *a, **k: None, "error": lambda *a, **k: None})(),
+            devices=FakeDevices(),
+            agent=agent,
+            stt=FakeStt(["打开客厅主灯"]),
+            tts=tts,
+            vad_factory=lambda: FakeVad([0.9, 0.9, 0.1, 0.1]),
+        )
+        await session.start_session()
+        await session.ingest_audio_chunk((np.ones(512 * 4, dtype=np.int16) * 1024).tobytes())
+
+        turn = session.finalize_audio_stream()
+        async for event in turn:
+            if event["type"] == "tts_start":
+                agent.release.set()
+            # The confirm prompt is being synthesized: the user cuts in.
+            if any("请说确认或取消" in text for text in tts.spoken):
+                break
+        await turn.aclose()
+        session.abort_reply(reason="barge_in")
+
+        self.assertEqual(session.last_reply_type, "propose")
+        self.assertTrue(session.endpointer.expect_short_reply)
+
+    async def test_repeated_sentences_are_served_from_tts_cache(self) -> None:
+        tts = FakeTts()
+        session = RemoteSatelliteSession(
+            device_id="living-room-respeaker",
+            placement={"room": "living_room"},
+            cfg=make_cfg(),
+            logger=type("L", (), {"info": lambda *a, **k: None, "debug": lambda *a, **k: None, "warn": lambda *a, **k: None, "error": lambda *a, **k: None})(),
+            devices=FakeDevices(),
+            agent=FakeAgent({"type": "answer", "message": ""}),
+            stt=FakeStt([""]),
+            tts=tts,
+            vad_factory=lambda: FakeVad([0.0]),
+            tts_cache=TtsCache(model_path="/models/piper.onnx", speaker=None, max_bytes=1 << 20),
+        )
+
+        first = [e async for e in session._stream_tts_events("已提交执行：打开客厅主灯。", turn_type="executed")]
+        second = [e async for e in session._stream_tts_events("已提交执行：打开客厅主灯。现在客厅是二十五度。", turn_type="executed")]
+        first_pcm = b"".join(e["pcm"] for e in first if e["type"] == "tts_chunk")
+        second_pcm = b"".join(e["pcm"] for e in second if e["type"] == "tts_chunk")
+
+        self.assertEqual(tts.spoken, ["已提交执行：打开客厅主灯。", "现在客厅是二十五度。"])
+        self.assertEqual(second_pcm[: len(first_pcm)], first_pcm)
+        self.assertEqual(session._tts_cache.hits, 1)
+
+    async def test_slow_cache_disk_does_not_hold_up_the_next_sentence(self) -> None:
+        disk_free = threading.Event()
+
+        class SlowDiskCache(TtsCache):
+            def persist(self, text: str, pcm: bytes) -> None:
+                disk_free.wait(timeout=5)
+                super().persist(text, pcm)
+
+        tts = FakeTts()
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = SlowDiskCache(model_path="/models/piper.onnx", speaker=None, max_bytes=1 << 20, disk_dir=tmp)
+            session = RemoteSatelliteSession(
+                device_id="living-room-respeaker",
+                placement={"room": "living_room"},
+                cfg=make_cfg(),
+                logger=type("L", (), {"info": lambda *a, **k: None, "debug": lambda *a, **k: None, "warn": lambda *a, **k: None, "error": lambda *a, **k: None})(),
+                devices=FakeDevices(),
+                agent=FakeAgent({"type": "answer", "message": ""}),
+                stt=FakeStt([""]),
+                tts=tts,
+                vad_factory=lambda: FakeVad([0.0]),
+                tts_cache=cache,
+            )
+            try:
+                events = await asyncio.wait_for(
+                    _collect(session._stream_tts_events("打开客厅主灯。现在客厅是二十五度。", turn_type="answer")), timeout=2
+                )
+                self.assertEqual(events[-1]["type"], "tts_end")
+                self.assertEqual(tts.spoken, ["打开客厅主灯。", "现在客厅是二十五度。"])
+                # Memory already serves the sentence while the disk copy is pending.
+                self.assertIsNotNone(cache.get("打开客厅主灯。"))
+            finally:
+                disk_free.set()
+                await asyncio.gather(*session._cache_writes)
+
     async def test_remote_session_waits_until_audio_end_before_transcribing(self) -> None:
         cfg = make_cfg()
         stt = FakeStt(["打开客厅主灯"])
@@ -225,6 +571,73 @@ class RemoteSessionTest(unittest.IsolatedAsyncioTestCase):
         await session.finalize_audio()
         self.assertEqual(stt.texts, [])
 
+    async def test_incremental_stt_reuses_committed_prefix(self) -> None:
+        cfg = make_cfg()
+        cfg = dataclasses.replace(
+            cfg,
+            vad=dataclasses.replace(cfg.vad, end_silence_ms=160),
+            stt=dataclasses.replace(cfg.stt, partial_interval_ms=1, partial_commit_silence_ms=64, partial_events=True),
+        )
+        stt = SegmentStt()
+        agent = FakeAgent({"type": "answer", "message": "ok"})
+        probs = [0.9] * 12 + [0.1] * 3 + [0.9] * 4 + [0.1] * 5
+        session = RemoteSatelliteSession(
+            device_id="living-room-respeaker",
+            placement={"room": "living_room"},
+            cfg=cfg,
+            logger=type("L", (), {"info": lambda *a, **k: None, "debug": lambda *a, **k: None, "warn": lambda *a, **k: None, "error": lambda *a, **k: None})(),
+            devices=FakeDevices(),
+            agent=agent,
+            stt=stt,
+            tts=FakeTts(),
+            vad_factory=lambda: FakeVad(list(probs)),
+        )
+
+        await session.start_session()
+        block = (np.ones(512, dtype=np.int16) * 1024).tobytes()
+        events: list[dict] = []
+        for _ in probs:
+            events.extend(await session.ingest_audio_chunk(block))
+            await asyncio.sleep(0.02)
+        event_types = [event["type"] for event in events]
+        await session.finalize_audio()
+
+        self.assertIn("partial_transcript", event_types)
+        self.assertEqual(event_types[-1], "stop_capture")
+        self.assertEqual(agent.calls[0]["text"], "嗯" * len(probs))
+        # No decode after audio_end covered the whole capture again.
+        self.assertLess(stt.calls[-1], 512 * len(probs))
+
+    async def test_reply_to_a_propose_ends_after_a_shorter_silence(self) -> None:
+        cfg = make_cfg()
+        cfg = dataclasses.replace(cfg, vad=dataclasses.replace(cfg.vad, end_silence_ms=320, end_silence_short_reply_ms=128))
+        probs = [0.9] * 4 + [0.1] * 10 + [0.9] * 4 + [0.1] * 10
+        session = RemoteSatelliteSession(
+            device_id="living-room-respeaker",
+            placement={"room": "living_room"},
+            cfg=cfg,
+            logger=type("L", (), {"info": lambda *a, **k: None, "debug": lambda *a, **k: None, "warn": lambda *a, **k: None, "error": lambda *a, **k: None})(),
+            devices=FakeDevices(),
+            agent=FakeAgent({"type": "propose", "message": "要打开客厅的灯吗"}),
+            stt=FakeStt(["打开客厅的灯", "确认"]),
+            tts=FakeTts(),
+            vad_factory=lambda: FakeVad(list(probs)),
+        )
+        block = (np.ones(512, dtype=np.int16) * 1024).tobytes()
+
+        async def blocks_until_stop() -> int:
+            for n in range(1, 15):
+                if any(event["type"] == "stop_capture" for event in await session.ingest_audio_chunk(block)):
+                    return n
+            return -1
+
+        await session.start_session()
+        await session.begin_capture()
+        self.assertEqual(await blocks_until_stop(), 4 + 10)
+        await session.finalize_audio()
+        await session.begin_capture()
+        self.assertEqual(await blocks_until_stop(), 4 + 4)
+
     def test_prepare_stt_audio_removes_dc_and_normalizes(self) -> None:
         audio = np.linspace(-0.1, 0.12, num=1600, dtype=np.float32) + 0.2
         prepared, stats = prepare_stt_audio(audio)
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from voice_satellite.speech import SentenceStream, compose_action_speech, compose_speech, split_sentences  # noqa: E402
+
+
+class SplitSentencesTest(unittest.TestCase):
+    def test_splits_partial_failure_reply_at_sentence_punctuation(self) -> None:
+        text = "部分失败（成功 1，失败 1）：打开客厅主灯，关闭卧室空调。失败（ac-1 turn_off timeout）。现在客厅温度是25.5度。"
+
+        self.assertEqual(
+            split_sentences(text),
+            ["部分失败（成功 1，失败 1）：打开客厅主灯，关闭卧室空调。", "失败（ac-1 turn_off timeout）。", "现在客厅温度是25.5度。"],
+        )
+
+    def test_merges_short_pieces_and_keeps_punctuation_runs(self) -> None:
+        self.assertEqual(split_sentences("好。我准备执行：打开客厅主灯。请说确认或取消。"), ["好。我准备执行：打开客厅主灯。", "请说确认或取消。"])
+        self.assertEqual(split_sentences("这是真的吗？！那太好了……我们走"), ["这是真的吗？！", "那太好了……我们走"])
+        self.assertEqual(split_sentences("已提交执行：打开客厅主灯。好的"), ["已提交执行：打开客厅主灯。好的"])
+        self.assertEqual(split_sentences("  "), [])
+
+    def test_long_sentence_is_broken_at_clause_punctuation(self) -> None:
+        text = "这句话非常长，" * 8 + "到这里结束。"
+        pieces = split_sentences(text, max_chars=20)
+
+        self.assertGreater(len(pieces), 1)
+        self.assertTrue(all(len(p) <= 20 for p in pieces))
+        self.assertEqual("".join(pieces), text)
+
+
+class SentenceStreamTest(unittest.TestCase):
+    def test_releases_sentences_as_deltas_complete_them(self) -> None:
+        stream = SentenceStream()
+        released = [stream.feed(d) for d in ["好的，", "我来帮你看一下。现在客厅", "温度是25", ".5度，湿度正常。还有", "别的吗"]]
+
+        self.assertEqual(released, [[], ["好的，我来帮你看一下。"], [], ["现在客厅温度是25.5度，湿度正常。"], []])
+        self.assertEqual(stream.flush(), ["还有别的吗"])
+        self.assertEqual(stream.flush(), [])
+
+    def test_action_speech_leaves_out_the_message(self) -> None:
+        devices = {"light-lr-main": {"name": "客厅主灯"}}
+        actions = [{"deviceId": "light-lr-main", "action": "turn_on"}]
+
+        self.assertEqual(
+            compose_action_speech({"type": "executed", "message": "好的", "actions": actions, "result": {"results": [{"ok": True}]}}, devices),
+            "已提交执行：打开客厅主灯。",
+        )
+        self.assertEqual(compose_action_speech({"type": "propose", "message": "要打开客厅主灯吗", "actions": actions}, devices), "")
+        self.assertEqual(compose_action_speech({"type": "answer", "message": "二十度"}, devices), "")
+
+    def test_streamed_propose_says_what_compose_speech_says(self) -> None:
+        devices = {"light-lr-main": {"name": "客厅主灯"}}
+        actions = [{"deviceId": "light-lr-main", "action": "turn_on"}]
+
+        for message in ("要打开客厅主灯吗", "需要我帮你开灯吗"):
+            out = {"type": "propose", "message": message, "actions": actions}
+            streamed = "。".join(p for p in (message, compose_action_speech(out, devices)) if p)
+            self.assertEqual(streamed, compose_speech(out, devices), message)
+
+
+if __name__ == "__main__":
+    unittest.main()
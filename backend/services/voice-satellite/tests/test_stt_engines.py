@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from voice_satellite.config import SttConfig  # noqa: E402
+from voice_satellite.stt_engines import available_stt_engines, create_stt  # noqa: E402
+
+
+class _FakeWhisperModel:
+    instances: list["_FakeWhisperModel"] = []
+
+    def __init__(self, ref: str, **kwargs):
+        self.ref = ref
+        self.kwargs = kwargs
+        _FakeWhisperModel.instances.append(self)
+
+    def transcribe(self, _audio: np.ndarray, **kwargs):
+        self.transcribe_kwargs = kwargs
+        segments = (SimpleNamespace(text=t) for t in ["打开", "客厅主灯"])
+        return segments, SimpleNamespace(language="zh", duration=1.0)
+
+
+class SttEnginesTest(unittest.TestCase):
+    def test_registry_lists_builtin_engines(self) -> None:
+        self.assertEqual(available_stt_engines(), ["fake", "faster_whisper", "whisper"])
+
+    def test_fake_engine_is_deterministic(self) -> None:
+        stt = create_stt(SttConfig(engine="fake", fake_text="打开客厅主灯"))
+        text, meta = stt.transcribe(np.zeros(16000, dtype=np.float32), sample_rate=16000)
+
+        self.assertEqual(text, "打开客厅主灯")
+        self.assertEqual(meta["samples"], 16000)
+        self.assertEqual(stt.transcribe(np.zeros(8000, dtype=np.float32), sample_rate=16000)[0], "打开客厅主灯")
+
+    def test_unknown_engine_is_rejected(self) -> None:
+        with self.assertRaisesRegex(RuntimeError, "unknown stt.engine"):
+            create_stt(SttConfig(engine="nope"))
+
+    def test_faster_whisper_engine_runs_quantized_on_cpu(self) -> None:
+        fake_module = SimpleNamespace(WhisperModel=_FakeWhisperModel)
+        cfg = SttConfig(engine="faster_whisper", whisper_model="/models/fw-small", device="cpu", cpu_threads=4)
+        with patch.dict(sys.modules, {"faster_whisper": fake_module}, clear=False):
+            stt = create_stt(cfg)
+            text, meta = stt.transcribe(np.zeros(1600, dtype=np.int16), sample_rate=16000)
+
+        model = _FakeWhisperModel.instances[-1]
+        self.assertEqual(model.kwargs["device"], "cpu")
+        self.assertEqual(model.kwargs["compute_type"], "int8")
+        self.assertEqual(model.kwargs["cpu_threads"], 4)
+        self.assertEqual(model.transcribe_kwargs["language"], "zh")
+        self.assertEqual(text, "打开客厅主灯")
+        self.assertEqual(meta["language"], "zh")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import sys
+import time
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from voice_satellite.config import SttConfig  # noqa: E402
+from voice_satellite.stt_pool import SttWorkerPool  # noqa: E402
+
+
+class SttWorkerPoolTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.pool = SttWorkerPool(SttConfig(engine="fake", fake_text="打开客厅主灯"), workers=2, max_samples=16000, log_level="error")
+        self.pool.start()
+
+    def tearDown(self) -> None:
+        self.pool.close()
+
+    def test_workers_transcribe_from_shared_memory(self) -> None:
+        futures = [self.pool.submit(np.zeros(n, dtype=np.float32)) for n in (800, 1600, 3200)]
+        results = [f.result(timeout=30) for f in futures]
+
+        self.assertEqual([text for text, _meta in results], ["打开客厅主灯"] * 3)
+        self.assertEqual([meta["samples"] for _text, meta in results], [800, 1600, 3200])
+        self.assertEqual(self.pool.stats()["completed"], 3)
+
+    def test_crashed_worker_is_respawned(self) -> None:
+        self.pool.submit(np.zeros(160, dtype=np.float32)).result(timeout=30)
+        for worker in self.pool._workers:
+            worker.process.kill()
+
+        deadline = time.monotonic() + 30
+        while self.pool.stats()["restarts"] < 2 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        text, meta = self.pool.submit(np.zeros(320, dtype=np.float32)).result(timeout=30)
+
+        self.assertEqual(text, "打开客厅主灯")
+        self.assertEqual(meta["samples"], 320)
+        self.assertGreaterEqual(self.pool.stats()["restarts"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
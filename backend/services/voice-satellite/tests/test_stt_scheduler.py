@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from voice_satellite.stt_scheduler import SttScheduler  # noqa: E402
+
+
+class BatchingStt:
+    def __init__(self, *, fail_on: float | None = None):
+        self.batches: list[int] = []
+        self.fail_on = fail_on
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def transcribe(self, audio: np.ndarray, *, sample_rate: int) -> tuple[str, dict]:
+        self.gate.wait(timeout=5)
+        self.batches.append(1)
+        if self.fail_on is not None and float(audio[0]) == self.fail_on:
+            raise RuntimeError("bad clip")
+        return f"clip-{int(audio[0])}", {"sample_rate": sample_rate}
+
+    def transcribe_batch(self, audios: list[np.ndarray], *, sample_rate: int) -> list[tuple[str, dict]]:
+        self.gate.wait(timeout=5)
+        if self.fail_on is not None and any(float(a[0]) == self.fail_on for a in audios):
+            raise RuntimeError("bad batch")
+        self.batches.append(len(audios))
+        return [(f"clip-{int(a[0])}", {"sample_rate": sample_rate}) for a in audios]
+
+
+def clip(value: float) -> np.ndarray:
+    return np.full(160, value, dtype=np.float32)
+
+
+class SttSchedulerTest(unittest.TestCase):
+    def test_requests_within_window_share_one_batch(self) -> None:
+        stt = BatchingStt()
+        scheduler = SttScheduler(stt, batch_window_ms=200, max_batch_size=4)
+        try:
+            futures = [scheduler.submit(clip(i)) for i in range(3)]
+            results = [f.result(timeout=5) for f in futures]
+        finally:
+            scheduler.close()
+
+        self.assertEqual([text for text, _meta in results], ["clip-0", "clip-1", "clip-2"])
+        self.assertEqual(stt.batches, [3])
+        self.assertEqual(results[0][1]["batch_size"], 3)
+        self.assertIn("queue_wait_ms", results[0][1])
+
+    def test_max_batch_size_splits_queue(self) -> None:
+        stt = BatchingStt()
+        stt.gate.clear()
+        scheduler = SttScheduler(stt, batch_window_ms=0, max_batch_size=2)
+        try:
+            first = scheduler.submit(clip(0))
+            rest = [scheduler.submit(clip(i)) for i in range(1, 5)]
+            stt.gate.set()
+            for f in [first, *rest]:
+                f.result(timeout=5)
+            stats = scheduler.stats()
+        finally:
+            scheduler.close()
+
+        self.assertTrue(all(size <= 2 for size in stt.batches))
+        self.assertEqual(sum(stt.batches), 5)
+        self.assertEqual(stats["requests"], 5)
+        self.assertGreaterEqual(stats["max_queue_depth"], 1)
+
+    def test_failed_batch_only_fails_the_bad_clip(self) -> None:
+        stt = BatchingStt(fail_on=1.0)
+        scheduler = SttScheduler(stt, batch_window_ms=200, max_batch_size=4)
+        try:
+            good = scheduler.submit(clip(0))
+            bad = scheduler.submit(clip(1))
+            self.assertEqual(good.result(timeout=5)[0], "clip-0")
+            with self.assertRaisesRegex(RuntimeError, "bad"):
+                bad.result(timeout=5)
+            self.assertEqual(scheduler.stats()["failures"], 1)
+        finally:
+            scheduler.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from voice_satellite.tts_cache import TtsCache  # noqa: E402
+
+
+def make_cache(**kwargs) -> TtsCache:
+    return TtsCache(model_path="/models/zh_CN-huayan-medium.onnx", speaker=None, **kwargs)
+
+
+class TtsCacheTest(unittest.TestCase):
+    def test_lru_respects_byte_budget(self) -> None:
+        cache = make_cache(max_bytes=10)
+        cache.put("一", b"\x00" * 4)
+        cache.put("二", b"\x00" * 4)
+        self.assertIsNotNone(cache.get("一"))  # "二" is now least recently used
+        cache.put("三", b"\x00" * 4)
+        cache.put("太长了", b"\x00" * 20)
+
+        self.assertIsNotNone(cache.get("一"))
+        self.assertIsNone(cache.get("二"))
+        self.assertIsNone(cache.get("太长了"))
+        stats = cache.stats()
+        self.assertEqual(stats["bytes"], 8)
+        self.assertEqual(stats["evictions"], 1)
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 2))
+
+    def test_key_covers_voice_and_speaker(self) -> None:
+        a = make_cache(max_bytes=100)
+        b = TtsCache(model_path="/models/zh_CN-huayan-medium.onnx", speaker=3, max_bytes=100)
+        c = TtsCache(model_path="/models/other.onnx", speaker=None, max_bytes=100)
+
+        self.assertEqual(a.key("好的，再见。"), a.key(" 好的，再见。 "))
+        self.assertNotEqual(a.key("好的，再见。"), b.key("好的，再见。"))
+        self.assertNotEqual(a.key("好的，再见。"), c.key("好的，再见。"))
+
+    def test_disk_store_survives_restart_and_prewarm_skips_cached(self) -> None:
+        calls: list[str] = []
+
+        def synth(text: str) -> bytes:
+            calls.append(text)
+            return text.encode("utf-8")
+
+        with tempfile.TemporaryDirectory() as td:
+            first = make_cache(max_bytes=1024, disk_dir=td)
+            self.assertEqual(first.prewarm(["好的，再见。", "抱歉，我刚才没有处理成功。"], synth), 2)
+
+            second = make_cache(max_bytes=1024, disk_dir=td)
+            self.assertEqual(second.get("好的，再见。"), "好的，再见。".encode("utf-8"))
+            self.assertEqual(second.prewarm(["好的，再见。", "抱歉，我刚才没有处理成功。"], synth), 0)
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(second.stats()["disk_hits"], 2)
+
+    def test_memory_lookup_never_reads_disk(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            make_cache(max_bytes=1024, disk_dir=td).put("好的。", b"pcm")
+            cache = make_cache(max_bytes=1024, disk_dir=td)
+
+            self.assertIsNone(cache.get_memory("好的。"))
+            self.assertEqual(cache.stats()["misses"], 0)
+            self.assertEqual(cache.load_disk("好的。"), b"pcm")
+            self.assertEqual(cache.get_memory("好的。"), b"pcm")
+            self.assertIsNone(cache.load_disk("再见。"))
+
+        self.assertEqual({k: cache.stats()[k] for k in ("hits", "disk_hits", "misses")}, {"hits": 2, "disk_hits": 1, "misses": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
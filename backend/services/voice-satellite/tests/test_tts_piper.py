@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import json
+import os
+import stat
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from voice_satellite.tts_piper import PiperTts  # noqa: E402
+
+
+def fake_piper(td: str, body: str) -> str:
+    path = os.path.join(td, "piper")
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write("#!/bin/sh\ncat > /dev/null\n" + body)
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+    return path
+
+
+class PiperStreamTest(unittest.TestCase):
+    def test_stream_yields_whole_samples_and_reads_rate_from_voice_config(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            config_path = os.path.join(td, "voice.onnx.json")
+            with open(config_path, "w", encoding="utf-8") as fh:
+                json.dump({"audio": {"sample_rate": 16000}}, fh)
+            piper = fake_piper(td, "printf 'abc'\nsleep 0.1\nprintf 'def'\n")
+            tts = PiperTts(piper_bin=piper, model_path="voice.onnx", config_path=config_path, speaker=None, output_device=None)
+
+            chunks = list(tts.synthesize_stream("你好"))
+
+            self.assertEqual(tts.stream_sample_rate(), 16000)
+        self.assertEqual(b"".join(chunks), b"abcdef")
+        self.assertTrue(all(len(c) % 2 == 0 for c in chunks))
+
+    def test_stream_raises_on_piper_failure(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            piper = fake_piper(td, "echo 'bad voice' >&2\nexit 3\n")
+            tts = PiperTts(piper_bin=piper, model_path="voice.onnx", config_path="/missing.json", speaker=None, output_device=None)
+
+            with self.assertRaisesRegex(RuntimeError, "piper_failed rc=3: bad voice"):
+                list(tts.synthesize_stream("你好"))
+            self.assertEqual(tts.stream_sample_rate(), 22050)
+
+
+if __name__ == "__main__":
+    unittest.main()
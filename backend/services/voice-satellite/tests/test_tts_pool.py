@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import os
+import stat
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from voice_satellite.config import TtsConfig  # noqa: E402
+from voice_satellite.tts_pool import PiperWorkerPool  # noqa: E402
+
+# Speaks piper's --json-input protocol: one JSON line in, WAV written to
+# output_file, path echoed on stdout. "crash" kills the process mid-request.
+FAKE_PIPER = f"""#!{sys.executable}
+import json, sys, wave
+for line in sys.stdin:
+    req = json.loads(line)
+    if req["text"] == "crash":
+        sys.stderr.write("voice exploded\\n")
+        sys.exit(7)
+    with wave.open(req["output_file"], "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(22050)
+        wf.writeframes(b"\\x01\\x00" * len(req["text"]))
+    print("piper: ignored log line", flush=True)
+    print(req["output_file"], flush=True)
+"""
+
+
+class PiperWorkerPoolTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.td = tempfile.TemporaryDirectory()
+        piper = os.path.join(self.td.name, "piper")
+        with open(piper, "w", encoding="utf-8") as fh:
+            fh.write(FAKE_PIPER)
+        os.chmod(piper, os.stat(piper).st_mode | stat.S_IEXEC)
+        self.pool = PiperWorkerPool(TtsConfig(piper_bin=piper, model_path="v.onnx", config_path="v.onnx.json"), workers=2, request_timeout_s=10)
+        self.pool.start()
+
+    def tearDown(self) -> None:
+        self.pool.close()
+        self.td.cleanup()
+
+    def test_warm_workers_serve_many_requests(self) -> None:
+        futures = [self.pool.submit("你好" * n) for n in range(1, 6)]
+        audios = [f.result(timeout=10) for f in futures]
+        stats = self.pool.stats()
+
+        self.assertEqual([len(a.pcm_s16le) for a in audios], [4 * n for n in range(1, 6)])
+        self.assertEqual(audios[0].sample_rate, 22050)
+        self.assertEqual(stats["completed"], 5)
+        self.assertEqual(stats["spawns"], 2)
+        self.assertEqual(stats["queue_depth"], 0)
+
+    def test_crashed_worker_fails_its_request_and_is_respawned(self) -> None:
+        with self.assertRaisesRegex(RuntimeError, "voice exploded|exited"):
+            self.pool.synthesize("crash")
+        audio = self.pool.synthesize("好")
+
+        self.assertEqual(len(audio.pcm_s16le), 2)
+        stats = self.pool.stats()
+        self.assertEqual(stats["failures"], 1)
+        self.assertGreaterEqual(stats["restarts"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
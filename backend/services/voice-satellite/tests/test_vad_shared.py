@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from voice_satellite.vad_shared import SharedVadEngine  # noqa: E402
+
+
+class CountingSession:
+    """Stands in for the Silero ONNX session: prob = row mean, state counts calls."""
+
+    def __init__(self):
+        self.batch_sizes: list[int] = []
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def run(self, _outputs, inputs):
+        self.gate.wait(timeout=5)
+        x = inputs["input"]
+        state = inputs["state"]
+        self.batch_sizes.append(x.shape[0])
+        probs = np.abs(x[:, 64:]).mean(axis=1, keepdims=True).astype(np.float32)
+        return probs, state + 1.0
+
+
+def block(value: int) -> np.ndarray:
+    return np.full(512, value, dtype=np.int16)
+
+
+class SharedVadEngineTest(unittest.TestCase):
+    def test_streams_share_one_batched_run_and_keep_own_state(self) -> None:
+        session = CountingSession()
+        session.gate.clear()
+        engine = SharedVadEngine(session=session, tick_ms=0)
+        try:
+            a = engine.open_stream()
+            b = engine.open_stream()
+            warmup = engine.submit(a, block(0))
+            futures = [engine.submit(a, block(16384)), engine.submit(b, block(8192)), engine.submit(a, block(0))]
+            session.gate.set()
+            warmup.result(timeout=5)
+            results = [f.result(timeout=5) for f in futures]
+            stats = engine.stats()
+        finally:
+            engine.close()
+
+        self.assertAlmostEqual(results[0], 0.5)
+        self.assertAlmostEqual(results[1], 0.25)
+        self.assertEqual(results[2], 0.0)
+        self.assertEqual(sorted(session.batch_sizes), [1, 1, 2])
+        self.assertEqual(float(a.state[0, 0, 0]), 3.0)
+        self.assertEqual(float(b.state[0, 0, 0]), 1.0)
+        self.assertTrue(np.all(a.context == 0.0))
+        self.assertEqual(stats["max_batch_size"], 2)
+
+    def test_async_probability_and_closed_stream(self) -> None:
+        engine = SharedVadEngine(session=CountingSession(), tick_ms=1)
+        try:
+            stream = engine.open_stream()
+            prob = asyncio.run(stream.probability_async(block(16384)))
+            stream.close()
+            with self.assertRaisesRegex(RuntimeError, "closed"):
+                stream.probability(block(0))
+        finally:
+            engine.close()
+
+        self.assertAlmostEqual(prob, 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
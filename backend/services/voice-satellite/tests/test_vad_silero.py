@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from voice_satellite.config import VadConfig  # noqa: E402
+from voice_satellite.vad_silero import SileroOnnxVad, create_vad, silero_onnx_path  # noqa: E402
+
+
+class RecordingSession:
+    def __init__(self):
+        self.inputs: list[int] = []
+        self.states: list[float] = []
+
+    def run(self, _outputs, feeds):
+        self.inputs.append(id(feeds["input"]))
+        self.states.append(float(feeds["state"][0, 0, 0]))
+        x = feeds["input"]
+        return np.abs(x[:, 64:]).mean(axis=1, keepdims=True), feeds["state"] + 1.0
+
+
+class SileroOnnxVadTest(unittest.TestCase):
+    def test_reuses_buffers_and_carries_state_without_torch(self) -> None:
+        session = RecordingSession()
+        vad = SileroOnnxVad(session=session)
+        first = vad.probability(np.full(512, 16384, dtype=np.int16))
+        second = vad.probability(np.zeros(512, dtype=np.int16))
+
+        self.assertAlmostEqual(first, 0.5)
+        self.assertEqual(second, 0.0)
+        self.assertEqual(len(set(session.inputs)), 1)
+        self.assertEqual(session.states, [0.0, 1.0])
+        self.assertNotIn("torch", sys.modules)
+
+        vad.reset()
+        vad.probability(np.zeros(512, dtype=np.int16))
+        self.assertEqual(session.states[-1], 0.0)
+
+    def test_explicit_model_path_and_engine_selection(self) -> None:
+        with tempfile.NamedTemporaryFile(suffix=".onnx") as fh:
+            self.assertEqual(silero_onnx_path(fh.name), Path(fh.name))
+        with self.assertRaisesRegex(RuntimeError, "not found"):
+            silero_onnx_path("/nonexistent/silero.onnx")
+        with self.assertRaisesRegex(RuntimeError, "unknown vad.engine"):
+            create_vad(VadConfig(engine="webrtc"), sample_rate=16000)
+
+
+if __name__ == "__main__":
+    unittest.main()
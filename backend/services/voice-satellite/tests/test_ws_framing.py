@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import base64
+import json
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from voice_satellite.ws_framing import (  # noqa: E402
+    FRAME_AUDIO,
+    FRAME_HEADER,
+    FRAME_TTS,
+    FRAMING_BINARY,
+    FRAMING_JSON,
+    decode_frame,
+    encode_event,
+    encode_frame,
+    negotiate_framing,
+    session_tag,
+)
+
+
+class WsFramingTest(unittest.TestCase):
+    def test_frame_round_trip_without_copying_payload(self) -> None:
+        pcm = bytes(range(64))
+        raw = encode_frame(FRAME_AUDIO, pcm, seq=70000, session_tag=session_tag("voice-1a2b3c4d"))
+        frame = decode_frame(raw)
+
+        self.assertEqual(len(raw), FRAME_HEADER.size + len(pcm))
+        self.assertEqual(frame.kind, FRAME_AUDIO)
+        self.assertEqual(frame.seq, 70000 & 0xFFFF)
+        self.assertEqual(frame.session_tag, 0x1A2B3C4D)
+        self.assertIsInstance(frame.payload, memoryview)
+        self.assertEqual(bytes(frame.payload), pcm)
+        with self.assertRaises(ValueError):
+            decode_frame(b"\x01\x00")
+
+    def test_negotiation_defaults_to_json_for_old_firmware(self) -> None:
+        self.assertEqual(negotiate_framing(None), FRAMING_JSON)
+        self.assertEqual(negotiate_framing("binary"), FRAMING_BINARY)
+        self.assertEqual(negotiate_framing(["binary", "json"]), FRAMING_BINARY)
+        self.assertEqual(negotiate_framing(["json"]), FRAMING_JSON)
+
+    def test_tts_chunk_is_binary_or_base64_depending_on_framing(self) -> None:
+        event = {"type": "tts_chunk", "deviceId": "sat-1", "sessionId": "voice-00000010", "seq": 3, "pcm": b"\x01\x02"}
+
+        frame = decode_frame(encode_event(event, framing=FRAMING_BINARY))
+        self.assertEqual((frame.kind, frame.seq, frame.session_tag, bytes(frame.payload)), (FRAME_TTS, 3, 0x10, b"\x01\x02"))
+
+        legacy = json.loads(encode_event(event, framing=FRAMING_JSON))
+        self.assertNotIn("pcm", legacy)
+        self.assertEqual(base64.b64decode(legacy["data"]), b"\x01\x02")
+        self.assertEqual(json.loads(encode_event({"type": "pong"}, framing=FRAMING_BINARY)), {"type": "pong"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import json
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from voice_satellite.config import load_config  # noqa: E402
+from voice_satellite.loadtest import build_stubs  # noqa: E402
+from voice_satellite.log import Logger  # noqa: E402
+from voice_satellite.remote_server import run_ws_server  # noqa: E402
+
+DEVICE_ID = "test-sat"
+
+
+class WsServerTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        registry = Path(self._tmp.name) / "devices.config.json"
+        registry.write_text(json.dumps({"voice_control": {"mics": [{"id": DEVICE_ID, "placement": {"room": "study"}}]}}))
+        cfg = load_config(str(ROOT / "config.ws-server.example.yaml"))
+        cfg = dataclasses.replace(
+            cfg,
+            device_config_path=str(registry),
+            satellite_server=dataclasses.replace(cfg.satellite_server, host="127.0.0.1", port=0, metrics_port=0),
+            tts=dataclasses.replace(cfg.tts, cache_max_mb=0),
+        )
+        ready: asyncio.Future = asyncio.get_running_loop().create_future()
+        backends = build_stubs(["stt", "tts", "agent", "vad"], tts_ms=800, tts_ms_per_char=20)
+        self._server = asyncio.create_task(run_ws_server(cfg, Logger("error"), on_ready=ready.set_result, **backends))
+        port = await asyncio.wait_for(ready, timeout=10)
+        self.url = f"ws://127.0.0.1:{port}{cfg.satellite_server.path or '/ws'}"
+
+    async def asyncTearDown(self) -> None:
+        self._server.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await self._server
+        self._tmp.cleanup()
+
+    async def test_ping_is_answered_while_a_reply_is_being_synthesized(self) -> None:
+        from websockets.legacy.client import connect
+
+        async with connect(self.url) as ws:
+            await ws.send(json.dumps({"type": "hello", "deviceId": DEVICE_ID}))
+            self.assertEqual(json.loads(await ws.recv())["type"], "hello_ack")
+
+            # The stub TTS takes 800 ms before the first chunk; the processor is busy until then.
+            await ws.send(json.dumps({"type": "debug_tts", "text": "你好"}))
+            await asyncio.sleep(0.1)
+            sent_at = time.monotonic()
+            await ws.send(json.dumps({"type": "ping"}))
+            kinds = []
+            while True:
+                event = json.loads(await asyncio.wait_for(ws.recv(), timeout=10))
+                kinds.append(event["type"])
+                if event["type"] == "pong":
+                    self.assertLess(time.monotonic() - sent_at, 0.4)
+                if event["type"] == "session_closed":
+                    break
+            self.assertLess(kinds.index("pong"), kinds.index("tts_start"))
+            self.assertEqual(kinds[-2:], ["tts_end", "session_closed"])
+
+    async def test_barge_in_aborts_the_reply_and_reopens_capture(self) -> None:
+        from websockets.legacy.client import connect
+
+        async with connect(self.url) as ws:
+            await ws.send(json.dumps({"type": "hello", "deviceId": DEVICE_ID}))
+            await ws.recv()
+            # 100 characters of stub speech: two seconds of audio, sent at playback pace.
+            await ws.send(json.dumps({"type": "debug_tts", "text": "好" * 100}))
+            kinds = []
+            while "tts_start" not in kinds:
+                kinds.append(json.loads(await asyncio.wait_for(ws.recv(), timeout=10))["type"])
+            await ws.send(json.dumps({"type": "barge_in"}))
+            while True:
+                event = json.loads(await asyncio.wait_for(ws.recv(), timeout=2))
+                kinds.append(event["type"])
+                if event["type"] == "listening":
+                    break
+            self.assertNotIn("tts_end", kinds)
+            self.assertEqual(kinds[-2:], ["tts_abort", "listening"])
+            # The full reply would be 64000 bytes, 16 chunks.
+            self.assertLess(kinds.count("tts_chunk"), 8)
+
+            # The session is capturing again; audio is accepted without another wake.
+            await ws.send(json.dumps({"type": "audio_start"}))
+            await ws.send(json.dumps({"type": "ping"}))
+            self.assertEqual(json.loads(await asyncio.wait_for(ws.recv(), timeout=2))["type"], "pong")
+
+    async def test_barge_in_after_the_reply_finished_aborts_nothing(self) -> None:
+        from websockets.legacy.client import connect
+
+        async with connect(self.url) as ws:
+            await ws.send(json.dumps({"type": "hello", "deviceId": DEVICE_ID}))
+            await ws.recv()
+            await ws.send(json.dumps({"type": "debug_tts", "text": "你好"}))
+            kinds = []
+            while "tts_end" not in kinds:
+                kinds.append(json.loads(await asyncio.wait_for(ws.recv(), timeout=10))["type"])
+            # The device is still playing its buffer and the user speaks over it.
+            await ws.send(json.dumps({"type": "barge_in"}))
+            await ws.send(json.dumps({"type": "ping"}))
+            while kinds[-1] != "pong":
+                kinds.append(json.loads(await asyncio.wait_for(ws.recv(), timeout=2))["type"])
+            self.assertNotIn("tts_abort", kinds)
+            self.assertIn("session_closed", kinds)
+
+    async def test_error_is_delivered_before_close(self) -> None:
+        from websockets.legacy.client import connect
+
+        async with connect(self.url) as ws:
+            await ws.send(json.dumps({"type": "wake"}))
+            event = json.loads(await ws.recv())
+            self.assertEqual(event["code"], "hello_required")
+            await ws.wait_closed()
+            self.assertEqual(ws.close_code, 1008)
+
+
+if __name__ == "__main__":
+    unittest.main()